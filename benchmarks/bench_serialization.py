@@ -0,0 +1,124 @@
+"""
+Micro-benchmark of the user summary serialization paths.
+
+Builds a summary with 1000 repositories and 1000 pull requests and times,
+per request:
+
+- ``legacy``: the original path, where the router builds the model and
+  FastAPI validates it again through ``response_model`` before running
+  ``jsonable_encoder`` and ``json.dumps``
+- ``model_dump``: one validation, then ``model_dump(mode="json")`` and
+  ``json.dumps`` through ``JSONResponse``
+- ``fast``: one validation, then ``encode_summary`` writing bytes directly
+
+Run from the project root:
+
+    python -m benchmarks.bench_serialization [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.github.schemas import GitHubUserResponse
+from src.github.selection import SummarySelection
+from src.github.streaming import encode_summary
+
+
+def build_payload(repositories: int = 1000, pull_requests: int = 1000) -> dict:
+    """Builds a summary dict shaped like the service output"""
+    return {
+        "user": {
+            "login": "octocat",
+            "name": "The Octocat",
+            "company": "@github",
+            "location": "San Francisco",
+            "blog": "https://github.blog",
+            "followers": 1000,
+        },
+        "summary": {
+            "public_repos": repositories,
+            "public_gists": 8,
+            "total_repositories": repositories,
+            "total_organizations": 3,
+            "total_pull_requests": pull_requests,
+        },
+        "repositories": [
+            {
+                "name": f"repo-{index}",
+                "full_name": f"octocat/repo-{index}",
+                "private": index % 2 == 0,
+                "description": "A repository used to benchmark serialization",
+                "url": f"https://github.com/octocat/repo-{index}",
+                "language": "Python",
+                "stargazers_count": index,
+                "forks_count": index // 2,
+                "created_at": "2020-01-01T00:00:00Z",
+            }
+            for index in range(repositories)
+        ],
+        "organizations": [
+            {
+                "login": f"org-{index}",
+                "id": index,
+                "avatar_url": f"https://avatars.githubusercontent.com/u/{index}",
+                "description": None,
+            }
+            for index in range(3)
+        ],
+        "pull_requests": [
+            {
+                "title": f"Pull request {index}",
+                "number": index,
+                "state": "open",
+                "repository_url": "https://api.github.com/repos/octocat/repo-1",
+                "created_at": "2023-06-01T12:30:00Z",
+            }
+            for index in range(pull_requests)
+        ],
+    }
+
+
+def legacy(payload: dict) -> bytes:
+    """Router model, response_model revalidation, jsonable_encoder and json.dumps"""
+    model = GitHubUserResponse(**payload)
+    revalidated = GitHubUserResponse.model_validate(model.model_dump())
+    return JSONResponse(jsonable_encoder(revalidated)).body
+
+
+def model_dump(payload: dict) -> bytes:
+    """One validation, model_dump to a dict and json.dumps"""
+    model = GitHubUserResponse.model_validate(payload)
+    return JSONResponse(model.model_dump(mode="json", include=SummarySelection().include_spec())).body
+
+
+def fast(payload: dict) -> bytes:
+    """One validation serialized straight to bytes"""
+    return encode_summary(GitHubUserResponse.model_validate(payload), SummarySelection())
+
+
+def main() -> None:
+    """Times every path and prints the results as JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repositories", type=int, default=1000)
+    parser.add_argument("--pull-requests", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    payload = build_payload(args.repositories, args.pull_requests)
+    assert json.loads(legacy(payload)) == json.loads(fast(payload))
+    
+    results = {}
+    for name, encode in (("legacy", legacy), ("model_dump", model_dump), ("fast", fast)):
+        best = min(timeit.repeat(lambda: encode(payload), number=1, repeat=args.repeat))
+        results[name] = {"best_ms": round(best * 1000, 3)}
+    for name in ("legacy", "model_dump"):
+        results[name]["fast_speedup"] = round(results[name]["best_ms"] / results["fast"]["best_ms"], 2)
+    results["response_bytes"] = len(fast(payload))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Load benchmark of ``GET /github/user-summary`` against the fake GitHub API.
+
+The app runs in-process with its real lifespan (shared client, caches, rate
+limiter); only the pooled HTTP client is swapped for one backed by
+``FakeGitHub``. Requests are driven through ``httpx.ASGITransport`` with a
+fixed concurrency, and the results are printed (or written with
+``--output``) as JSON so runs can be compared between commits.
+
+Run from the project root:
+
+    python -m benchmarks.bench_user_summary --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_github import FakeGitHub, FakeGitHubConfig
+from src.config import get_settings
+from src.main import app, configure_github_service
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(max(math.ceil(fraction * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision() -> Optional[str]:
+    """Commit being benchmarked, if running from a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Starts the app against the fake API, drives the load and collects the results"""
+    fake = FakeGitHub(FakeGitHubConfig(
+        repositories=args.repositories,
+        organizations=args.organizations,
+        pull_requests=args.pull_requests,
+        latency=args.latency / 1000,
+        latency_jitter=args.jitter / 1000,
+        rate_limit=args.rate_limit,
+        search_rate_limit=args.search_rate_limit,
+    ))
+    
+    async with app.router.lifespan_context(app):
+        # Replace the real pool with one backed by the fake API
+        await app.state.http_client.aclose()
+        app.state.http_client = httpx.AsyncClient(transport=fake)
+        configure_github_service(app, get_settings())
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            semaphore = asyncio.Semaphore(args.concurrency)
+            latencies: List[float] = []
+            statuses: Dict[str, int] = {}
+            response_bytes = 0
+            
+            async def request(number: int, record: bool = True) -> None:
+                nonlocal response_bytes
+                token = f"token-{number % args.tokens}"
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await client.get(
+                        f"/github/user-summary{args.query}",
+                        headers={"Authorization": f"Bearer {token}"}
+                    )
+                    elapsed = time.perf_counter() - start
+                if record:
+                    latencies.append(elapsed)
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+                    response_bytes += len(response.content)
+            
+            await asyncio.gather(*(request(number, record=False) for number in range(args.warmup)))
+            upstream_before = fake.stats.requests
+            started = time.perf_counter()
+            await asyncio.gather(*(request(number) for number in range(args.requests)))
+            duration = time.perf_counter() - started
+    
+    def ms(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value * 1000, 2)
+    
+    return {
+        "benchmark": "user_summary",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "requests": args.requests,
+        "duration_s": round(duration, 3),
+        "requests_per_second": round(args.requests / duration, 2),
+        "latency_ms": {
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(max(latencies)) if latencies else None,
+        },
+        "status_codes": statuses,
+        "response_bytes": response_bytes,
+        "upstream_requests": fake.stats.requests - upstream_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main() -> None:
+    """Parses the options, runs the benchmark and prints the results as JSON"""
+    parser = argparse.ArgumentParser(description="Load benchmark of GET /github/user-summary")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests")
+    parser.add_argument("--warmup", type=int, default=10, help="Requests sent before measuring")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    parser.add_argument("--tokens", type=int, default=50, help="Distinct tokens (users) to spread requests over")
+    parser.add_argument("--query", default="", help="Query string appended to the path, e.g. '?include=repositories'")
+    parser.add_argument("--repositories", type=int, default=200, help="Repositories per user")
+    parser.add_argument("--organizations", type=int, default=5, help="Organizations per user")
+    parser.add_argument("--pull-requests", type=int, default=300, help="Pull requests per user")
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected upstream latency in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Upstream latency jitter in ms")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Core rate limit per token and hour")
+    parser.add_argument("--search-rate-limit", type=int, default=30, help="Search rate limit per token and minute")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+    
+    # Keep stdout for the JSON results; the app's startup logs go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Local stand-in for the GitHub REST API used by the benchmarks.
+
+``FakeGitHub`` is an ``httpx.MockTransport`` that serves realistic user,
+repository, organization and issue search payloads, with Link-header
+pagination, X-RateLimit-* headers and optional injected latency. Tokens map
+to users: ``Bearer token-3`` is ``user-3``.
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import httpx
+
+
+@dataclass
+class FakeGitHubConfig:
+    """Payload sizes and behaviour of the fake API"""
+    repositories: int = 200
+    organizations: int = 5
+    pull_requests: int = 300
+    max_per_page: int = 100
+    latency: float = 0.02
+    latency_jitter: float = 0.005
+    # GitHub's limits per token: 5000 core calls per hour, 30 searches per minute
+    rate_limit: int = 5000
+    rate_limit_reset_window: int = 3600
+    search_rate_limit: int = 30
+    search_rate_limit_reset_window: int = 60
+    seed: int = 0
+
+
+@dataclass
+class FakeGitHubStats:
+    """Upstream traffic seen by the fake API"""
+    requests: int = 0
+    bytes_sent: int = 0
+    by_path: Dict[str, int] = field(default_factory=dict)
+
+
+def _repository(login: str, index: int) -> Dict[str, Any]:
+    """Builds a repository object with the size and shape of the real API"""
+    name = f"repo-{index}"
+    full_name = f"{login}/{name}"
+    api = f"https://api.github.com/repos/{full_name}"
+    payload = {
+        "id": 100000 + index,
+        "node_id": f"R_kgDO{index:08d}",
+        "name": name,
+        "full_name": full_name,
+        "private": index % 3 == 0,
+        "owner": _owner(login),
+        "html_url": f"https://github.com/{full_name}",
+        "description": f"Benchmark repository number {index}",
+        "fork": False,
+        "url": api,
+        "homepage": None,
+        "size": 1024 + index,
+        "stargazers_count": index * 3,
+        "watchers_count": index * 3,
+        "language": ("Python", "Go", "TypeScript", None)[index % 4],
+        "has_issues": True,
+        "has_projects": True,
+        "has_downloads": True,
+        "has_wiki": True,
+        "has_pages": False,
+        "has_discussions": False,
+        "forks_count": index,
+        "mirror_url": None,
+        "archived": False,
+        "disabled": False,
+        "open_issues_count": index % 7,
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT", "url": "https://api.github.com/licenses/mit"},
+        "allow_forking": True,
+        "is_template": False,
+        "topics": ["benchmark", "fake"],
+        "visibility": "private" if index % 3 == 0 else "public",
+        "forks": index,
+        "open_issues": index % 7,
+        "watchers": index * 3,
+        "default_branch": "main",
+        "permissions": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": f"2024-{1 + index % 12:02d}-01T00:00:00Z",
+        "pushed_at": "2024-06-01T00:00:00Z",
+    }
+    for resource in (
+        "forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events", "assignees",
+        "branches", "tags", "blobs", "git_tags", "git_refs", "trees", "statuses", "languages",
+        "stargazers", "contributors", "subscribers", "subscription", "commits", "git_commits",
+        "comments", "issue_comment", "contents", "compare", "merges", "archive", "downloads",
+        "issues", "pulls", "milestones", "notifications", "labels", "releases", "deployments",
+    ):
+        payload[f"{resource}_url"] = f"{api}/{resource}"
+    return payload
+
+
+def _owner(login: str) -> Dict[str, Any]:
+    """Builds the nested owner object of repositories and issues"""
+    api = f"https://api.github.com/users/{login}"
+    return {
+        "login": login,
+        "id": 1,
+        "node_id": "U_kgDOAAAAAQ",
+        "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
+        "gravatar_id": "",
+        "url": api,
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"{api}/followers",
+        "following_url": f"{api}/following{{/other_user}}",
+        "gists_url": f"{api}/gists{{/gist_id}}",
+        "starred_url": f"{api}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{api}/subscriptions",
+        "organizations_url": f"{api}/orgs",
+        "repos_url": f"{api}/repos",
+        "events_url": f"{api}/events{{/privacy}}",
+        "received_events_url": f"{api}/received_events",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def _organization(index: int) -> Dict[str, Any]:
+    """Builds an organization object"""
+    api = f"https://api.github.com/orgs/org-{index}"
+    return {
+        "login": f"org-{index}",
+        "id": 9000 + index,
+        "node_id": f"O_kgDO{index:08d}",
+        "url": api,
+        "repos_url": f"{api}/repos",
+        "events_url": f"{api}/events",
+        "hooks_url": f"{api}/hooks",
+        "issues_url": f"{api}/issues",
+        "members_url": f"{api}/members{{/member}}",
+        "public_members_url": f"{api}/public_members{{/member}}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{9000 + index}?v=4",
+        "description": f"Benchmark organization {index}",
+    }
+
+
+def _pull_request(login: str, index: int) -> Dict[str, Any]:
+    """Builds an issue search result for a pull request"""
+    repository_url = f"https://api.github.com/repos/{login}/repo-{index % 50}"
+    return {
+        "url": f"{repository_url}/issues/{index}",
+        "repository_url": repository_url,
+        "html_url": f"https://github.com/{login}/repo-{index % 50}/pull/{index}",
+        "id": 500000 + index,
+        "number": index,
+        "title": f"Benchmark pull request {index}",
+        "user": _owner(login),
+        "labels": [{"id": 1, "name": "enhancement", "color": "a2eeef", "default": True}],
+        "state": ("open", "closed")[index % 2],
+        "locked": False,
+        "assignee": None,
+        "assignees": [],
+        "milestone": None,
+        "comments": index % 5,
+        "created_at": f"2023-{1 + index % 12:02d}-15T10:00:00Z",
+        "updated_at": f"2024-{1 + index % 12:02d}-15T10:00:00Z",
+        "closed_at": None,
+        "author_association": "OWNER",
+        "draft": False,
+        "pull_request": {
+            "url": f"{repository_url}/pulls/{index}",
+            "html_url": f"https://github.com/{login}/repo-{index % 50}/pull/{index}",
+            "diff_url": f"https://github.com/{login}/repo-{index % 50}/pull/{index}.diff",
+            "patch_url": f"https://github.com/{login}/repo-{index % 50}/pull/{index}.patch",
+            "merged_at": None,
+        },
+        "body": "Benchmark pull request body " * 4,
+        "score": 1.0,
+    }
+
+
+class FakeGitHub(httpx.MockTransport):
+    """
+    httpx transport answering GitHub REST calls from generated payloads.
+    
+    Payloads are built once per page and reused, so the benchmark measures
+    this service rather than the fake.
+    """
+    
+    def __init__(self, config: Optional[FakeGitHubConfig] = None):
+        super().__init__(self.handle)
+        self.config = config or FakeGitHubConfig()
+        self.stats = FakeGitHubStats()
+        self._random = random.Random(self.config.seed)
+        self._remaining: Dict[str, int] = {}
+        self._reset_at: Dict[str, int] = {}
+        self._pages: Dict[str, bytes] = {}
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """Routes a request to its payload after the injected latency"""
+        if self.config.latency > 0:
+            jitter = self._random.uniform(-self.config.latency_jitter, self.config.latency_jitter)
+            await asyncio.sleep(max(self.config.latency + jitter, 0))
+        
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not token:
+            return self._respond(request, token, 401, {"message": "Requires authentication"})
+        viewer = token.replace("token", "user", 1)
+        
+        path = request.url.path
+        parts = path.strip("/").split("/")
+        if path == "/user":
+            return self._respond(request, token, 200, self._user(viewer))
+        if len(parts) == 2 and parts[0] == "users":
+            return self._respond(request, token, 200, self._user(parts[1]))
+        if path == "/user/repos" or (len(parts) == 3 and parts[0] == "users" and parts[2] == "repos"):
+            login = viewer if path == "/user/repos" else parts[1]
+            return self._paginated(request, token, f"repos:{login}", self.config.repositories, login, _repository)
+        if path == "/user/orgs" or (len(parts) == 3 and parts[0] == "users" and parts[2] == "orgs"):
+            body = self._page_body("orgs", lambda: [_organization(i) for i in range(self.config.organizations)])
+            return self._respond(request, token, 200, body)
+        if path == "/search/issues":
+            return self._search(request, token)
+        return self._respond(request, token, 404, {"message": "Not Found"})
+    
+    def _user(self, login: str) -> Dict[str, Any]:
+        """Builds the user object of ``/user`` and ``/users/{login}``"""
+        return {
+            **_owner(login),
+            "name": f"Benchmark {login}",
+            "company": "@benchmark",
+            "blog": "https://example.com",
+            "location": "Localhost",
+            "email": None,
+            "bio": "Generated by the fake GitHub API",
+            "public_repos": self.config.repositories,
+            "public_gists": 3,
+            "followers": 42,
+            "following": 7,
+            "created_at": "2015-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+    
+    def _paginated(
+        self,
+        request: httpx.Request,
+        token: str,
+        key: str,
+        total: int,
+        login: str,
+        build: Any
+    ) -> httpx.Response:
+        """Serves one page of a list endpoint with its Link header"""
+        per_page, page = self._page_params(request)
+        start = (page - 1) * per_page
+        body = self._page_body(
+            f"{key}:{per_page}:{page}",
+            lambda: [build(login, index) for index in range(start, min(start + per_page, total))]
+        )
+        last_page = max((total + per_page - 1) // per_page, 1)
+        return self._respond(request, token, 200, body, self._link(request, page, last_page))
+    
+    def _search(self, request: httpx.Request, token: str) -> httpx.Response:
+        """Serves a page of the pull request search"""
+        per_page, page = self._page_params(request)
+        login = request.url.params.get("q", "").split()[0].removeprefix("author:")
+        total = self.config.pull_requests
+        start = (page - 1) * per_page
+        capped = min(total, 1000)
+        body = self._page_body(f"search:{login}:{per_page}:{page}", lambda: {
+            "total_count": total,
+            "incomplete_results": False,
+            "items": [_pull_request(login, index) for index in range(start, min(start + per_page, capped))],
+        })
+        last_page = max((capped + per_page - 1) // per_page, 1)
+        return self._respond(request, token, 200, body, self._link(request, page, last_page), resource="search")
+    
+    def _page_params(self, request: httpx.Request):
+        """Reads ``per_page`` and ``page`` the way GitHub does"""
+        per_page = min(int(request.url.params.get("per_page", 30)), self.config.max_per_page)
+        page = max(int(request.url.params.get("page", 1)), 1)
+        return per_page, page
+    
+    def _page_body(self, key: str, build: Any) -> bytes:
+        """Returns the encoded payload of a page, building it on first use"""
+        body = self._pages.get(key)
+        if body is None:
+            body = self._pages[key] = json.dumps(build()).encode()
+        return body
+    
+    def _link(self, request: httpx.Request, page: int, last_page: int) -> Optional[str]:
+        """Builds the Link header for a page"""
+        if last_page <= 1:
+            return None
+        base = f"https://api.github.com{request.url.path}"
+        params = dict(request.url.params)
+        
+        def url(target: int) -> str:
+            return f"{base}?{urlencode({**params, 'page': target})}"
+        
+        links = []
+        if page < last_page:
+            links.append(f'<{url(page + 1)}>; rel="next"')
+            links.append(f'<{url(last_page)}>; rel="last"')
+        if page > 1:
+            links.append(f'<{url(1)}>; rel="first"')
+            links.append(f'<{url(page - 1)}>; rel="prev"')
+        return ", ".join(links)
+    
+    def _respond(
+        self,
+        request: httpx.Request,
+        token: str,
+        status_code: int,
+        body: Any,
+        link: Optional[str] = None,
+        resource: str = "core"
+    ) -> httpx.Response:
+        """Builds a response with the rate limit headers of the token's budget"""
+        budget_key = f"{token}:{resource}"
+        if resource == "core":
+            limit, window = self.config.rate_limit, self.config.rate_limit_reset_window
+        else:
+            limit, window = self.config.search_rate_limit, self.config.search_rate_limit_reset_window
+        now = int(time.time())
+        reset_at = self._reset_at.get(budget_key)
+        if reset_at is None or reset_at <= now:
+            # A new window starts with the full budget
+            reset_at = self._reset_at[budget_key] = now + window
+            self._remaining[budget_key] = limit
+        remaining = max(self._remaining[budget_key] - 1, 0)
+        self._remaining[budget_key] = remaining
+        
+        content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": resource,
+        }
+        if link:
+            headers["Link"] = link
+        
+        self.stats.requests += 1
+        self.stats.bytes_sent += len(content)
+        self.stats.by_path[request.url.path] = self.stats.by_path.get(request.url.path, 0) + 1
+        return httpx.Response(status_code, content=content, headers=headers)
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+from src.config import Settings
+from src.github.cache import hash_token
+from src.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_SHED
+
+
+class AdmissionRejected(Exception):
+    """A request that was shed instead of admitted"""
+    
+    def __init__(self, status_code: int, detail: str, retry_after: int, reason: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Bounds the expensive requests processed at once.
+    
+    - At most ``max_in_flight`` requests run at once.
+    - Up to ``max_queue`` more wait for a slot, each for at most
+      ``queue_timeout`` seconds; beyond that they are shed with 503.
+    - A token may have at most ``per_token_limit`` requests running or
+      queued; more are shed with 429 so one client cannot fill the queue.
+    
+    Retry-After is estimated from the recent duration of admitted requests
+    and the length of the queue.
+    """
+    
+    def __init__(
+        self,
+        paths: Iterable[str] = ("/github/user-summary",),
+        max_in_flight: int = 100,
+        max_queue: int = 200,
+        queue_timeout: float = 2.0,
+        per_token_limit: int = 4
+    ):
+        self.paths = frozenset(paths)
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.per_token_limit = per_token_limit
+        self.in_flight = 0
+        self.queued = 0
+        # Moving average of the duration of admitted requests
+        self.average_duration = 0.0
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._per_token: Dict[str, int] = {}
+    
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait before retrying"""
+        drain_time = self.average_duration * (self.queued + 1) / self.max_in_flight
+        return max(1, math.ceil(drain_time))
+    
+    @asynccontextmanager
+    async def admit(self, token_key: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Holds a slot for the duration of the block, waiting in the queue if needed.
+        
+        Raises:
+            AdmissionRejected: If the token is over its limit, the queue is
+                full, or no slot freed up within ``queue_timeout``
+        """
+        if token_key is not None and self._per_token.get(token_key, 0) >= self.per_token_limit:
+            self._reject(429, "Too many concurrent requests for this token", "token_limit")
+        if self._slots.locked() and self.queued >= self.max_queue:
+            self._reject(503, "Service overloaded, try again later", "queue_full")
+        
+        if token_key is not None:
+            self._per_token[token_key] = self._per_token.get(token_key, 0) + 1
+        try:
+            await self._acquire_slot()
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self._slots.release()
+                duration = time.perf_counter() - start
+                self.average_duration += 0.2 * (duration - self.average_duration)
+        finally:
+            if token_key is not None:
+                self._per_token[token_key] -= 1
+                if not self._per_token[token_key]:
+                    del self._per_token[token_key]
+    
+    async def _acquire_slot(self) -> None:
+        """Takes a free slot, or waits in the queue for up to ``queue_timeout``"""
+        if not self._slots.locked():
+            await self._slots.acquire()
+            return
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject(503, "Service overloaded, try again later", "queue_timeout")
+        finally:
+            self.queued -= 1
+            ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start)
+    
+    def _reject(self, status_code: int, detail: str, reason: str) -> None:
+        ADMISSION_SHED.inc(reason)
+        raise AdmissionRejected(status_code, detail, self.retry_after(), reason)
+
+
+def create_admission_controller(settings: Settings) -> Optional[AdmissionController]:
+    """Creates the admission controller of the app, None if disabled"""
+    if not settings.admission_enabled:
+        return None
+    return AdmissionController(
+        paths=[path.strip() for path in settings.admission_paths.split(",") if path.strip()],
+        max_in_flight=settings.admission_max_in_flight,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+        per_token_limit=settings.admission_per_token_limit,
+    )
+
+
+def _token_key(headers: Dict[bytes, bytes]) -> Optional[str]:
+    """Hashed bearer token of a request, None if it has none"""
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return hash_token(token.strip())
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds requests to the paths of the app's AdmissionController.
+    
+    The controller is read from ``app.state.admission_controller`` (created in
+    the lifespan); without one every request is let through. Shed requests
+    are answered at once with 503 or 429, a JSON ``detail`` and Retry-After.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        app = scope.get("app")
+        controller = getattr(app.state, "admission_controller", None) if app is not None else None
+        if scope["type"] != "http" or controller is None or scope["path"] not in controller.paths:
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            async with controller.admit(_token_key(dict(scope.get("headers") or []))):
+                await self.app(scope, receive, send)
+        except AdmissionRejected as rejected:
+            body = json.dumps({"detail": rejected.detail}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": rejected.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(rejected.retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
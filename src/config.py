@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -12,13 +15,127 @@ class Settings(BaseSettings):
     # GitHub API configuration
     github_api_base_url: str = "https://api.github.com"
     github_api_version: str = "2022-11-28"
+    # "rest" uses four REST calls per summary, "graphql" a single GraphQL query
+    github_backend: Literal["rest", "graphql"] = "rest"
+    
+    # GitHub HTTP connection pool
+    github_max_connections: int = 100
+    github_max_keepalive_connections: int = 20
+    github_keepalive_expiry: float = 30.0
+    github_http2: bool = False
+    
+    # Maximum pages fetched concurrently when paginating a GitHub listing
+    github_pagination_concurrency: int = 4
+    
+    # Rate limit scheduling driven by X-RateLimit-* / Retry-After headers
+    github_rate_limit_max_wait: float = 5.0
+    # Fraction of a resource's limit below which calls are spread until the reset
+    github_rate_limit_pace_fraction: float = 0.1
+    github_max_concurrent_requests_per_token: int = 10
+    
+    # Circuit breaker per endpoint class (core, search, graphql): opens on a
+    # high failure or slow-call rate and fails fast until a probe succeeds
+    github_circuit_breaker_enabled: bool = True
+    github_circuit_breaker_window: int = 20
+    github_circuit_breaker_min_calls: int = 10
+    github_circuit_breaker_failure_rate: float = 0.5
+    github_circuit_breaker_slow_call_duration: float = 5.0
+    github_circuit_breaker_slow_call_rate: float = 0.8
+    github_circuit_breaker_open_duration: float = 30.0
+    github_circuit_breaker_half_open_probes: int = 1
+    
+    # Hedged GETs: a duplicate request goes out when a call to one of these
+    # comma-separated resources is slower than the given percentile of recent
+    # latencies, for at most ``budget`` extra calls per call. Off by default:
+    # duplicate calls spend rate limit and load GitHub for a tail latency win
+    github_hedging_enabled: bool = False
+    github_hedging_resources: str = "search"
+    github_hedging_percentile: float = 0.95
+    github_hedging_budget: float = 0.05
+    github_hedging_min_delay: float = 0.05
+    github_hedging_min_samples: int = 20
+    
+    # Pull request search: opt into date-sharded search to go past the
+    # 1000-result cap; sharded queries are paced to respect the search limit
+    github_pr_search_sharded: bool = False
+    github_search_concurrency: int = 2
+    github_search_min_interval: float = 2.0
+    
+    # Incremental repository listing: keep each user's last repository list
+    # and only page until repositories older than it; a full listing every
+    # github_repo_sync_full_interval seconds catches deletions and lost access
+    github_repo_sync_enabled: bool = False
+    github_repo_sync_full_interval: float = 3600.0
+    github_repo_sync_max_entries: int = 1024
+    
+    # Conditional-request (ETag) cache for GitHub responses
+    github_response_cache_enabled: bool = True
+    github_response_cache_max_entries: int = 1024
+    github_response_cache_max_bytes: int = 50 * 1024 * 1024
+    
+    # Batch summaries: global limit shared by all batches, and per token
+    batch_max_items: int = 1000
+    batch_max_concurrency: int = 20
+    batch_per_token_concurrency: int = 2
+    
+    # Cache of finished user summaries (stale-while-revalidate)
+    summary_cache_enabled: bool = False
+    summary_cache_ttl: float = 60.0
+    summary_cache_stale_ttl: float = 300.0
+    summary_cache_max_entries: int = 1024
+    # "memory" keeps summaries per worker; "sqlite" shares them between the
+    # workers of a host through a file that also survives restarts
+    summary_cache_backend: Literal["memory", "sqlite"] = "memory"
+    summary_cache_path: str = "/tmp/github_user_summary/summary_cache.sqlite3"
+    summary_cache_max_bytes: int = 256 * 1024 * 1024
+    
+    # Compression of summary responses (gzip, and brotli when the brotli
+    # package is installed) for bodies of at least response_compression_min_size bytes
+    response_compression_enabled: bool = True
+    response_compression_min_size: int = 1024
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 5
+    
+    # Admission control of summary requests: at most admission_max_in_flight
+    # run at once and admission_max_queue more wait up to admission_queue_timeout
+    # seconds; the rest get 503, or 429 past the per-token limit
+    admission_enabled: bool = True
+    admission_paths: str = "/github/user-summary,/github/user-summary/stream"
+    admission_max_in_flight: int = 100
+    admission_max_queue: int = 200
+    admission_queue_timeout: float = 2.0
+    admission_per_token_limit: int = 4
+    
+    # Time budget of a user summary in seconds (0 disables it). Clients can
+    # pick their own with X-Request-Timeout, up to request_deadline_max
+    request_deadline: float = 20.0
+    request_deadline_max: float = 60.0
+    
+    # Shared secret of the GitHub webhook (X-Hub-Signature-256); webhooks are disabled without it
+    github_webhook_secret: Optional[str] = None
+    
+    # Admin-only request profiling (X-Profile + X-Admin-Token); disabled without a token
+    admin_token: Optional[str] = None
+    profile_sample_interval: float = 0.002
     
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 
+@lru_cache()
 def get_settings() -> Settings:
-    """Dependency to get application settings instance"""
+    """
+    Dependency to get the application settings instance.
+    
+    The environment and ``.env`` are read once per process; call
+    ``reload_settings`` to pick up configuration changes.
+    """
     return Settings()
 
+
+def reload_settings() -> Settings:
+    """Discards the cached settings and reads the environment and ``.env`` again"""
+    get_settings.cache_clear()
+    return get_settings()
+
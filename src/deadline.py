@@ -0,0 +1,99 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Awaitable, Iterator, Optional
+
+from src.exceptions import handle_deadline_exceeded
+
+
+class Deadline:
+    """
+    Point in time by which a request must be answered.
+    
+    Upstream calls size their timeout from the time that is left, so a slow
+    call cannot outlive the request that made it.
+    """
+    
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+    
+    def remaining(self) -> float:
+        """Returns the seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Whether the deadline has been reached"""
+        return self.remaining() <= 0.0
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Returns the deadline of the request being handled, None if it has none"""
+    return _current_deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Returns the seconds left for the current request, None without a deadline"""
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def upstream_timeout(default: float) -> float:
+    """Returns the timeout for an upstream call: ``default`` capped by the time left"""
+    remaining = remaining_time()
+    return default if remaining is None else min(default, remaining)
+
+
+def start_shared(awaitable: Awaitable[Any]) -> asyncio.Future:
+    """
+    Starts work shared by several requests, without the current request's deadline.
+    
+    The task sees no deadline, so the request that happens to start it does
+    not impose its time budget on the others; each waiter bounds its own
+    wait with ``wait_within_deadline``.
+    """
+    context = copy_context()
+    context.run(_current_deadline.set, None)
+    return context.run(asyncio.ensure_future, awaitable)
+
+
+async def wait_within_deadline(future: asyncio.Future) -> Any:
+    """
+    Waits for shared work until the current request's deadline.
+    
+    The work is shielded, so a waiter that gives up does not cancel it for
+    the others.
+    
+    Raises:
+        HTTPException: 504 if the deadline passes first
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return await asyncio.shield(future)
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), remaining)
+    except asyncio.TimeoutError:
+        handle_deadline_exceeded()
+
+
+@contextmanager
+def request_deadline(timeout: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Runs the block with a deadline ``timeout`` seconds from now.
+    
+    Tasks created inside the block inherit it. A ``timeout`` of None runs the
+    block without a deadline.
+    """
+    if timeout is None:
+        yield None
+        return
+    deadline = Deadline(timeout)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
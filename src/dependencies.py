@@ -1,8 +1,19 @@
+import httpx
+from typing import Optional
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Query, Request
 
 from src.config import Settings, get_settings
+from src.github.batch import BatchExecutor
+from src.github.breaker import CircuitBreakers
+from src.github.cache import ResponseCache, SummaryCache
 from src.github.client import GitHubAPIClient
+from src.github.compression import ResponseEncoder, create_response_encoder
+from src.github.graphql import GitHubGraphQLService
+from src.github.hedging import HedgingPolicy
+from src.github.ratelimit import RateLimitScheduler
+from src.github.repository_sync import RepositorySync
+from src.github.selection import SummarySelection
 from src.github.service import GitHubService
 
 
@@ -12,22 +23,173 @@ security = HTTPBearer(
 )
 
 
+optional_security = HTTPBearer(
+    scheme_name="GitHub Token",
+    description="Enter your GitHub personal access token",
+    auto_error=False
+)
+
+
 def get_github_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> HTTPAuthorizationCredentials:
     return credentials
 
 
-def get_github_client(
+def get_optional_github_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[HTTPAuthorizationCredentials]:
+    return credentials
+
+
+def get_summary_selection(
+    include: Optional[str] = Query(
+        None, description="Comma-separated sections to fetch: repositories, organizations, pull_requests"
+    ),
+    exclude: Optional[str] = Query(
+        None, description="Comma-separated sections to leave out"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated section.field names to return, e.g. user.login,repositories.name"
+    )
+) -> SummarySelection:
+    """Dependency to parse the requested summary sections and fields"""
+    try:
+        return SummarySelection.parse(include=include, exclude=exclude, fields=fields)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+
+
+def get_request_timeout(
+    x_request_timeout: Optional[float] = Header(
+        None, description="Seconds the client is willing to wait; sections still missing by then are left out"
+    ),
     settings: Settings = Depends(get_settings)
+) -> Optional[float]:
+    """Dependency to get the time budget of a request, None if it has no deadline"""
+    if x_request_timeout is None:
+        return settings.request_deadline if settings.request_deadline > 0 else None
+    if x_request_timeout <= 0:
+        raise HTTPException(status_code=422, detail="X-Request-Timeout must be a positive number of seconds")
+    return min(x_request_timeout, settings.request_deadline_max)
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency to get the pooled HTTP client created in the app lifespan"""
+    return request.app.state.http_client
+
+
+def get_response_cache(request: Request) -> Optional[ResponseCache]:
+    """Dependency to get the shared GitHub response cache (None if disabled)"""
+    return getattr(request.app.state, "response_cache", None)
+
+
+def get_summary_cache(request: Request) -> Optional[SummaryCache]:
+    """Dependency to get the shared user summary cache (None if disabled)"""
+    return getattr(request.app.state, "summary_cache", None)
+
+
+def get_response_encoder(settings: Settings = Depends(get_settings)) -> ResponseEncoder:
+    """Dependency to get the ETag and compression handling of summary responses"""
+    return create_response_encoder(settings)
+
+
+def get_batch_executor(request: Request) -> BatchExecutor:
+    """Dependency to get the shared batch executor"""
+    return request.app.state.batch_executor
+
+
+def get_rate_limiter(request: Request) -> RateLimitScheduler:
+    """Dependency to get the shared rate limit scheduler"""
+    return request.app.state.rate_limiter
+
+
+def create_github_service(
+    settings: Settings,
+    github_client: GitHubAPIClient,
+    repository_sync: Optional[RepositorySync] = None
+) -> GitHubService:
+    """Creates the GitHub service for the configured backend"""
+    if settings.github_backend == "graphql":
+        return GitHubGraphQLService(github_client=github_client, repository_sync=repository_sync)
+    return GitHubService(
+        github_client=github_client,
+        shard_pull_request_search=settings.github_pr_search_sharded,
+        repository_sync=repository_sync
+    )
+
+
+def get_circuit_breakers(request: Request) -> Optional[CircuitBreakers]:
+    """Dependency to get the shared upstream circuit breakers (None if disabled)"""
+    return getattr(request.app.state, "circuit_breakers", None)
+
+
+def get_hedging_policy(request: Request) -> Optional[HedgingPolicy]:
+    """Dependency to get the shared request hedging policy (None if disabled)"""
+    return getattr(request.app.state, "hedging_policy", None)
+
+
+def get_repository_sync(request: Request) -> Optional[RepositorySync]:
+    """Dependency to get the shared repository snapshots (None if incremental sync is disabled)"""
+    return getattr(request.app.state, "repository_sync", None)
+
+
+def get_github_client(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+    response_cache: Optional[ResponseCache] = Depends(get_response_cache),
+    rate_limiter: RateLimitScheduler = Depends(get_rate_limiter),
+    circuit_breakers: Optional[CircuitBreakers] = Depends(get_circuit_breakers),
+    hedging: Optional[HedgingPolicy] = Depends(get_hedging_policy)
 ) -> GitHubAPIClient:
-    """Dependency to get GitHub API client instance"""
-    return GitHubAPIClient(settings=settings)
+    """
+    Dependency to get the GitHub API client.
+    
+    Returns the client created in the app lifespan, so in-flight request
+    coalescing and the search limiter are shared by every request. A new
+    client is only built when one of its dependencies was overridden.
+    """
+    github_client = getattr(request.app.state, "github_client", None)
+    if (
+        github_client is not None
+        and github_client.settings is settings
+        and github_client.http_client is http_client
+        and github_client.response_cache is response_cache
+        and github_client.rate_limiter is rate_limiter
+        and github_client.circuit_breakers is circuit_breakers
+        and github_client.hedging is hedging
+    ):
+        return github_client
+    return GitHubAPIClient(
+        settings=settings,
+        http_client=http_client,
+        response_cache=response_cache,
+        rate_limiter=rate_limiter,
+        circuit_breakers=circuit_breakers,
+        hedging=hedging
+    )
 
 
 def get_github_service(
-    github_client: GitHubAPIClient = Depends(get_github_client)
+    request: Request,
+    github_client: GitHubAPIClient = Depends(get_github_client),
+    settings: Settings = Depends(get_settings),
+    repository_sync: Optional[RepositorySync] = Depends(get_repository_sync)
 ) -> GitHubService:
-    """Dependency to get GitHub service instance"""
-    return GitHubService(github_client=github_client)
+    """
+    Dependency to get the GitHub service for the configured backend.
+    
+    Returns the service created in the app lifespan unless the client or
+    settings it was built with were overridden.
+    """
+    github_service = getattr(request.app.state, "github_service", None)
+    if (
+        github_service is not None
+        and github_service.github_client is github_client
+        and github_client.settings is settings
+        and github_service.repository_sync is repository_sync
+    ):
+        return github_service
+    return create_github_service(settings, github_client, repository_sync)
 
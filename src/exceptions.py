@@ -1,5 +1,7 @@
+import math
+import time
 import httpx
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 from fastapi import HTTPException
 
 
@@ -17,8 +19,14 @@ DEFAULT_ERROR_MESSAGES: Dict[int, str] = {
 }
 
 
-def handle_github_response(response: httpx.Response, success_status: int = 200) -> Dict[str, Any]:
+def handle_github_response(
+    response: httpx.Response,
+    success_status: int = 200,
+    decode: Optional[Callable[[bytes], Any]] = None
+) -> Dict[str, Any]:
     if response.status_code == success_status:
+        if decode is not None:
+            return decode(response.content)
         return response.json()
     
     detail = DEFAULT_ERROR_MESSAGES.get(
@@ -26,7 +34,35 @@ def handle_github_response(response: httpx.Response, success_status: int = 200)
         f"HTTP Error {response.status_code}: {response.text}"
     )
     
-    raise HTTPException(status_code=response.status_code, detail=detail)
+    headers = None
+    retry_after = get_retry_after(response)
+    if retry_after is not None:
+        headers = {"Retry-After": str(retry_after)}
+    
+    raise HTTPException(status_code=response.status_code, detail=detail, headers=headers)
+
+
+def handle_graphql_response(body: Dict[str, Any]) -> Dict[str, Any]:
+    errors = body.get("errors")
+    if errors and not body.get("data"):
+        messages = "; ".join(error.get("message", "Unknown error") for error in errors)
+        raise HTTPException(status_code=502, detail=f"GitHub GraphQL error: {messages}")
+    return body.get("data") or {}
+
+
+def get_retry_after(response: httpx.Response) -> Optional[int]:
+    """Seconds a client should wait after a rate-limited GitHub response"""
+    if response.status_code not in (403, 429):
+        return None
+    headers = response.headers
+    try:
+        if "Retry-After" in headers:
+            return int(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+            return max(int(headers["X-RateLimit-Reset"]) - int(time.time()), 0)
+    except ValueError:
+        return None
+    return None
 
 
 def handle_timeout() -> None:
@@ -36,9 +72,36 @@ def handle_timeout() -> None:
     )
 
 
+def deadline_exceeded() -> HTTPException:
+    """Error for work that could not finish before the request deadline"""
+    return HTTPException(
+        status_code=504,
+        detail="Request deadline exceeded"
+    )
+
+
+def handle_deadline_exceeded() -> None:
+    raise deadline_exceeded()
+
+
 def handle_connection_error(error: Exception) -> None:
     raise HTTPException(
         status_code=503,
         detail=f"Connection error: {str(error)}"
     )
 
+
+def handle_rate_limited(retry_after: float) -> None:
+    raise HTTPException(
+        status_code=429,
+        detail=DEFAULT_ERROR_MESSAGES[429],
+        headers={"Retry-After": str(math.ceil(retry_after))}
+    )
+
+
+def handle_circuit_open(endpoint_class: str, retry_after: float) -> None:
+    raise HTTPException(
+        status_code=503,
+        detail=f"GitHub {endpoint_class} API is unavailable, failing fast",
+        headers={"Retry-After": str(max(math.ceil(retry_after), 1))}
+    )
@@ -0,0 +1,99 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from src.github.cache import hash_token
+from src.github.schemas import GitHubUserResponse, SectionError
+from src.github.service import GitHubService, describe_error
+
+
+def _failed_section(error: Exception) -> str:
+    """Section a failed summary is reported under"""
+    if isinstance(error, HTTPException):
+        # The only section whose failure fails the whole summary
+        return "user"
+    if isinstance(error, ValidationError):
+        # The top-level field that did not match the response schema
+        return str(error.errors()[0]["loc"][0])
+    return "summary"
+
+
+@dataclass
+class BatchJob:
+    """One summary to compute in a batch"""
+    index: int
+    token: str
+    username: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch job: either a validated summary or an error description"""
+    index: int
+    username: Optional[str]
+    summary: Optional[GitHubUserResponse] = None
+    error: Optional[SectionError] = None
+
+
+class BatchExecutor:
+    """
+    Runs many user summaries over a shared service with bounded concurrency.
+    
+    The global limit is shared by every batch running in the process, so
+    concurrent batches cannot together overload the upstream API. The
+    per-token limit keeps a single token from taking every global slot.
+    """
+    
+    def __init__(self, max_concurrency: int = 20, per_token_concurrency: int = 2):
+        self.per_token_concurrency = per_token_concurrency
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._per_token: Dict[str, asyncio.Semaphore] = {}
+        self._per_token_users: Dict[str, int] = {}
+    
+    async def run(self, service: GitHubService, jobs: List[BatchJob]) -> AsyncIterator[BatchResult]:
+        """
+        Computes every job and yields the results in completion order.
+        
+        Args:
+            service: GitHub service used for every summary
+            jobs: Summaries to compute
+        
+        Yields:
+            BatchResult for each job as soon as it finishes
+        """
+        tasks = [asyncio.ensure_future(self._run_job(service, job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _run_job(self, service: GitHubService, job: BatchJob) -> BatchResult:
+        """Computes one summary under the global and per-token limits"""
+        token_key = hash_token(job.token)
+        semaphore = self._per_token.get(token_key)
+        if semaphore is None:
+            semaphore = self._per_token[token_key] = asyncio.Semaphore(self.per_token_concurrency)
+        self._per_token_users[token_key] = self._per_token_users.get(token_key, 0) + 1
+        try:
+            async with semaphore, self._global:
+                summary = await service.get_user_summary(job.token, job.username)
+            # Validated here so a bad summary fails its own item, not the whole stream
+            return BatchResult(
+                index=job.index,
+                username=job.username,
+                summary=GitHubUserResponse.model_validate(summary)
+            )
+        except Exception as error:
+            return BatchResult(index=job.index, username=job.username, error=SectionError(**describe_error(
+                _failed_section(error), error
+            )))
+        finally:
+            self._per_token_users[token_key] -= 1
+            if self._per_token_users[token_key] == 0:
+                del self._per_token_users[token_key]
+                del self._per_token[token_key]
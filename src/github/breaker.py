@@ -0,0 +1,147 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from src.exceptions import handle_circuit_open
+from src.metrics import CIRCUIT_SHORT_CIRCUITS, CIRCUIT_TRANSITIONS
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Values of the breaker state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding one class of upstream endpoints.
+    
+    - Closed: calls flow and their outcomes fill a window of the last
+      ``window`` calls. Once it holds ``min_calls`` outcomes and the failure
+      rate (timeouts, connection errors, 5xx) or the rate of calls slower
+      than ``slow_call_duration`` crosses its threshold, the breaker opens.
+    - Open: calls fail immediately for ``open_duration`` seconds.
+    - Half-open: up to ``half_open_probes`` probe calls are let through; the
+      breaker closes when they all succeed and opens again on any failure.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_duration: float = 5.0,
+        slow_call_rate: float = 0.8,
+        open_duration: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # (failed, slow) per call, most recent last
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+    
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        now = time.monotonic() if now is None else now
+        return max(self.opened_at + self.open_duration - now, 0.0)
+    
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected without a probe"""
+        return self.state == OPEN and self.retry_after() > 0
+    
+    def acquire(self) -> None:
+        """
+        Admits a call or fails fast.
+        
+        Raises:
+            HTTPException: 503 with Retry-After while the breaker is open or
+                its half-open probes are already in flight
+        """
+        if self.state == CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == OPEN:
+            if self.retry_after(now) > 0:
+                self._reject(self.retry_after(now))
+            self._transition(HALF_OPEN)
+        if self._probes_in_flight >= self.half_open_probes:
+            self._reject(1.0)
+        self._probes_in_flight += 1
+    
+    def release(self, success: Optional[bool], duration: float = 0.0) -> None:
+        """
+        Records the outcome of an admitted call.
+        
+        Args:
+            success: Whether upstream answered without a server error; None if
+                the call never reached upstream (rate limited, cancelled)
+            duration: Seconds the upstream call took
+        """
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if success is None:
+                return
+            if not success or duration >= self.slow_call_duration:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._transition(CLOSED)
+            return
+        if success is None or self.state != CLOSED:
+            return
+        
+        self._outcomes.append((not success, duration >= self.slow_call_duration))
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+            self._open()
+    
+    def _open(self) -> None:
+        self.opened_at = time.monotonic()
+        self._transition(OPEN)
+    
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        CIRCUIT_TRANSITIONS.inc(self.name, state)
+    
+    def _reject(self, retry_after: float) -> None:
+        CIRCUIT_SHORT_CIRCUITS.inc(self.name, "rejected")
+        handle_circuit_open(self.name, retry_after)
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per endpoint class (core, search, graphql), created on first use"""
+    
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+    
+    def get(self, endpoint_class: str) -> CircuitBreaker:
+        """Returns the breaker of an endpoint class"""
+        breaker = self._breakers.get(endpoint_class)
+        if breaker is None:
+            breaker = self._breakers[endpoint_class] = CircuitBreaker(endpoint_class, **self.breaker_options)
+        return breaker
+    
+    def states(self) -> Dict[str, str]:
+        """Current state of every breaker"""
+        return {name: breaker.state for name, breaker in self._breakers.items()}
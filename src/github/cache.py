@@ -0,0 +1,238 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from src.deadline import start_shared, wait_within_deadline
+from src.github.cache_backends import CacheBackend, MemoryCacheBackend
+
+
+def hash_token(token: str) -> str:
+    """Returns a stable fingerprint of a token so raw tokens are never used as keys"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def make_request_key(token: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Builds the cache key for a GitHub request from the hashed token, path and params"""
+    query = urlencode(sorted((params or {}).items()))
+    return f"{hash_token(token)}:{path}?{query}"
+
+
+@dataclass
+class CachedResponse:
+    """GitHub response body stored with its validators"""
+    body: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+    link: Optional[str] = None
+
+
+@dataclass
+class Computed:
+    """Value built for SummaryCache.get_or_compute, with whether it may be stored"""
+    value: Any
+    cacheable: bool = True
+
+
+class ResponseCache:
+    """
+    LRU cache of GitHub responses used for conditional requests.
+    
+    Bodies are shared between callers and must be treated as read-only.
+    Eviction keeps both the entry count and the total body size bounded.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 50 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Returns the cached response for a key and marks it as recently used"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Stores a response, evicting the least recently used ones if needed"""
+        if entry.size > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        self._entries[key] = entry
+        self.total_bytes += entry.size
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+    
+    def delete(self, key: str) -> None:
+        """Removes a response from the cache if present"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+    
+    def clear(self) -> None:
+        """Removes every cached response"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class SummaryCache:
+    """
+    TTL cache of finished user summaries with stale-while-revalidate.
+    
+    Entries younger than ``ttl`` are served as-is. Entries inside the
+    following ``stale_ttl`` window are served immediately while a single
+    background task per key recomputes them. Older entries are recomputed
+    before answering, and concurrent misses share that computation.
+    
+    Values live in a CacheBackend: an in-process LRU by default, or a
+    SQLiteCacheBackend shared by every worker on the host. Refreshes are
+    collapsed per worker.
+    
+    Keys can be tagged (e.g. with the user they describe) so webhook events
+    can find the entries they affect and patch or invalidate them. Tags are
+    stored by the backend, so with SQLite they are shared by the workers and
+    survive restarts along with the entries.
+    """
+    
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        max_entries: int = 1024,
+        backend: Optional[CacheBackend] = None
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Returns the cached value for a key, computing or refreshing it as needed.
+        
+        Args:
+            key: Cache key (must not contain raw tokens)
+            compute: Coroutine factory that builds a fresh value; it may
+                return a Computed to have a value answered but not stored
+        
+        Returns:
+            The cached or freshly computed value
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh(key, compute)
+                return value
+        
+        self.misses += 1
+        return await wait_within_deadline(self._refresh(key, compute))
+    
+    def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Starts a refresh for a key unless one is already running"""
+        task = self._refreshing.get(key)
+        if task is None:
+            # Shared by every reader of the key, so it does not run under the caller's deadline
+            task = start_shared(self._compute_and_store(key, compute))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda done: self._finish_refresh(key, done))
+        return task
+    
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Computes a value and stores it with the current timestamp unless it is not cacheable"""
+        result = await compute()
+        if not isinstance(result, Computed):
+            result = Computed(result)
+        if result.cacheable:
+            self.set(key, result.value)
+        return result.value
+    
+    def _finish_refresh(self, key: str, task: asyncio.Task) -> None:
+        """Forgets a finished refresh task and consumes its exception"""
+        if self._refreshing.get(key) is task:
+            del self._refreshing[key]
+        if not task.cancelled():
+            # Background refresh failures keep serving the stale entry
+            task.exception()
+    
+    def set(self, key: str, value: Any) -> None:
+        """Stores a value as fresh; the backend keeps it through the stale window"""
+        self.backend.set(key, value, self.ttl + self.stale_ttl)
+    
+    def delete(self, key: str) -> None:
+        """Removes a cached value and its tags if present"""
+        self.backend.delete(key)
+    
+    def patch(self, key: str, update: Callable[[Any], Optional[Any]]) -> Optional[bool]:
+        """
+        Rewrites a cached value in place, keeping its age.
+        
+        Args:
+            key: Cache key
+            update: Returns the new value, or None to drop the entry
+        
+        Returns:
+            True if the value was replaced, False if it was dropped, None if
+            the key was not cached
+        """
+        entry = self.backend.get(key)
+        if entry is None:
+            # Forget the tags of an entry that expired or was evicted
+            self.backend.delete(key)
+            return None
+        stored_at, value = entry
+        value = update(value)
+        if value is None:
+            self.delete(key)
+            return False
+        self.backend.set(key, value, self.ttl + self.stale_ttl, stored_at=stored_at)
+        return True
+    
+    def tag(self, key: str, tags: Iterable[str]) -> None:
+        """Indexes a key under tags so ``keys_for`` can find it"""
+        self.backend.tag(key, tags)
+    
+    def keys_for(self, tag: str) -> List[str]:
+        """Returns the keys tagged with ``tag``"""
+        return self.backend.keys_for(tag)
+    
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/stale counters and current sizes"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "entries": len(self.backend),
+            "refreshing": len(self._refreshing),
+        }
+    
+    async def aclose(self) -> None:
+        """Cancels background refreshes that are still running and closes the backend"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.backend.close()
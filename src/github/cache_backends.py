@@ -0,0 +1,296 @@
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+def _size_of(value: Any) -> int:
+    """Size counted against ``max_bytes``; only bytes and strings are measured"""
+    return len(value) if isinstance(value, (bytes, str)) else 0
+
+
+class CacheBackend(ABC):
+    """
+    Storage behind SummaryCache.
+    
+    Entries are stored with the wall-clock time they were computed so their
+    age means the same thing in every worker and after a restart. Each entry
+    also has an expiry after which the backend may drop it. Keys must never
+    contain raw tokens; callers build them from ``hash_token``.
+    
+    Keys can be tagged so entries are found by what they describe. Tags are
+    kept next to the entries: they are dropped with them and shared with
+    every reader of the same storage. A key may be tagged before its value
+    is stored.
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Returns ``(stored_at, value)`` for a key, None if missing or expired"""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float, stored_at: Optional[float] = None) -> None:
+        """Stores a value computed at ``stored_at`` (now by default), to be kept for ``ttl`` seconds from then"""
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes a key and its tags if present"""
+    
+    @abstractmethod
+    def tag(self, key: str, tags: Iterable[str]) -> None:
+        """Replaces the tags of a key"""
+    
+    @abstractmethod
+    def keys_for(self, tag: str) -> List[str]:
+        """Returns the keys tagged with ``tag``, sorted"""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes every entry"""
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries"""
+    
+    def close(self) -> None:
+        """Releases the resources held by the backend"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU bounded by entry count and total bytes"""
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # key -> (stored_at, expires_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+        self._key_tags: Dict[str, FrozenSet[str]] = {}
+        self._tagged: Dict[str, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, expires_at, value = entry
+        if expires_at <= time.time():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return stored_at, value
+    
+    def set(self, key: str, value: Any, ttl: float, stored_at: Optional[float] = None) -> None:
+        # Replacing a value keeps the tags of its key
+        self._remove(key)
+        stored_at = time.time() if stored_at is None else stored_at
+        self._entries[key] = (stored_at, stored_at + ttl, value)
+        self.total_bytes += _size_of(value)
+        while len(self._entries) > self.max_entries or (self.total_bytes > self.max_bytes and len(self._entries) > 1):
+            evicted_key, (_, _, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= _size_of(evicted)
+            self._untag(evicted_key)
+    
+    def delete(self, key: str) -> None:
+        self._remove(key)
+        self._untag(key)
+    
+    def tag(self, key: str, tags: Iterable[str]) -> None:
+        self._untag(key)
+        tags = frozenset(tags)
+        self._key_tags[key] = tags
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+    
+    def keys_for(self, tag: str) -> List[str]:
+        return sorted(self._tagged.get(tag, ()))
+    
+    def _remove(self, key: str) -> None:
+        """Removes the value of a key"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= _size_of(entry[2])
+    
+    def _untag(self, key: str) -> None:
+        """Removes a key from the tag index"""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self._key_tags.clear()
+        self._tagged.clear()
+        self.total_bytes = 0
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache stored in a local SQLite file shared by every worker on the host.
+    
+    The database runs in WAL mode, so readers in other workers are not
+    blocked by a writer, and a busy timeout makes concurrent writers wait
+    instead of failing. Entries survive restarts, so a deploy starts with a
+    warm cache instead of sending every user's summary to GitHub at once.
+    Expired entries are purged and least recently read entries evicted on
+    write to keep the file under ``max_entries`` and ``max_bytes``.
+    
+    Calls run on the event loop, so they must never wait long for another
+    worker's write lock: reads only record their access time once every
+    ``touch_interval`` seconds, and the busy timeout is short. A write that
+    still finds the database locked is skipped (a touch is lost, or a value
+    is recomputed on its next miss) instead of stalling the worker. Deletes
+    are never skipped; they raise once the busy timeout runs out.
+    
+    Values must be bytes.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        busy_timeout: float = 0.05,
+        touch_interval: float = 60.0
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.skipped_writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS summary_cache ("
+            "  key TEXT PRIMARY KEY,"
+            "  value BLOB NOT NULL,"
+            "  size INTEGER NOT NULL,"
+            "  stored_at REAL NOT NULL,"
+            "  expires_at REAL NOT NULL,"
+            "  accessed_at REAL NOT NULL"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS summary_cache_accessed_at ON summary_cache (accessed_at)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS summary_cache_tags ("
+            "  tag TEXT NOT NULL,"
+            "  key TEXT NOT NULL,"
+            "  PRIMARY KEY (tag, key)"
+            ")"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS summary_cache_tags_key ON summary_cache_tags (key)"
+        )
+    
+    def __len__(self) -> int:
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM summary_cache").fetchone()
+        return count
+    
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        now = time.time()
+        row = self._connection.execute(
+            "SELECT stored_at, value, accessed_at FROM summary_cache WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[2] >= self.touch_interval:
+            self._write("UPDATE summary_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], bytes(row[1])
+    
+    def set(self, key: str, value: Any, ttl: float, stored_at: Optional[float] = None) -> None:
+        now = time.time()
+        stored_at = now if stored_at is None else stored_at
+        try:
+            with self._connection:
+                self._connection.execute("BEGIN IMMEDIATE")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO summary_cache (key, value, size, stored_at, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, value, len(value), stored_at, stored_at + ttl, now)
+                )
+                self._evict(now)
+        except sqlite3.OperationalError as error:
+            self._skip_write(error)
+    
+    def _write(self, sql: str, parameters: Tuple = ()) -> None:
+        """Runs a single write statement, skipping it if another worker holds the lock"""
+        try:
+            self._connection.execute(sql, parameters)
+        except sqlite3.OperationalError as error:
+            self._skip_write(error)
+    
+    def _skip_write(self, error: sqlite3.OperationalError) -> None:
+        """Counts a write given up on a busy database; other errors are raised"""
+        if "locked" not in str(error) and "busy" not in str(error):
+            raise error
+        self.skipped_writes += 1
+        print(f"[WARNING] Summary cache write skipped: {error}")
+    
+    def _evict(self, now: float) -> None:
+        """Purges expired entries, then the least recently read ones above the caps"""
+        self._connection.execute(
+            "DELETE FROM summary_cache_tags WHERE key IN (SELECT key FROM summary_cache WHERE expires_at <= ?)",
+            (now,)
+        )
+        self._connection.execute("DELETE FROM summary_cache WHERE expires_at <= ?", (now,))
+        count, total_bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summary_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM summary_cache ORDER BY accessed_at"
+        ).fetchall():
+            if count <= max(self.max_entries, 1) and (total_bytes <= self.max_bytes or count == 1):
+                break
+            doomed.append((key,))
+            count -= 1
+            total_bytes -= size
+        self._connection.executemany("DELETE FROM summary_cache WHERE key = ?", doomed)
+        self._connection.executemany("DELETE FROM summary_cache_tags WHERE key = ?", doomed)
+    
+    def delete(self, key: str) -> None:
+        # Not skipped on a busy database: a lost delete would keep serving an invalidated entry
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("DELETE FROM summary_cache WHERE key = ?", (key,))
+            self._connection.execute("DELETE FROM summary_cache_tags WHERE key = ?", (key,))
+    
+    def tag(self, key: str, tags: Iterable[str]) -> None:
+        try:
+            with self._connection:
+                self._connection.execute("BEGIN IMMEDIATE")
+                self._connection.execute("DELETE FROM summary_cache_tags WHERE key = ?", (key,))
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO summary_cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in set(tags)]
+                )
+        except sqlite3.OperationalError as error:
+            self._skip_write(error)
+    
+    def keys_for(self, tag: str) -> List[str]:
+        rows = self._connection.execute(
+            "SELECT key FROM summary_cache_tags WHERE tag = ? ORDER BY key", (tag,)
+        ).fetchall()
+        return [key for (key,) in rows]
+    
+    def clear(self) -> None:
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("DELETE FROM summary_cache")
+            self._connection.execute("DELETE FROM summary_cache_tags")
+    
+    def close(self) -> None:
+        self._connection.close()
@@ -1,16 +1,166 @@
+import asyncio
+import math
+import re
+import time
 import httpx
-from typing import Dict, Any, List
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Any, AsyncIterator, List, NamedTuple, Optional, Union
+from urllib.parse import quote
 
 from src.config import Settings
-from src.exceptions import handle_github_response, handle_timeout, handle_connection_error
+from src.deadline import remaining_time, start_shared, upstream_timeout, wait_within_deadline
+from src.exceptions import (
+    handle_connection_error,
+    handle_deadline_exceeded,
+    handle_github_response,
+    handle_graphql_response,
+    handle_timeout,
+)
+from src.github.breaker import CircuitBreakers
+from src.github.cache import CachedResponse, ResponseCache, hash_token, make_request_key
+from src.github.hedging import HedgingPolicy
+from src.github.ratelimit import RateLimitScheduler, RequestLimiter
+from src.github.records import decode_organizations, decode_pull_request_search, decode_repositories
+from src.metrics import (
+    CIRCUIT_SHORT_CIRCUITS,
+    UPSTREAM_BYTES,
+    UPSTREAM_COALESCED,
+    UPSTREAM_ERRORS,
+    UPSTREAM_HEDGES,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_NOT_MODIFIED,
+    UPSTREAM_RESPONSES,
+)
+
+
+LAST_PAGE_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="last"')
+USERNAME_IN_PATH = re.compile(r"^/users/[^/]+")
+
+# The search API never returns more than this many results for one query
+SEARCH_RESULT_CAP = 1000
+SEARCH_EPOCH = date(2008, 1, 1)
+
+
+class GitHubResponse(NamedTuple):
+    """Decoded GitHub response with its pagination links"""
+    body: Any
+    link: Optional[str] = None
+    
+    @property
+    def last_page(self) -> Optional[int]:
+        """Page number of the rel="last" link, None if the response is not paginated"""
+        match = LAST_PAGE_LINK.search(self.link or "")
+        if match is None:
+            return None
+        page = httpx.URL(match.group(1)).params.get("page")
+        return int(page) if page and page.isdigit() else None
+
+
+def rate_limit_resource(path: str) -> str:
+    """Returns the GitHub rate limit resource a request path counts against"""
+    if path.startswith("/search/"):
+        return "search"
+    if path == "/graphql":
+        return "graphql"
+    return "core"
+
+
+def endpoint_label(path: str) -> str:
+    """Path template used to label metrics, e.g. ``/users/{username}/repos``"""
+    return USERNAME_IN_PATH.sub("/users/{username}", path)
+
+
+def create_rate_limiter(settings: Settings) -> RateLimitScheduler:
+    """Creates the rate limit scheduler shared by every GitHubAPIClient"""
+    return RateLimitScheduler(
+        max_wait=settings.github_rate_limit_max_wait,
+        pace_fraction=settings.github_rate_limit_pace_fraction,
+        max_concurrent_per_token=settings.github_max_concurrent_requests_per_token,
+    )
+
+
+def create_circuit_breakers(settings: Settings) -> Optional[CircuitBreakers]:
+    """Creates the circuit breakers shared by every GitHubAPIClient, None if disabled"""
+    if not settings.github_circuit_breaker_enabled:
+        return None
+    return CircuitBreakers(
+        window=settings.github_circuit_breaker_window,
+        min_calls=settings.github_circuit_breaker_min_calls,
+        failure_rate=settings.github_circuit_breaker_failure_rate,
+        slow_call_duration=settings.github_circuit_breaker_slow_call_duration,
+        slow_call_rate=settings.github_circuit_breaker_slow_call_rate,
+        open_duration=settings.github_circuit_breaker_open_duration,
+        half_open_probes=settings.github_circuit_breaker_half_open_probes,
+    )
+
+
+def create_hedging_policy(settings: Settings) -> Optional[HedgingPolicy]:
+    """Creates the hedging policy shared by every GitHubAPIClient, None if disabled"""
+    if not settings.github_hedging_enabled:
+        return None
+    return HedgingPolicy(
+        resources=[resource.strip() for resource in settings.github_hedging_resources.split(",") if resource.strip()],
+        percentile=settings.github_hedging_percentile,
+        budget=settings.github_hedging_budget,
+        min_delay=settings.github_hedging_min_delay,
+        min_samples=settings.github_hedging_min_samples,
+    )
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Creates the pooled HTTP client shared by every GitHubAPIClient.
+    
+    The client keeps connections to GitHub alive between requests so each
+    summary does not pay a new TCP+TLS handshake per upstream call.
+    
+    Args:
+        settings: Application settings with the pool configuration
+        
+    Returns:
+        httpx.AsyncClient that must be closed with ``aclose()`` on shutdown
+    """
+    limits = httpx.Limits(
+        max_connections=settings.github_max_connections,
+        max_keepalive_connections=settings.github_max_keepalive_connections,
+        keepalive_expiry=settings.github_keepalive_expiry,
+    )
+    return httpx.AsyncClient(limits=limits, http2=settings.github_http2)
 
 
 class GitHubAPIClient:
     """Client for communicating with GitHub API"""
     
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: Optional[httpx.AsyncClient] = None,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        hedging: Optional[HedgingPolicy] = None
+    ):
+        self.settings = settings
         self.base_url = settings.github_api_base_url
         self.api_version = settings.github_api_version
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_http_client(settings)
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter or create_rate_limiter(settings)
+        self.circuit_breakers = circuit_breakers
+        self.hedging = hedging
+        self.pagination_concurrency = settings.github_pagination_concurrency
+        self.search_limiter = RequestLimiter(
+            max_concurrency=settings.github_search_concurrency,
+            min_interval=settings.github_search_min_interval,
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+    
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP client if it was created by this instance"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     def _get_headers(self, token: str) -> Dict[str, str]:
         """Generates common headers for GitHub requests"""
@@ -20,82 +170,448 @@ class GitHubAPIClient:
             "X-GitHub-Api-Version": self.api_version
         }
     
-    async def get_user(self, token: str) -> Dict[str, Any]:
+    async def _get(
+        self,
+        path: str,
+        token: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10.0,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> Any:
+        """Performs a coalesced GET request and returns only the decoded body"""
+        response = await self._request(path, token, params, timeout, decode)
+        return response.body
+    
+    async def _request(
+        self,
+        path: str,
+        token: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 10.0,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> GitHubResponse:
         """
-        Gets authenticated user information from GitHub API.
+        Performs a coalesced GET request against the GitHub API.
+        
+        Concurrent calls for the same token, path and params share a single
+        in-flight upstream request, so the API is only hit once for them.
+        When a response cache is configured, stored ETag/Last-Modified
+        validators are sent and a 304 answer is served from the cache.
+        Every call goes through the rate limit scheduler, which paces,
+        queues or rejects it based on the token's remaining budget.
         
         Args:
+            path: API path starting with "/"
             token: GitHub personal access token
+            params: Query string parameters
+            timeout: Request timeout in seconds
+            decode: Body decoder (e.g. into compact records), plain JSON by default
             
         Returns:
-            Dict with user information from GitHub
+            GitHubResponse with the decoded JSON body and Link header
             
         Raises:
             HTTPException: If there's an error in the request
         """
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            UPSTREAM_ERRORS.inc(endpoint_label(path), "deadline")
+            handle_deadline_exceeded()
+        key = make_request_key(token, path, params)
+        future = self._in_flight.get(key)
+        if future is not None:
+            UPSTREAM_COALESCED.inc(endpoint_label(path))
+        else:
+            # Started without the caller's deadline, which the callers that join it do not share
+            future = start_shared(self._fetch(key, path, token, params, timeout, decode))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget_in_flight(key, done))
+        # Each caller waits up to its own deadline; giving up does not cancel the request for the others
+        return await wait_within_deadline(future)
+    
+    def _forget_in_flight(self, key: str, future: asyncio.Future) -> None:
+        """Removes a finished request from the in-flight registry"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+    
+    async def _fetch(
+        self,
+        key: str,
+        path: str,
+        token: str,
+        params: Optional[Dict[str, Any]],
+        timeout: float,
+        decode: Optional[Callable[[bytes], Any]] = None
+    ) -> GitHubResponse:
+        """Sends a single GET request, revalidating a cached response if there is one"""
+        headers = self._get_headers(token)
+        cached = self.response_cache.get(key) if self.response_cache is not None else None
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        
+        if cached is not None and self.circuit_breakers is not None:
+            breaker = self.circuit_breakers.get(rate_limit_resource(path))
+            if breaker.is_open():
+                # Serve the last known answer instead of failing while GitHub is unhealthy
+                CIRCUIT_SHORT_CIRCUITS.inc(breaker.name, "cached")
+                return GitHubResponse(cached.body, cached.link)
+        
+        response = await self._send_hedged(path, token, headers, params, timeout)
+        if response.status_code == 304 and cached is not None:
+            UPSTREAM_NOT_MODIFIED.inc(endpoint_label(path))
+            return GitHubResponse(cached.body, cached.link)
+        body = handle_github_response(response, decode=decode)
+        self._store_response(key, response, body)
+        return GitHubResponse(body, response.headers.get("Link"))
+    
+    async def _send_hedged(
+        self,
+        path: str,
+        token: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        timeout: float
+    ) -> httpx.Response:
+        """
+        Sends a GET request, hedging it if it is slower than usual.
+        
+        When the hedging policy has a threshold for the path's resource and
+        the call is still unanswered after it, a duplicate request goes out
+        on another pooled connection if the hedge budget and the token's rate
+        limit allow it. The first successful response wins and the other call
+        is cancelled.
+        """
+        resource = rate_limit_resource(path)
+        delay = self.hedging.delay(resource) if self.hedging is not None else None
+        if delay is None:
+            return await self._send("GET", path, token, headers, params=params, timeout=timeout)
+        
+        primary = asyncio.ensure_future(
+            self._send("GET", path, token, headers, params=params, timeout=timeout)
+        )
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            endpoint = endpoint_label(path)
+            if not (self.rate_limiter.has_headroom(hash_token(token), resource) and self.hedging.try_hedge()):
+                UPSTREAM_HEDGES.inc(endpoint, "throttled")
+                return await primary
+            
+            UPSTREAM_HEDGES.inc(endpoint, "sent")
+            hedge = asyncio.ensure_future(
+                self._send("GET", path, token, dict(headers), params=params, timeout=timeout)
+            )
+            try:
+                pending = {primary, hedge}
+                while True:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is hedge:
+                                UPSTREAM_HEDGES.inc(endpoint, "won")
+                            return task.result()
+                    if not pending:
+                        # Both calls failed: report the original one
+                        return primary.result()
+            finally:
+                hedge.cancel()
+        finally:
+            primary.cancel()
+    
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        token: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        timeout: float = 10.0
+    ) -> httpx.Response:
+        """
+        Sends a request through the circuit breaker and the rate limit scheduler.
+        
+        ``timeout`` is capped by the time left before the request deadline.
+        Running out of that time is not held against the circuit breaker.
+        
+        Raises:
+            HTTPException: On an open circuit, rate limit exhaustion, timeouts
+                or connection errors
+        """
+        token_key = hash_token(token)
+        resource = rate_limit_resource(path)
+        endpoint = endpoint_label(path)
+        breaker = self.circuit_breakers.get(resource) if self.circuit_breakers is not None else None
+        if breaker is not None:
+            breaker.acquire()
+        success: Optional[bool] = None
+        duration = 0.0
+        capped = False
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/user",
-                    headers=self._get_headers(token),
-                    timeout=10.0
-                )
-                return handle_github_response(response)
-                
+            async with self.rate_limiter.slot(token_key, resource):
+                request_timeout = upstream_timeout(timeout)
+                if request_timeout <= 0:
+                    UPSTREAM_ERRORS.inc(endpoint, "deadline")
+                    handle_deadline_exceeded()
+                capped = request_timeout < timeout
+                UPSTREAM_IN_FLIGHT.inc(endpoint)
+                start = time.perf_counter()
+                try:
+                    response = await self.http_client.request(
+                        method,
+                        f"{self.base_url}{path}",
+                        headers=headers,
+                        params=params,
+                        json=json,
+                        timeout=request_timeout
+                    )
+                    success = response.status_code < 500
+                except httpx.RequestError as error:
+                    success = None if capped and isinstance(error, httpx.TimeoutException) else False
+                    raise
+                finally:
+                    duration = time.perf_counter() - start
+                    UPSTREAM_LATENCY.observe(duration, endpoint, method)
+                    UPSTREAM_IN_FLIGHT.dec(endpoint)
+            self.rate_limiter.record(token_key, resource, response)
+            if self.hedging is not None:
+                self.hedging.observe(resource, duration)
+            UPSTREAM_RESPONSES.inc(endpoint, str(response.status_code))
+            UPSTREAM_BYTES.inc(endpoint, amount=len(response.content))
+            return response
+            
         except httpx.TimeoutException:
+            if capped:
+                UPSTREAM_ERRORS.inc(endpoint, "deadline")
+                handle_deadline_exceeded()
+            UPSTREAM_ERRORS.inc(endpoint, "timeout")
             handle_timeout()
         except httpx.RequestError as e:
+            UPSTREAM_ERRORS.inc(endpoint, "connection")
             handle_connection_error(e)
+        finally:
+            if breaker is not None:
+                breaker.release(success, duration)
+    
+    def _store_response(self, key: str, response: httpx.Response, body: Any) -> None:
+        """Caches a successful response when it carries validators"""
+        if self.response_cache is None:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self.response_cache.set(key, CachedResponse(
+                body=body,
+                etag=etag,
+                last_modified=last_modified,
+                size=len(response.content),
+                link=response.headers.get("Link"),
+            ))
+    
+    async def get_user(self, token: str, username: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Gets user information from GitHub API.
+        
+        Args:
+            token: GitHub personal access token
+            username: User to look up, or None for the authenticated user
+            
+        Returns:
+            Dict with user information from GitHub
+            
+        Raises:
+            HTTPException: If there's an error in the request
+        """
+        path = "/user" if username is None else f"/users/{quote(username)}"
+        return await self._get(path, token, timeout=10.0)
+    
+    async def graphql(
+        self,
+        token: str,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        timeout: float = 15.0
+    ) -> Dict[str, Any]:
+        """
+        Runs a GraphQL query against the GitHub API.
+        
+        Args:
+            token: GitHub personal access token
+            query: GraphQL query document
+            variables: Query variables
+            timeout: Request timeout in seconds
+            
+        Returns:
+            The ``data`` object of the GraphQL response
+            
+        Raises:
+            HTTPException: If the request fails or GraphQL reports errors
+        """
+        response = await self._send(
+            "POST",
+            "/graphql",
+            token,
+            self._get_headers(token),
+            json={"query": query, "variables": variables or {}},
+            timeout=timeout
+        )
+        return handle_graphql_response(handle_github_response(response))
+    
+    async def iter_repository_pages(
+        self,
+        token: str,
+        per_page: int = 100,
+        username: Optional[str] = None,
+        sequential: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterates over every page of the user repositories.
+        
+        For the authenticated user this lists every repository the token can
+        access (public and private); for another user, the repositories it owns
+        that are visible to the token.
+        
+        The first page is fetched alone to read the last page number from its
+        Link header; the remaining pages are then fetched concurrently (bounded
+        by ``github_pagination_concurrency``) and yielded in page order.
+        With ``sequential``, each page is only fetched once the previous one
+        has been consumed, so a consumer that stops early saves the rest.
+        
+        Args:
+            token: GitHub personal access token
+            per_page: Number of repositories per page (max 100)
+            username: User whose repositories to list, or None for the authenticated user
+            sequential: Fetch pages one at a time instead of concurrently
+            
+        Yields:
+            Lists of repositories, one per page
+        """
+        if username is None:
+            path = "/user/repos"
+            params = {"per_page": per_page, "sort": "updated", "type": "all"}
+        else:
+            path = f"/users/{quote(username)}/repos"
+            params = {"per_page": per_page, "sort": "updated", "type": "owner"}
+        first_page = await self._request(
+            path, token, params={**params, "page": 1}, timeout=15.0, decode=decode_repositories
+        )
+        yield first_page.body
+        
+        last_page = first_page.last_page or 1
+        if last_page <= 1:
+            return
+        
+        if sequential:
+            for page in range(2, last_page + 1):
+                yield await self._get(
+                    path, token, params={**params, "page": page}, timeout=15.0, decode=decode_repositories
+                )
+            return
+        
+        semaphore = asyncio.Semaphore(self.pagination_concurrency)
+        
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._get(
+                    path, token, params={**params, "page": page}, timeout=15.0, decode=decode_repositories
+                )
+        
+        tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, last_page + 1)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
     
-    async def get_repositories(self, token: str, per_page: int = 100) -> List[Dict[str, Any]]:
+    async def iter_repositories(
+        self,
+        token: str,
+        per_page: int = 100,
+        username: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Gets authenticated user repositories (public and private).
+        Iterates over all user repositories (public and private).
         
         Args:
             token: GitHub personal access token
             per_page: Number of repositories per page (max 100)
+            username: User whose repositories to list, or None for the authenticated user
+            
+        Yields:
+            Repositories as their pages arrive
+        """
+        async for page in self.iter_repository_pages(token, per_page, username):
+            for repo in page:
+                yield repo
+    
+    async def get_repositories(
+        self,
+        token: str,
+        per_page: int = 100,
+        username: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Gets all user repositories (public and private).
+        
+        Args:
+            token: GitHub personal access token
+            per_page: Number of repositories per page (max 100)
+            username: User whose repositories to list, or None for the authenticated user
             
         Returns:
             List of repositories
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/user/repos",
-                    headers=self._get_headers(token),
-                    params={"per_page": per_page, "sort": "updated", "type": "all"},
-                    timeout=15.0
-                )
-                return handle_github_response(response)
-                
-        except httpx.TimeoutException:
-            handle_timeout()
-        except httpx.RequestError as e:
-            handle_connection_error(e)
+        return [repo async for repo in self.iter_repositories(token, per_page, username)]
     
-    async def get_organizations(self, token: str) -> List[Dict[str, Any]]:
+    async def get_organizations(self, token: str, username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Gets organizations the user belongs to.
         
         Args:
             token: GitHub personal access token
+            username: User to look up (public memberships only), or None for the authenticated user
             
         Returns:
             List of organizations
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/user/orgs",
-                    headers=self._get_headers(token),
-                    timeout=10.0
-                )
-                return handle_github_response(response)
-                
-        except httpx.TimeoutException:
-            handle_timeout()
-        except httpx.RequestError as e:
-            handle_connection_error(e)
+        path = "/user/orgs" if username is None else f"/users/{quote(username)}/orgs"
+        return await self._get(path, token, timeout=10.0, decode=decode_organizations)
+    
+    async def search_pull_requests(
+        self,
+        token: str,
+        username: str,
+        per_page: int = 100,
+        page: int = 1,
+        created: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Searches pull requests created by the user.
+        
+        Args:
+            token: GitHub personal access token
+            username: Username
+            per_page: Number of PRs per page (max 100)
+            page: Page number to fetch
+            created: Optional ``created:`` qualifier, e.g. "2023-01-01..2023-06-30"
+            
+        Returns:
+            Search result with ``total_count`` and ``items``
+        """
+        query = f"author:{username} type:pr"
+        if created:
+            query += f" created:{created}"
+        params = {"q": query, "per_page": per_page, "sort": "updated"}
+        if page > 1:
+            params["page"] = page
+        return await self._get(
+            "/search/issues", token, params=params, timeout=15.0, decode=decode_pull_request_search
+        )
     
     async def get_pull_requests(self, token: str, username: str, per_page: int = 100) -> List[Dict[str, Any]]:
         """
@@ -109,23 +625,69 @@ class GitHubAPIClient:
         Returns:
             List of pull requests
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/search/issues",
-                    headers=self._get_headers(token),
-                    params={
-                        "q": f"author:{username} type:pr",
-                        "per_page": per_page,
-                        "sort": "updated"
-                    },
-                    timeout=15.0
+        result = await self.search_pull_requests(token, username, per_page)
+        return result.get("items", [])
+    
+    async def search_all_pull_requests(
+        self,
+        token: str,
+        username: str,
+        since: Optional[Union[str, date]] = None,
+        until: Optional[date] = None,
+        per_page: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Gets every pull request created by the user, past the search result cap.
+        
+        The query is split into ``created:`` date ranges that each match at
+        most 1000 results; ranges above the cap are bisected. Range queries
+        run concurrently through the search limiter.
+        
+        Args:
+            token: GitHub personal access token
+            username: Username
+            since: Earliest creation date to search from (e.g. the user's ``created_at``)
+            until: Latest creation date to search up to (defaults to today)
+            per_page: Number of PRs per page (max 100)
+            
+        Returns:
+            List of pull requests sorted by most recently updated
+        """
+        start = _parse_date(since) or SEARCH_EPOCH
+        
+        async def search(created: str, page: int = 1) -> Dict[str, Any]:
+            async with self.search_limiter:
+                return await self.search_pull_requests(token, username, per_page, page, created)
+        
+        async def collect(range_start: date, range_end: date) -> List[Dict[str, Any]]:
+            created = f"{range_start.isoformat()}..{range_end.isoformat()}"
+            first_page = await search(created)
+            total_count = first_page.get("total_count", 0)
+            if total_count > SEARCH_RESULT_CAP and range_start < range_end:
+                middle = range_start + (range_end - range_start) // 2
+                halves = await asyncio.gather(
+                    collect(range_start, middle),
+                    collect(middle + timedelta(days=1), range_end),
                 )
-                result = handle_github_response(response)
-                return result.get("items", [])
-                
-        except httpx.TimeoutException:
-            handle_timeout()
-        except httpx.RequestError as e:
-            handle_connection_error(e)
+                return halves[0] + halves[1]
+            
+            pages = math.ceil(min(total_count, SEARCH_RESULT_CAP) / per_page)
+            remaining = await asyncio.gather(*(search(created, page) for page in range(2, pages + 1)))
+            items = list(first_page.get("items", []))
+            for result in remaining:
+                items.extend(result.get("items", []))
+            return items
+        
+        items = await collect(start, until or date.today())
+        items.sort(key=lambda pr: pr.get("updated_at") or "", reverse=True)
+        return items
+
 
+def _parse_date(value: Optional[Union[str, date]]) -> Optional[date]:
+    """Parses a GitHub ISO-8601 timestamp or date into a date"""
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
@@ -0,0 +1,201 @@
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import Response
+
+from src.config import Settings
+from src.metrics import SUMMARY_RESPONSES
+
+try:
+    import brotli
+except ImportError:  # optional dependency; responses are only gzipped without it
+    brotli = None
+
+
+# Content codings we can produce, preferred first when a client accepts several equally
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# First byte of a packed body; serialized JSON never starts with NUL
+_PACK_MAGIC = b"\x00"
+
+
+def body_digest(content: bytes) -> str:
+    """Digest a body's ETag is derived from"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+@dataclass
+class EncodedBody:
+    """Serialized JSON body with its digest and precompressed variants by content coding"""
+    content: bytes
+    digest: str
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    
+    def etag(self, coding: Optional[str] = None) -> str:
+        """Strong ETag of one representation; each content coding gets its own"""
+        return f'"{self.digest}-{coding}"' if coding else f'"{self.digest}"'
+    
+    def pack(self) -> bytes:
+        """Serializes the body and its variants into one cacheable bytes value"""
+        parts = [("identity", self.content), *self.encodings.items()]
+        header = json.dumps({"digest": self.digest, "parts": [[name, len(data)] for name, data in parts]})
+        return b"".join([_PACK_MAGIC, header.encode(), b"\n", *(data for _, data in parts)])
+    
+    @classmethod
+    def unpack(cls, data: bytes) -> "EncodedBody":
+        """Reads a value written by ``pack``; plain JSON (cached before compression) is accepted too"""
+        if not data.startswith(_PACK_MAGIC):
+            return cls(content=data, digest=body_digest(data))
+        header_end = data.index(b"\n")
+        header = json.loads(data[1:header_end])
+        parts = {}
+        offset = header_end + 1
+        for name, size in header["parts"]:
+            parts[name] = data[offset:offset + size]
+            offset += size
+        return cls(content=parts.pop("identity"), digest=header["digest"], encodings=parts)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the content coding for an ``Accept-Encoding`` header.
+    
+    Returns:
+        The supported coding with the highest q-value (ties go to the order of
+        SUPPORTED_ENCODINGS), None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def etag_matches(if_none_match: Optional[str], body: EncodedBody) -> bool:
+    """
+    Whether an ``If-None-Match`` header names any representation of a body.
+    
+    Uses the weak comparison of RFC 9110, so ``W/`` prefixes are ignored, and
+    a tag received with one content coding also matches the others.
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        digest, _, coding = tag.partition("-")
+        if digest == body.digest and (not coding or coding in SUPPORTED_ENCODINGS):
+            return True
+    return False
+
+
+class ResponseEncoder:
+    """
+    Conditional and compressed responses for serialized summaries.
+    
+    Bodies get a strong ETag over their bytes, and requests whose
+    ``If-None-Match`` names it are answered with 304 and no body. Bodies of at
+    least ``min_size`` bytes are compressed with the best coding the client
+    accepts (brotli when installed, gzip). Cached bodies carry their
+    compressed variants so hits are not compressed again.
+    """
+    
+    def __init__(
+        self,
+        enabled: bool = True,
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5
+    ):
+        self.enabled = enabled
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    def compressible(self, content: bytes) -> bool:
+        """Whether a body is large enough to be sent compressed"""
+        return self.enabled and len(content) >= self.min_size
+    
+    def compress(self, content: bytes, coding: str) -> bytes:
+        """Compresses a body with one of SUPPORTED_ENCODINGS"""
+        if coding == "br":
+            return brotli.compress(content, quality=self.brotli_quality)
+        return gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+    
+    def encode(self, content: bytes, precompress: bool = False) -> EncodedBody:
+        """
+        Wraps a serialized body for ``respond``.
+        
+        Args:
+            content: Serialized JSON
+            precompress: Compress it with every supported coding now, for
+                bodies that are cached and served many times
+        """
+        body = EncodedBody(content=content, digest=body_digest(content))
+        if precompress and self.compressible(content):
+            body.encodings = {coding: self.compress(content, coding) for coding in SUPPORTED_ENCODINGS}
+        return body
+    
+    def respond(
+        self,
+        body: EncodedBody,
+        accept_encoding: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ) -> Response:
+        """
+        Builds the response for a body.
+        
+        Args:
+            body: Body to send
+            accept_encoding: ``Accept-Encoding`` header of the request
+            if_none_match: ``If-None-Match`` header of the request
+        
+        Returns:
+            Response: 304 without body if the client has it already, else the
+            body in the negotiated content coding
+        """
+        coding = choose_encoding(accept_encoding) if self.compressible(body.content) else None
+        headers = {"ETag": body.etag(coding), "Vary": "Accept-Encoding", "Cache-Control": "private"}
+        if etag_matches(if_none_match, body):
+            SUMMARY_RESPONSES.inc("not_modified")
+            return Response(status_code=304, headers=headers)
+        
+        SUMMARY_RESPONSES.inc(coding or "identity")
+        if coding is None:
+            return Response(content=body.content, media_type="application/json", headers=headers)
+        content = body.encodings.get(coding)
+        if content is None:
+            content = self.compress(body.content, coding)
+        headers["Content-Encoding"] = coding
+        return Response(content=content, media_type="application/json", headers=headers)
+
+
+def create_response_encoder(settings: Settings) -> ResponseEncoder:
+    """Creates the response encoder for the configured compression"""
+    return ResponseEncoder(
+        enabled=settings.response_compression_enabled,
+        min_size=settings.response_compression_min_size,
+        gzip_level=settings.response_gzip_level,
+        brotli_quality=settings.response_brotli_quality,
+    )
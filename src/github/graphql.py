@@ -0,0 +1,271 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Collection, Dict, List, Optional, Tuple
+
+from src.github.selection import SECTIONS
+from src.github.service import GitHubService, describe_error
+from src.metrics import SUMMARY_LATENCY
+from src.timing import phase
+
+
+REPOSITORY_CONNECTION_ARGS = """
+    first: 100, after: $after,
+    affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+    ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+    orderBy: {field: UPDATED_AT, direction: DESC}
+"""
+
+FRAGMENTS = """
+fragment RepositoryFields on Repository {
+  name
+  nameWithOwner
+  isPrivate
+  description
+  url
+  primaryLanguage { name }
+  stargazerCount
+  forkCount
+  createdAt
+}
+
+fragment OrganizationFields on Organization {
+  login
+  databaseId
+  avatarUrl
+  description
+}
+
+fragment PullRequestFields on PullRequest {
+  title
+  number
+  state
+  createdAt
+  repository { nameWithOwner }
+}
+"""
+
+USER_SUMMARY_QUERY = """
+query UserSummary(
+  $after: String,
+  $withRepositories: Boolean = true,
+  $withOrganizations: Boolean = true,
+  $withPullRequests: Boolean = true
+) {
+  viewer {
+    login
+    name
+    company
+    location
+    websiteUrl
+    followers { totalCount }
+    publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: [OWNER]) { totalCount }
+    gists(privacy: PUBLIC) { totalCount }
+    repositories(%s) @include(if: $withRepositories) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes { ...RepositoryFields }
+    }
+    organizations(first: 100, after: $after) @include(if: $withOrganizations) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes { ...OrganizationFields }
+    }
+    pullRequests(first: 100, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withPullRequests) {
+      totalCount
+      nodes { ...PullRequestFields }
+    }
+  }
+}
+""" % REPOSITORY_CONNECTION_ARGS + FRAGMENTS
+
+REPOSITORIES_PAGE_QUERY = """
+query RepositoriesPage($after: String) {
+  viewer {
+    repositories(%s) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...RepositoryFields }
+    }
+  }
+}
+""" % REPOSITORY_CONNECTION_ARGS + FRAGMENTS
+
+ORGANIZATIONS_PAGE_QUERY = """
+query OrganizationsPage($after: String) {
+  viewer {
+    organizations(first: 100, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...OrganizationFields }
+    }
+  }
+}
+""" + FRAGMENTS
+
+
+def _total_count(connection: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Returns a connection's totalCount, None if the connection was not requested"""
+    return None if connection is None else connection["totalCount"]
+
+
+def _map_nodes(process: Callable, nodes: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+    """Formats the nodes of a connection, None if the connection was not requested"""
+    return None if nodes is None else [process(node) for node in nodes]
+
+
+class GitHubGraphQLService(GitHubService):
+    """
+    GitHubService backend that builds the summary from one GraphQL query.
+    
+    The first query returns the user, the first page of every connection and
+    their totals in a single round-trip, requesting only the fields used by
+    the response schemas. Follow-up queries are only sent for the
+    repositories and organizations connections when they have more pages.
+    Sections that are not requested are skipped with ``@include`` directives.
+    """
+    
+    backend = "graphql"
+    
+    async def get_user_summary(
+        self,
+        token: str,
+        username: Optional[str] = None,
+        sections: Optional[Collection[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Gets and processes complete information of a user.
+        
+        Only the authenticated user (the GraphQL ``viewer``) is served by the
+        single query; other users are summarized through the REST calls.
+        
+        Args:
+            token: GitHub personal access token
+            username: User to summarize, or None for the authenticated user
+            sections: Sections to fetch (all by default)
+            
+        Returns:
+            Dict with complete processed user information in the requested structure
+        """
+        if username is not None:
+            return await super().get_user_summary(token, username, sections)
+        with SUMMARY_LATENCY.time(self.backend):
+            return await self._query_viewer_summary(token, sections)
+    
+    async def _query_viewer_summary(self, token: str, sections: Optional[Collection[str]]) -> Dict[str, Any]:
+        """Builds the authenticated user summary from the single GraphQL query"""
+        sections = SECTIONS if sections is None else sections
+        with phase("graphql"):
+            data = await self.github_client.graphql(token, USER_SUMMARY_QUERY, {
+                "withRepositories": "repositories" in sections,
+                "withOrganizations": "organizations" in sections,
+                "withPullRequests": "pull_requests" in sections,
+            })
+        viewer = data["viewer"]
+        repositories = viewer.get("repositories")
+        organizations = viewer.get("organizations")
+        pull_requests = viewer.get("pullRequests")
+        
+        with phase("graphql_pages"):
+            repository_nodes, organization_nodes = await asyncio.gather(
+                self._get_remaining_nodes(token, repositories, REPOSITORIES_PAGE_QUERY, "repositories"),
+                self._get_remaining_nodes(token, organizations, ORGANIZATIONS_PAGE_QUERY, "organizations"),
+            )
+        
+        return {
+            "user": {
+                "login": viewer.get("login"),
+                "name": viewer.get("name"),
+                "company": viewer.get("company"),
+                "location": viewer.get("location"),
+                "blog": viewer.get("websiteUrl"),
+                "followers": viewer["followers"]["totalCount"],
+            },
+            "summary": {
+                "public_repos": viewer["publicRepositories"]["totalCount"],
+                "public_gists": viewer["gists"]["totalCount"],
+                "total_repositories": _total_count(repositories),
+                "total_organizations": _total_count(organizations),
+                "total_pull_requests": _total_count(pull_requests),
+            },
+            "repositories": _map_nodes(self._process_repository_node, repository_nodes),
+            "organizations": _map_nodes(self._process_organization_node, organization_nodes),
+            "pull_requests": _map_nodes(
+                self._process_pull_request_node,
+                None if pull_requests is None else pull_requests["nodes"]
+            ),
+        }
+    
+    async def stream_authenticated_user(
+        self,
+        token: str,
+        sections: Optional[Collection[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streams the summary sections once the GraphQL query resolves.
+        
+        The whole summary comes from a single query, so sections are yielded
+        back to back in the same order as the REST backend.
+        """
+        try:
+            summary = await self.get_user_summary(token, sections=sections)
+        except Exception as error:
+            yield "error", describe_error("user", error)
+            return
+        for section in ("user", "organizations", "repositories", "pull_requests", "summary"):
+            if summary[section] is not None:
+                yield section, summary[section]
+    
+    async def _get_remaining_nodes(
+        self,
+        token: str,
+        connection: Optional[Dict[str, Any]],
+        page_query: str,
+        field: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Follows a connection's cursor until every node has been fetched"""
+        if connection is None:
+            return None
+        nodes = list(connection["nodes"])
+        page_info = connection["pageInfo"]
+        while page_info["hasNextPage"]:
+            data = await self.github_client.graphql(
+                token, page_query, {"after": page_info["endCursor"]}
+            )
+            page = data["viewer"][field]
+            nodes.extend(page["nodes"])
+            page_info = page["pageInfo"]
+        return nodes
+    
+    def _process_repository_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Formats a GraphQL repository node like a REST repository"""
+        language = node.get("primaryLanguage") or {}
+        return {
+            "name": node.get("name"),
+            "full_name": node.get("nameWithOwner"),
+            "private": node.get("isPrivate", False),
+            "description": node.get("description"),
+            "url": node.get("url"),
+            "language": language.get("name"),
+            "stargazers_count": node.get("stargazerCount", 0),
+            "forks_count": node.get("forkCount", 0),
+            "created_at": node.get("createdAt"),
+        }
+    
+    def _process_organization_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Formats a GraphQL organization node like a REST organization"""
+        return {
+            "login": node.get("login"),
+            "id": node.get("databaseId"),
+            "avatar_url": node.get("avatarUrl"),
+            "description": node.get("description"),
+        }
+    
+    def _process_pull_request_node(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Formats a GraphQL pull request node like a REST search result"""
+        repository = node.get("repository") or {}
+        # Issue search reports merged pull requests as closed; GraphQL has a separate MERGED state
+        state = (node.get("state") or "").lower()
+        return {
+            "title": node.get("title"),
+            "number": node.get("number"),
+            "state": "closed" if state == "merged" else state,
+            "repository_url": f"{self.github_client.base_url}/repos/{repository.get('nameWithOwner')}",
+            "created_at": node.get("createdAt"),
+        }
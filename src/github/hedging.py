@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class HedgingPolicy:
+    """
+    Decides when an idempotent GET gets a second, hedged request.
+    
+    Latencies of recent calls are kept per rate limit resource. Once
+    ``min_samples`` are known, a call still unanswered after the
+    ``percentile`` latency (at least ``min_delay`` seconds) may be hedged.
+    
+    Hedges are paid from a budget: every call that could be hedged earns
+    ``budget`` tokens and a hedge spends one, so at most that fraction of
+    calls is duplicated. Unused tokens pile up to ``max_tokens`` at most.
+    """
+    
+    def __init__(
+        self,
+        resources: Iterable[str] = ("search",),
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 0.05,
+        window: int = 200,
+        min_samples: int = 20,
+        max_tokens: float = 10.0
+    ):
+        self.resources = frozenset(resources)
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._tokens = 0.0
+    
+    def observe(self, resource: str, duration: float) -> None:
+        """Records the latency of an answered call"""
+        if resource not in self.resources:
+            return
+        latencies = self._latencies.get(resource)
+        if latencies is None:
+            latencies = self._latencies[resource] = deque(maxlen=self.window)
+        latencies.append(duration)
+    
+    def delay(self, resource: str) -> Optional[float]:
+        """
+        Returns how long to wait before hedging a call, None if it is never hedged.
+        
+        Calling it counts the call towards the hedge budget.
+        """
+        if resource not in self.resources:
+            return None
+        latencies = self._latencies.get(resource)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        self._tokens = min(self._tokens + self.budget, self.max_tokens)
+        ordered = sorted(latencies)
+        threshold = ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+        return max(threshold, self.min_delay)
+    
+    def try_hedge(self) -> bool:
+        """Spends a hedge from the budget, False if the budget is exhausted"""
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
@@ -0,0 +1,229 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple
+
+import httpx
+
+from src.exceptions import handle_rate_limited
+from src.metrics import RATE_LIMIT_REJECTIONS
+
+
+class RequestLimiter:
+    """
+    Bounds concurrency and spaces out calls to a rate-limited endpoint.
+    
+    Used as an async context manager around each upstream call: at most
+    ``max_concurrency`` calls run at once and consecutive calls start at
+    least ``min_interval`` seconds apart.
+    """
+    
+    def __init__(self, max_concurrency: int = 2, min_interval: float = 0.0):
+        self.min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+    
+    async def __aenter__(self) -> "RequestLimiter":
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                wait = self._next_start - now
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start = max(now, self._next_start) + self.min_interval
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+
+@dataclass
+class RateLimitBudget:
+    """Remaining GitHub rate limit budget of one token for one resource"""
+    resource: str
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+    retry_after_until: Optional[float] = None
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until a request may be sent without hitting the limit"""
+        if self.retry_after_until is not None and self.retry_after_until > now:
+            return self.retry_after_until - now
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at is not None:
+            return max(self.reset_at - now, 0.0)
+        return 0.0
+
+
+class RateLimitTracker:
+    """Per-token rate limit budgets fed by X-RateLimit-* and Retry-After headers"""
+    
+    def __init__(self, max_budgets: int = 10000):
+        self.max_budgets = max_budgets
+        self._budgets: "OrderedDict[Tuple[str, str], RateLimitBudget]" = OrderedDict()
+    
+    def get(self, token_key: str, resource: str) -> Optional[RateLimitBudget]:
+        """Returns the known budget of a token for a resource"""
+        return self._budgets.get((token_key, resource))
+    
+    def budgets(self, token_key: str) -> List[RateLimitBudget]:
+        """Returns every known budget of a token"""
+        return [budget for (key, _), budget in self._budgets.items() if key == token_key]
+    
+    def update(
+        self,
+        token_key: str,
+        resource: str,
+        headers: Mapping[str, str],
+        status_code: int
+    ) -> RateLimitBudget:
+        """
+        Records the budget advertised by a GitHub response.
+        
+        Args:
+            token_key: Hashed token
+            resource: Rate limit resource the request was counted against
+            headers: Response headers
+            status_code: Response status code
+        
+        Returns:
+            The updated budget
+        """
+        resource = headers.get("X-RateLimit-Resource", resource)
+        budget = self._budgets.get((token_key, resource))
+        if budget is None:
+            budget = self._budgets[(token_key, resource)] = RateLimitBudget(resource=resource)
+            if len(self._budgets) > self.max_budgets:
+                self._budgets.popitem(last=False)
+        else:
+            self._budgets.move_to_end((token_key, resource))
+        
+        limit = _parse_int(headers.get("X-RateLimit-Limit"))
+        remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+        reset_at = _parse_int(headers.get("X-RateLimit-Reset"))
+        if limit is not None:
+            budget.limit = limit
+        if remaining is not None:
+            budget.remaining = remaining
+        if reset_at is not None:
+            budget.reset_at = float(reset_at)
+        
+        retry_after = _parse_int(headers.get("Retry-After"))
+        if retry_after is not None and status_code in (403, 429):
+            budget.retry_after_until = time.time() + retry_after
+        return budget
+
+
+class RateLimitScheduler:
+    """
+    Paces, queues or short-circuits GitHub calls based on each token's budget.
+    
+    - Queue: at most ``max_concurrent_per_token`` calls per token run at once.
+    - Pace: once less than ``pace_fraction`` of the advertised limit remains,
+      calls are spread evenly over the time left until the budget resets. The
+      threshold follows each resource's own limit (5000/hour for core,
+      30/minute for search).
+    - Short-circuit: if the budget is exhausted (or GitHub sent Retry-After)
+      and the wait exceeds ``max_wait``, the call fails immediately with 429.
+    """
+    
+    def __init__(
+        self,
+        tracker: Optional[RateLimitTracker] = None,
+        max_wait: float = 5.0,
+        pace_fraction: float = 0.1,
+        max_concurrent_per_token: int = 10
+    ):
+        self.tracker = tracker or RateLimitTracker()
+        self.max_wait = max_wait
+        self.pace_fraction = pace_fraction
+        self.max_concurrent_per_token = max_concurrent_per_token
+        self._queues: Dict[str, asyncio.Semaphore] = {}
+        self._active: Dict[str, int] = {}
+    
+    def queued(self, token_key: str) -> int:
+        """Number of calls of a token that are running or waiting for a slot"""
+        return self._active.get(token_key, 0)
+    
+    def queued_total(self) -> int:
+        """Number of calls of every token that are running or waiting for a slot"""
+        return sum(self._active.values())
+    
+    def has_headroom(self, token_key: str, resource: str) -> bool:
+        """Whether an extra call for the token would neither queue nor be paced"""
+        if self.queued(token_key) >= self.max_concurrent_per_token:
+            return False
+        budget = self.tracker.get(token_key, resource)
+        if budget is None:
+            return True
+        if budget.wait_time(time.time()) > 0:
+            return False
+        return not self._is_low(budget)
+    
+    def _is_low(self, budget: RateLimitBudget) -> bool:
+        """Whether a budget has dropped below the pacing threshold of its limit"""
+        if budget.remaining is None or budget.limit is None:
+            return False
+        return budget.remaining < budget.limit * self.pace_fraction
+    
+    @asynccontextmanager
+    async def slot(self, token_key: str, resource: str) -> AsyncIterator[None]:
+        """
+        Waits until a call for the token may be sent.
+        
+        Raises:
+            HTTPException: 429 with Retry-After if the budget will not recover in time
+        """
+        semaphore = self._queues.get(token_key)
+        if semaphore is None:
+            semaphore = self._queues[token_key] = asyncio.Semaphore(self.max_concurrent_per_token)
+        self._active[token_key] = self._active.get(token_key, 0) + 1
+        try:
+            async with semaphore:
+                await self._wait_for_budget(token_key, resource)
+                yield
+        finally:
+            self._active[token_key] -= 1
+            if self._active[token_key] == 0:
+                del self._active[token_key]
+                del self._queues[token_key]
+    
+    async def _wait_for_budget(self, token_key: str, resource: str) -> None:
+        """Sleeps or fails according to the token's known budget"""
+        budget = self.tracker.get(token_key, resource)
+        if budget is None:
+            return
+        now = time.time()
+        wait = budget.wait_time(now)
+        if wait > self.max_wait:
+            RATE_LIMIT_REJECTIONS.inc(resource)
+            handle_rate_limited(wait)
+        if wait <= 0 and self._is_low(budget):
+            if budget.reset_at is not None and budget.reset_at > now:
+                wait = min((budget.reset_at - now) / max(budget.remaining, 1), self.max_wait)
+        if budget.remaining is not None:
+            # Reserve a unit so concurrent calls do not all spend the same budget
+            budget.remaining = max(budget.remaining - 1, 0)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def record(self, token_key: str, resource: str, response: httpx.Response) -> None:
+        """Feeds the budget advertised by a response into the tracker"""
+        self.tracker.update(token_key, resource, response.headers, response.status_code)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Parses an integer header value, returning None if missing or invalid"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
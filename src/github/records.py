@@ -0,0 +1,119 @@
+import json
+from typing import Any, Callable, Dict, Tuple, Type
+
+
+class Record:
+    """
+    Compact, read-only view of a GitHub object keeping only the fields we use.
+    
+    Records are built by ``json.loads`` object hooks while a response is
+    decoded, so the full object (``owner``, ``permissions``, dozens of URL
+    templates) is dropped as soon as the record is created instead of staying
+    alive in pages, caches and summaries. ``get`` mirrors ``dict.get`` so the
+    service's ``_process_*`` helpers accept records and dicts alike.
+    """
+    __slots__: Tuple[str, ...] = ()
+    
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            if name in values:
+                setattr(self, name, values[name])
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Builds a record from the used fields of a decoded JSON object"""
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            if name in data:
+                setattr(record, name, data[name])
+        return record
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns a field like ``dict.get``, ``default`` if it was not in the payload"""
+        return getattr(self, key, default) if key in self.__slots__ else default
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the present fields as a plain dict"""
+        return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class RepositoryRecord(Record):
+    """Fields of a repository used by the summary"""
+    __slots__ = (
+        "id",
+        "name",
+        "full_name",
+        "private",
+        "description",
+        "html_url",
+        "language",
+        "stargazers_count",
+        "forks_count",
+        "created_at",
+        "updated_at",
+    )
+
+
+class OrganizationRecord(Record):
+    """Fields of an organization used by the summary"""
+    __slots__ = ("login", "id", "avatar_url", "description")
+
+
+class PullRequestRecord(Record):
+    """Fields of a pull request search result used by the summary"""
+    __slots__ = ("title", "number", "state", "repository_url", "created_at", "updated_at")
+
+
+def _object_hook(record_class: Type[Record], *marker_keys: str) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Returns a ``json.loads`` object hook that turns matching objects into records.
+    
+    The hook runs for every object, innermost first; only objects carrying all
+    ``marker_keys`` are converted, so nested objects (``owner``, ``user``,
+    ``labels``) and the search envelope are left untouched.
+    """
+    def hook(data: Dict[str, Any]) -> Any:
+        for key in marker_keys:
+            if key not in data:
+                return data
+        return record_class.from_dict(data)
+    return hook
+
+
+_repository_hook = _object_hook(RepositoryRecord, "full_name")
+_organization_hook = _object_hook(OrganizationRecord, "login")
+_pull_request_hook = _object_hook(PullRequestRecord, "number", "repository_url")
+
+
+def decode_repositories(content: bytes) -> Any:
+    """Decodes a page of repositories into RepositoryRecord objects"""
+    return json.loads(content, object_hook=_repository_hook)
+
+
+def decode_organizations(content: bytes) -> Any:
+    """Decodes a list of organizations into OrganizationRecord objects"""
+    return json.loads(content, object_hook=_organization_hook)
+
+
+def decode_pull_request_search(content: bytes) -> Any:
+    """Decodes an issue search result, turning its items into PullRequestRecord objects"""
+    return json.loads(content, object_hook=_pull_request_hook)
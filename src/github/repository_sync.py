@@ -0,0 +1,126 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from src.config import Settings
+from src.github.cache import hash_token
+from src.github.client import GitHubAPIClient
+
+
+@dataclass
+class RepositorySnapshot:
+    """Last known repository list of a user, most recently updated first"""
+    repositories: List[Any]
+    # Newest ``updated_at`` of the list (ISO 8601 strings sort chronologically)
+    high_water: str
+    reconciled_at: float
+
+
+class RepositorySync:
+    """
+    Incremental repository listing on top of the ``sort=updated`` order.
+    
+    The first listing of a user downloads every page and is kept as a
+    snapshot. Later listings page sequentially only until a repository older
+    than the snapshot's high-water mark shows up (usually on the first
+    page), and merge the updated repositories into the snapshot by ``id``.
+    
+    Deletions and lost access never show up as updates, so the full listing
+    is repeated every ``full_sync_interval`` seconds to reconcile them.
+    Snapshots are kept per token and user, for at most ``max_entries`` users.
+    """
+    
+    def __init__(self, full_sync_interval: float = 3600.0, max_entries: int = 1024):
+        self.full_sync_interval = full_sync_interval
+        self.max_entries = max_entries
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self._snapshots: "OrderedDict[str, RepositorySnapshot]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._snapshots)
+    
+    async def get_repositories(
+        self,
+        github_client: GitHubAPIClient,
+        token: str,
+        username: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Returns every repository of a user, syncing only what changed when possible.
+        
+        Args:
+            github_client: Client used for the listing
+            token: GitHub personal access token
+            username: User whose repositories to list, or None for the authenticated user
+        
+        Returns:
+            Repositories, most recently updated first
+        """
+        key = f"{hash_token(token)}:{username or ''}"
+        snapshot = self._snapshots.get(key)
+        if snapshot is None or time.monotonic() - snapshot.reconciled_at >= self.full_sync_interval:
+            repositories = [
+                repo async for repo in github_client.iter_repositories(token, username=username)
+            ]
+            self.full_syncs += 1
+            self._store(key, RepositorySnapshot(
+                repositories=repositories,
+                high_water=max((repo.get("updated_at") or "" for repo in repositories), default=""),
+                reconciled_at=time.monotonic(),
+            ))
+            return repositories
+        
+        updated = await self._fetch_updated(github_client, token, username, snapshot.high_water)
+        self.incremental_syncs += 1
+        if updated:
+            updated_ids = {repo.get("id") for repo in updated}
+            snapshot.repositories = updated + [
+                repo for repo in snapshot.repositories if repo.get("id") not in updated_ids
+            ]
+            snapshot.high_water = max(snapshot.high_water, updated[0].get("updated_at") or "")
+        self._snapshots.move_to_end(key)
+        return snapshot.repositories
+    
+    async def _fetch_updated(
+        self,
+        github_client: GitHubAPIClient,
+        token: str,
+        username: Optional[str],
+        high_water: str
+    ) -> List[Any]:
+        """Pages in update order until the repositories get older than ``high_water``"""
+        updated = []
+        pages = github_client.iter_repository_pages(token, username=username, sequential=True)
+        try:
+            async for page in pages:
+                for repo in page:
+                    # Repositories updated at the high-water mark itself may be new
+                    if (repo.get("updated_at") or "") < high_water:
+                        return updated
+                    updated.append(repo)
+        finally:
+            await pages.aclose()
+        return updated
+    
+    def _store(self, key: str, snapshot: RepositorySnapshot) -> None:
+        """Stores a snapshot, evicting the least recently used ones"""
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drops every snapshot, forcing full listings"""
+        self._snapshots.clear()
+
+
+def create_repository_sync(settings: Settings) -> Optional[RepositorySync]:
+    """Creates the repository snapshots shared by every GitHubService, None if disabled"""
+    if not settings.github_repo_sync_enabled:
+        return None
+    return RepositorySync(
+        full_sync_interval=settings.github_repo_sync_full_interval,
+        max_entries=settings.github_repo_sync_max_entries,
+    )
@@ -1,9 +1,48 @@
-from fastapi import APIRouter, Depends
+import json
+import time
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
 
-from src.dependencies import get_github_token, get_github_service
-from src.github.schemas import GitHubUserResponse
+from src.config import Settings, get_settings
+from src.deadline import request_deadline
+from src.dependencies import (
+    get_batch_executor,
+    get_github_service,
+    get_github_token,
+    get_optional_github_token,
+    get_rate_limiter,
+    get_request_timeout,
+    get_response_encoder,
+    get_summary_cache,
+    get_summary_selection,
+)
+from src.github.batch import BatchExecutor, BatchJob
+from src.github.cache import Computed, SummaryCache, hash_token
+from src.github.compression import EncodedBody, ResponseEncoder
+from src.github.ratelimit import RateLimitScheduler
+from src.github.schemas import (
+    BatchSummaryRequest,
+    GitHubUserResponse,
+    RateLimitBudgetInfo,
+    RateLimitStatus,
+    SummaryCacheStats,
+    WebhookResult,
+)
+from src.github.selection import SummarySelection
 from src.github.service import GitHubService
+from src.github.streaming import (
+    encode_batch_result,
+    encode_ndjson,
+    encode_sse,
+    encode_summary,
+    project_summary,
+)
+from src.github.webhooks import WebhookProcessor, summary_tags, verify_signature
+from src.timing import phase
 
 router = APIRouter(prefix="/github", tags=["GitHub"])
 
@@ -12,22 +51,270 @@ router = APIRouter(prefix="/github", tags=["GitHub"])
     "/user-summary",
     response_model=GitHubUserResponse,
     summary="Get GitHub user summary",
-    description="Get complete authenticated user information including repositories, organizations and pull requests"
+    description=(
+        "Get complete authenticated user information including repositories, organizations and pull requests. "
+        "Use include/exclude to skip sections (they are not fetched from GitHub) and fields to trim the output. "
+        "Sections that fail or miss the deadline (X-Request-Timeout) are listed in errors and partial is set. "
+        "Responses carry an ETag (If-None-Match is answered with 304) and are compressed when accepted"
+    )
 )
 async def get_user_summary(
     credentials: HTTPAuthorizationCredentials = Depends(get_github_token),
-    github_service: GitHubService = Depends(get_github_service)
-) -> GitHubUserResponse:
+    github_service: GitHubService = Depends(get_github_service),
+    summary_cache: Optional[SummaryCache] = Depends(get_summary_cache),
+    selection: SummarySelection = Depends(get_summary_selection),
+    timeout: Optional[float] = Depends(get_request_timeout),
+    response_encoder: ResponseEncoder = Depends(get_response_encoder),
+    accept_encoding: Optional[str] = Header(None, include_in_schema=False),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previous response, answered with 304 if unchanged"),
+    settings: Settings = Depends(get_settings)
+) -> Response:
     """
     Endpoint to get complete authenticated GitHub user information.
     
     Args:
         credentials: Bearer credentials with GitHub token
         github_service: GitHub service instance (injected)
+        summary_cache: Shared summary cache, None if disabled (injected)
+        selection: Requested sections and fields (injected)
+        timeout: Time budget of the request in seconds, None for no deadline (injected)
+        response_encoder: ETag and compression handling (injected)
+        accept_encoding: Content codings accepted by the client
+        if_none_match: ETags the client already has
+        settings: Application settings (injected)
+        
+    Returns:
+        Response: GitHubUserResponse JSON limited to the requested sections and fields,
+        or 304 without body if it matches If-None-Match
+    """
+    token = credentials.credentials
+    
+    async def build_summary() -> GitHubUserResponse:
+        user_data = await github_service.get_user_summary(token, sections=selection.sections)
+        with phase("validation"):
+            return GitHubUserResponse.model_validate(user_data)
+    
+    with request_deadline(timeout):
+        if summary_cache is None:
+            summary = await build_summary()
+            with phase("serialization"):
+                body = response_encoder.encode(encode_summary(summary, selection))
+        else:
+            # The cache holds the serialized sections, precompressed; fields are projected per request
+            async def build_cached_body() -> Computed:
+                # Shared by every reader of the key, so bounded by the default deadline, not this caller's
+                with request_deadline(settings.request_deadline if settings.request_deadline > 0 else None):
+                    summary = await build_summary()
+                if not summary.partial:
+                    # Lets webhook events find the entry by user and organization
+                    summary_cache.tag(cache_key, summary_tags(summary))
+                with phase("serialization"):
+                    content = encode_summary(summary, selection.sections_only())
+                with phase("compression"):
+                    packed = response_encoder.encode(content, precompress=True).pack()
+                # Partial summaries are answered but not cached
+                return Computed(packed, cacheable=not summary.partial)
+            
+            cache_key = f"{hash_token(token)}:{selection.cache_key}"
+            body = EncodedBody.unpack(await summary_cache.get_or_compute(cache_key, build_cached_body))
+            if selection.fields:
+                with phase("projection"):
+                    body = response_encoder.encode(project_summary(body.content, selection))
+    return response_encoder.respond(body, accept_encoding, if_none_match)
+
+
+@router.get(
+    "/user-summary/stream",
+    response_class=StreamingResponse,
+    summary="Stream GitHub user summary",
+    description=(
+        "Stream the user summary section by section (user, organizations, repositories page by page, "
+        "pull_requests, summary) as NDJSON lines or Server-Sent Events as soon as each one resolves"
+    )
+)
+async def stream_user_summary(
+    credentials: HTTPAuthorizationCredentials = Depends(get_github_token),
+    github_service: GitHubService = Depends(get_github_service),
+    selection: SummarySelection = Depends(get_summary_selection),
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="Stream format")
+) -> StreamingResponse:
+    """
+    Endpoint to stream authenticated GitHub user information progressively.
+    
+    Args:
+        credentials: Bearer credentials with GitHub token
+        github_service: GitHub service instance (injected)
+        selection: Requested sections and fields (injected)
+        format: "ndjson" for one JSON object per line, "sse" for Server-Sent Events
+        
+    Returns:
+        StreamingResponse: Sections in the order they resolve
+    """
+    events = github_service.stream_authenticated_user(credentials.credentials, selection.sections)
+    if format == "sse":
+        return StreamingResponse(
+            encode_sse(events, selection),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+    return StreamingResponse(encode_ndjson(events, selection), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/user-summaries",
+    response_class=StreamingResponse,
+    summary="Get many GitHub user summaries",
+    description=(
+        "Compute summaries for a list of tokens, or for a list of usernames with the bearer token. "
+        "Results are streamed as NDJSON BatchSummaryItem lines in completion order"
+    )
+)
+async def get_user_summaries(
+    batch: BatchSummaryRequest,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(get_optional_github_token),
+    github_service: GitHubService = Depends(get_github_service),
+    batch_executor: BatchExecutor = Depends(get_batch_executor),
+    settings: Settings = Depends(get_settings)
+) -> StreamingResponse:
+    """
+    Endpoint to compute many GitHub user summaries in one request.
+    
+    Args:
+        batch: Tokens or usernames to summarize
+        credentials: Bearer credentials, required when summarizing usernames
+        github_service: GitHub service instance (injected)
+        batch_executor: Shared batch executor (injected)
+        settings: Application settings (injected)
         
     Returns:
-        GitHubUserResponse: Detailed user information
+        StreamingResponse: One BatchSummaryItem per line, in completion order
     """
-    user_data = await github_service.get_authenticated_user(credentials.credentials)
-    return GitHubUserResponse(**user_data)
+    items = batch.tokens or batch.usernames
+    if len(items) > settings.batch_max_items:
+        raise HTTPException(status_code=422, detail=f"A batch may contain at most {settings.batch_max_items} items")
+    
+    if batch.tokens:
+        jobs = [BatchJob(index=index, token=token) for index, token in enumerate(batch.tokens)]
+    else:
+        if credentials is None:
+            raise HTTPException(status_code=401, detail="A bearer token is required to summarize usernames")
+        jobs = [
+            BatchJob(index=index, token=credentials.credentials, username=username)
+            for index, username in enumerate(batch.usernames)
+        ]
+    
+    async def encode_results():
+        async for result in batch_executor.run(github_service, jobs):
+            yield encode_batch_result(result)
+    
+    return StreamingResponse(encode_results(), media_type="application/x-ndjson")
 
+
+@router.get(
+    "/cache-stats",
+    response_model=SummaryCacheStats,
+    summary="Get summary cache statistics",
+    description="Get hit, miss and stale counters of the user summary cache"
+)
+async def get_cache_stats(
+    summary_cache: Optional[SummaryCache] = Depends(get_summary_cache)
+) -> SummaryCacheStats:
+    """
+    Endpoint to inspect the user summary cache.
+    
+    Args:
+        summary_cache: Shared summary cache, None if disabled (injected)
+        
+    Returns:
+        SummaryCacheStats: Cache counters
+    """
+    if summary_cache is None:
+        return SummaryCacheStats(enabled=False)
+    return SummaryCacheStats(enabled=True, **summary_cache.stats())
+
+
+@router.get(
+    "/rate-limit",
+    response_model=RateLimitStatus,
+    summary="Get GitHub rate limit budget",
+    description="Get the rate limit budget last advertised by GitHub for the authenticated token"
+)
+async def get_rate_limit(
+    credentials: HTTPAuthorizationCredentials = Depends(get_github_token),
+    rate_limiter: RateLimitScheduler = Depends(get_rate_limiter)
+) -> RateLimitStatus:
+    """
+    Endpoint to inspect the rate limit budget tracked for a token.
+    
+    Args:
+        credentials: Bearer credentials with GitHub token
+        rate_limiter: Shared rate limit scheduler (injected)
+        
+    Returns:
+        RateLimitStatus: Budgets per resource and queued upstream calls
+    """
+    token_key = hash_token(credentials.credentials)
+    now = time.time()
+    budgets = [
+        RateLimitBudgetInfo(
+            resource=budget.resource,
+            limit=budget.limit,
+            remaining=budget.remaining,
+            reset_at=datetime.fromtimestamp(budget.reset_at, tz=timezone.utc) if budget.reset_at else None,
+            retry_after=budget.wait_time(now) or None,
+        )
+        for budget in rate_limiter.tracker.budgets(token_key)
+    ]
+    return RateLimitStatus(queued_requests=rate_limiter.queued(token_key), budgets=budgets)
+
+
+@router.post(
+    "/webhooks",
+    response_model=WebhookResult,
+    summary="Receive GitHub webhooks",
+    description=(
+        "Receive repository, organization, membership and pull_request events signed with the "
+        "webhook secret, and patch or invalidate the cached summaries they affect"
+    )
+)
+async def receive_webhook(
+    request: Request,
+    x_github_event: str = Header(..., description="Event type"),
+    x_hub_signature_256: Optional[str] = Header(None, description="HMAC-SHA256 of the body with the webhook secret"),
+    github_service: GitHubService = Depends(get_github_service),
+    summary_cache: Optional[SummaryCache] = Depends(get_summary_cache),
+    response_encoder: ResponseEncoder = Depends(get_response_encoder),
+    settings: Settings = Depends(get_settings)
+) -> WebhookResult:
+    """
+    Endpoint to apply GitHub webhook events to the summary cache.
+    
+    Args:
+        request: Incoming request, read as raw bytes to check the signature
+        x_github_event: Event type
+        x_hub_signature_256: Signature of the body
+        github_service: GitHub service instance, used to format patched sections (injected)
+        summary_cache: Shared summary cache, None if disabled (injected)
+        response_encoder: Compression of the patched summaries (injected)
+        settings: Application settings (injected)
+        
+    Returns:
+        WebhookResult: Number of cached summaries patched and invalidated
+    """
+    if not settings.github_webhook_secret:
+        raise HTTPException(status_code=404, detail="Webhooks are not configured")
+    body = await request.body()
+    if not verify_signature(settings.github_webhook_secret, body, x_hub_signature_256):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Webhook body must be a JSON object")
+    
+    try:
+        result = WebhookProcessor(summary_cache, github_service, response_encoder).handle(x_github_event, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return WebhookResult(event=x_github_event, action=payload.get("action"), **result)
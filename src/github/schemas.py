@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -28,7 +28,7 @@ class PullRequestInfo(BaseModel):
     """Pull request information"""
     title: str = Field(..., description="Pull request title")
     number: int = Field(..., description="Pull request number")
-    state: str = Field(..., description="State (open, closed, merged)")
+    state: str = Field(..., description="State (open or closed; merged pull requests are closed)")
     repository_url: str = Field(..., description="Repository URL")
     created_at: datetime = Field(..., description="Creation date")
 
@@ -47,18 +47,27 @@ class SummaryInfo(BaseModel):
     """User statistical summary"""
     public_repos: int = Field(..., description="Number of public repositories")
     public_gists: int = Field(..., description="Number of public gists")
-    total_repositories: int = Field(..., description="Total repositories (public + private)")
-    total_organizations: int = Field(..., description="Total organizations")
-    total_pull_requests: int = Field(..., description="Total pull requests")
+    total_repositories: Optional[int] = Field(None, description="Total repositories (public + private), null if not requested")
+    total_organizations: Optional[int] = Field(None, description="Total organizations, null if not requested")
+    total_pull_requests: Optional[int] = Field(None, description="Total pull requests, null if not requested")
+
+
+class SectionError(BaseModel):
+    """Error that prevented a summary section from being retrieved"""
+    section: str = Field(..., description="Section that failed (user, summary, repositories, organizations, pull_requests)")
+    status_code: int = Field(..., description="HTTP status code of the failure")
+    detail: str = Field(..., description="Error description")
 
 
 class GitHubUserResponse(BaseModel):
     """Complete response with GitHub user information"""
     user: UserInfo = Field(..., description="Basic user information")
     summary: SummaryInfo = Field(..., description="Statistical summary")
-    repositories: List[RepositoryInfo] = Field(default_factory=list, description="List of repositories")
-    organizations: List[OrganizationInfo] = Field(default_factory=list, description="Organizations")
-    pull_requests: List[PullRequestInfo] = Field(default_factory=list, description="User pull requests")
+    repositories: Optional[List[RepositoryInfo]] = Field(None, description="List of repositories, omitted if not requested")
+    organizations: Optional[List[OrganizationInfo]] = Field(None, description="Organizations, omitted if not requested")
+    pull_requests: Optional[List[PullRequestInfo]] = Field(None, description="User pull requests, omitted if not requested")
+    partial: bool = Field(False, description="Whether some requested sections are missing (see errors)")
+    errors: List[SectionError] = Field(default_factory=list, description="Sections that failed or missed the request deadline")
     
     class Config:
         json_schema_extra = {
@@ -80,7 +89,62 @@ class GitHubUserResponse(BaseModel):
                 },
                 "repositories": [],
                 "organizations": [],
-                "pull_requests": []
+                "pull_requests": [],
+                "partial": False,
+                "errors": []
             }
         }
 
+
+class SummaryCacheStats(BaseModel):
+    """Counters of the user summary cache"""
+    enabled: bool = Field(..., description="Whether the summary cache is enabled")
+    hits: int = Field(0, description="Requests served from a fresh entry")
+    misses: int = Field(0, description="Requests that computed the summary")
+    stale_hits: int = Field(0, description="Requests served from a stale entry while refreshing")
+    entries: int = Field(0, description="Cached summaries")
+    refreshing: int = Field(0, description="Summaries currently being recomputed")
+
+
+class RateLimitBudgetInfo(BaseModel):
+    """Known GitHub rate limit budget for one resource"""
+    resource: str = Field(..., description="Rate limit resource (core, search, graphql)")
+    limit: Optional[int] = Field(None, description="Requests allowed per window")
+    remaining: Optional[int] = Field(None, description="Requests left in the current window")
+    reset_at: Optional[datetime] = Field(None, description="When the current window resets")
+    retry_after: Optional[float] = Field(None, description="Seconds to wait before the next request, if throttled")
+
+
+class RateLimitStatus(BaseModel):
+    """Rate limit budgets of the authenticated token"""
+    queued_requests: int = Field(..., description="Upstream calls running or waiting for this token")
+    budgets: List[RateLimitBudgetInfo] = Field(default_factory=list, description="Budgets per resource")
+
+
+class BatchSummaryRequest(BaseModel):
+    """Batch of user summaries to compute"""
+    tokens: Optional[List[str]] = Field(None, description="GitHub tokens, one summary per token (authenticated user)")
+    usernames: Optional[List[str]] = Field(None, description="Usernames to summarize with the bearer token")
+    
+    @model_validator(mode="after")
+    def check_exactly_one_source(self) -> "BatchSummaryRequest":
+        if bool(self.tokens) == bool(self.usernames):
+            raise ValueError("Provide either a non-empty 'tokens' or a non-empty 'usernames' list")
+        return self
+
+
+class BatchSummaryItem(BaseModel):
+    """Result of one summary in a batch"""
+    index: int = Field(..., description="Position of the token or username in the request")
+    username: Optional[str] = Field(None, description="Requested username, if summarizing by username")
+    status_code: int = Field(..., description="HTTP status code for this item")
+    summary: Optional[GitHubUserResponse] = Field(None, description="User summary if it succeeded")
+    error: Optional[SectionError] = Field(None, description="Error if it failed")
+
+
+class WebhookResult(BaseModel):
+    """Effect of a GitHub webhook delivery on the cached summaries"""
+    event: str = Field(..., description="Event type (X-GitHub-Event)")
+    action: Optional[str] = Field(None, description="Event action, e.g. opened or deleted")
+    patched: int = Field(0, description="Cached summaries updated in place")
+    invalidated: int = Field(0, description="Cached summaries dropped to be fetched again")
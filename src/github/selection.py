@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Type
+
+from pydantic import BaseModel
+
+from src.github.schemas import (
+    OrganizationInfo,
+    PullRequestInfo,
+    RepositoryInfo,
+    SummaryInfo,
+    UserInfo,
+)
+
+
+# Sections that need their own upstream calls and can be left out
+SECTIONS = ("repositories", "organizations", "pull_requests")
+
+# Sections whose fields can be projected, with the model describing them
+SECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "user": UserInfo,
+    "summary": SummaryInfo,
+    "repositories": RepositoryInfo,
+    "organizations": OrganizationInfo,
+    "pull_requests": PullRequestInfo,
+}
+
+LIST_SECTIONS = frozenset(SECTIONS)
+
+
+def _split(value: Optional[str]) -> FrozenSet[str]:
+    """Splits a comma-separated query parameter into a set of names"""
+    if not value:
+        return frozenset()
+    return frozenset(part.strip() for part in value.split(",") if part.strip())
+
+
+@dataclass(frozen=True)
+class SummarySelection:
+    """
+    Sections and fields requested for a user summary.
+    
+    ``sections`` decides which upstream calls are made at all; ``fields``
+    only trims the serialized output of each section.
+    """
+    sections: FrozenSet[str] = frozenset(SECTIONS)
+    fields: Mapping[str, FrozenSet[str]] = field(default_factory=dict)
+    
+    @classmethod
+    def parse(
+        cls,
+        include: Optional[str] = None,
+        exclude: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> "SummarySelection":
+        """
+        Builds a selection from the ``include``, ``exclude`` and ``fields`` parameters.
+        
+        Args:
+            include: Comma-separated sections to fetch (defaults to all)
+            exclude: Comma-separated sections to leave out
+            fields: Comma-separated ``section.field`` names to keep in the output
+        
+        Returns:
+            SummarySelection
+        
+        Raises:
+            ValueError: If a section or field name is unknown
+        """
+        included = _split(include) or frozenset(SECTIONS)
+        excluded = _split(exclude)
+        unknown = (included | excluded) - frozenset(SECTIONS)
+        if unknown:
+            raise ValueError(
+                f"Unknown sections: {', '.join(sorted(unknown))}. "
+                f"Valid sections are: {', '.join(SECTIONS)}"
+            )
+        
+        projected: Dict[str, set] = {}
+        for name in _split(fields):
+            section, _, field_name = name.partition(".")
+            model = SECTION_MODELS.get(section)
+            if model is None or field_name not in model.model_fields:
+                raise ValueError(f"Unknown field: {name}. Use section.field, e.g. repositories.name")
+            projected.setdefault(section, set()).add(field_name)
+        
+        return cls(
+            sections=included - excluded,
+            fields={section: frozenset(names) for section, names in projected.items()},
+        )
+    
+    @property
+    def cache_key(self) -> str:
+        """Part of the cache key that identifies what was fetched"""
+        return ",".join(sorted(self.sections))
+    
+    def sections_only(self) -> "SummarySelection":
+        """Returns the same sections without any field projection"""
+        return SummarySelection(sections=self.sections)
+    
+    def include_spec(self) -> Dict[str, Any]:
+        """Returns the ``include`` argument for ``model_dump`` of a GitHubUserResponse"""
+        spec: Dict[str, Any] = {}
+        for section in ("user", "summary", *SECTIONS):
+            if section in LIST_SECTIONS and section not in self.sections:
+                continue
+            names = self.fields.get(section)
+            if names is None:
+                spec[section] = True
+            elif section in LIST_SECTIONS:
+                spec[section] = {"__all__": set(names)}
+            else:
+                spec[section] = set(names)
+        spec["partial"] = True
+        spec["errors"] = True
+        return spec
@@ -1,14 +1,51 @@
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Awaitable, Collection, Iterable, Optional, Tuple
 import asyncio
+import time
 
+from fastapi import HTTPException
+
+from src.deadline import remaining_time
+from src.exceptions import DEFAULT_ERROR_MESSAGES, deadline_exceeded
 from src.github.client import GitHubAPIClient
+from src.github.repository_sync import RepositorySync
+from src.github.selection import SECTIONS
+from src.metrics import SECTION_ERRORS, SECTION_LATENCY, SUMMARY_LATENCY
+from src.timing import phase, record_phase
+
+
+async def _timed(section: str, awaitable: Awaitable[Any]) -> Any:
+    """Awaits a summary section and records how long it took"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        duration = time.perf_counter() - start
+        SECTION_LATENCY.observe(duration, section)
+        record_phase(section, duration)
+
+
+def describe_error(section: str, error: Exception) -> Dict[str, Any]:
+    """Describes why a summary section could not be retrieved"""
+    if isinstance(error, HTTPException):
+        return {"section": section, "status_code": error.status_code, "detail": str(error.detail)}
+    return {"section": section, "status_code": 500, "detail": DEFAULT_ERROR_MESSAGES[500]}
 
 
 class GitHubService:
     """Service with business logic for GitHub operations"""
     
-    def __init__(self, github_client: GitHubAPIClient):
+    # Label of the summary duration metric
+    backend = "rest"
+    
+    def __init__(
+        self,
+        github_client: GitHubAPIClient,
+        shard_pull_request_search: bool = False,
+        repository_sync: Optional[RepositorySync] = None
+    ):
         self.github_client = github_client
+        self.shard_pull_request_search = shard_pull_request_search
+        self.repository_sync = repository_sync
     
     async def get_authenticated_user(self, token: str) -> Dict[str, Any]:
         """
@@ -20,84 +57,339 @@ class GitHubService:
         - Organizations
         - Pull Requests
         
+        Repositories are paginated and processed page by page as they arrive.
+        
+        Args:
+            token: GitHub personal access token
+            
+        Returns:
+            Dict with complete processed user information in the requested structure
+        """
+        return await self.get_user_summary(token)
+    
+    async def get_user_summary(
+        self,
+        token: str,
+        username: Optional[str] = None,
+        sections: Optional[Collection[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Gets and processes complete information of a user.
+        
         Args:
             token: GitHub personal access token
+            username: User to summarize, or None for the authenticated user.
+                Other users only expose what the token is allowed to see.
+            sections: Sections to fetch among "repositories", "organizations"
+                and "pull_requests" (all by default). Sections left out are
+                never requested upstream and are returned as None, together
+                with their summary totals.
             
         Returns:
             Dict with complete processed user information in the requested structure
         """
-        user_data, repositories, organizations, pull_requests = await asyncio.gather(
-            self.github_client.get_user(token),
-            self.github_client.get_repositories(token),
-            self.github_client.get_organizations(token),
-            self._get_user_pull_requests(token),
-            return_exceptions=True
-        )
+        with SUMMARY_LATENCY.time(self.backend):
+            return await self._build_user_summary(token, username, sections)
+    
+    async def _build_user_summary(
+        self,
+        token: str,
+        username: Optional[str],
+        sections: Optional[Collection[str]]
+    ) -> Dict[str, Any]:
+        """
+        Fetches the requested sections concurrently and assembles the summary.
         
+        Sections still running when the request deadline is reached are
+        cancelled and reported as errors, so the summary is returned with
+        what completed in time.
+        """
+        sections = SECTIONS if sections is None else sections
+        user_kwargs = {} if username is None else {"username": username}
+        # The PR search chains off this task instead of fetching /user again
+        user_task = asyncio.ensure_future(self.github_client.get_user(token, **user_kwargs))
+        fetches = {"user": user_task}
+        if "repositories" in sections:
+            fetches["repositories"] = self._get_repositories(token, username)
+        if "organizations" in sections:
+            fetches["organizations"] = self.github_client.get_organizations(token, **user_kwargs)
+        if "pull_requests" in sections:
+            fetches["pull_requests"] = self._get_user_pull_requests(token, user_task, raise_errors=True)
+        tasks = {
+            section: asyncio.ensure_future(_timed(section, fetch))
+            for section, fetch in fetches.items()
+        }
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=remaining_time())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        
+        results: Dict[str, Any] = {}
+        for section, task in tasks.items():
+            if task in pending:
+                results[section] = deadline_exceeded()
+            else:
+                results[section] = task.exception() or task.result()
+        
+        user_data = results["user"]
         if isinstance(user_data, Exception):
+            SECTION_ERRORS.inc("user")
             raise user_data
         
+        with phase("processing"):
+            return self._assemble_summary(
+                user_data,
+                results.get("repositories"),
+                results.get("organizations"),
+                results.get("pull_requests"),
+            )
+    
+    def _assemble_summary(
+        self,
+        user_data: Any,
+        repositories: Any,
+        organizations: Any,
+        pull_requests: Any
+    ) -> Dict[str, Any]:
+        """
+        Formats the fetched sections.
+        
+        Sections that failed or ran out of time are listed in ``errors`` and
+        keep empty values, so their totals read 0 and ``partial`` is set.
+        """
+        errors = []
         if isinstance(repositories, Exception):
+            SECTION_ERRORS.inc("repositories")
+            errors.append(describe_error("repositories", repositories))
             repositories = []
         if isinstance(organizations, Exception):
+            SECTION_ERRORS.inc("organizations")
+            errors.append(describe_error("organizations", organizations))
             organizations = []
         if isinstance(pull_requests, Exception):
-            pull_requests = []
+            SECTION_ERRORS.inc("pull_requests")
+            errors.append(describe_error("pull_requests", pull_requests))
+            pull_requests = {"total_count": 0, "items": []}
         
-        processed_repos = self._process_repositories(repositories)
-        processed_orgs = self._process_organizations(organizations)
-        processed_prs = self._process_pull_requests(pull_requests)
+        result = {
+            "user": self._process_user(user_data),
+            "summary": self._build_summary(
+                user_data,
+                total_repositories=None if repositories is None else len(repositories),
+                total_organizations=None if organizations is None else len(organizations),
+                total_pull_requests=None if pull_requests is None else pull_requests["total_count"],
+            ),
+            "repositories": repositories,
+            "organizations": None,
+            "pull_requests": None,
+            "partial": bool(errors),
+            "errors": errors,
+        }
+        if organizations is not None:
+            result["organizations"] = self._process_organizations(organizations)
+        if pull_requests is not None:
+            result["pull_requests"] = self._process_pull_requests(pull_requests["items"])
+        return result
+    
+    async def stream_authenticated_user(
+        self,
+        token: str,
+        sections: Optional[Collection[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streams the authenticated user summary section by section.
+        
+        All upstream calls start at once and each section is yielded as soon
+        as it resolves, so fast sections are not held back by slow ones.
         
+        Args:
+            token: GitHub personal access token
+            sections: Sections to fetch (all by default); see get_user_summary
+            
+        Yields:
+            (event, data) tuples where event is one of "user", "organizations",
+            "repositories" (once per page), "pull_requests", "summary" or
+            "error" (for a section that failed). The stream ends after an
+            error in the "user" section, since no summary can be built; the
+            totals of other failed sections are None in the summary.
+        """
+        sections = SECTIONS if sections is None else sections
+        queue: asyncio.Queue = asyncio.Queue()
+        user_task = asyncio.ensure_future(self.github_client.get_user(token))
+        totals = {section: (0 if section in sections else None) for section in SECTIONS}
+        
+        async def send_user() -> None:
+            await queue.put(("user", self._process_user(await user_task)))
+        
+        async def send_repositories() -> None:
+            async for page in self.github_client.iter_repository_pages(token):
+                processed = self._process_repositories(page)
+                totals["repositories"] += len(processed)
+                await queue.put(("repositories", processed))
+        
+        async def send_organizations() -> None:
+            organizations = await self.github_client.get_organizations(token)
+            totals["organizations"] = len(organizations)
+            await queue.put(("organizations", self._process_organizations(organizations)))
+        
+        async def send_pull_requests() -> None:
+            try:
+                await user_task
+            except Exception:
+                # Reported by the user section, which ends the stream
+                return
+            pull_requests = await self._get_user_pull_requests(token, user_task, raise_errors=True)
+            totals["pull_requests"] = pull_requests["total_count"]
+            await queue.put(("pull_requests", self._process_pull_requests(pull_requests["items"])))
+        
+        async def run(section: str, send) -> None:
+            try:
+                await send()
+            except Exception as error:
+                SECTION_ERRORS.inc(section)
+                if section in totals:
+                    # A count of the pages sent before the failure would read as complete
+                    totals[section] = None
+                queue.put_nowait(("error", describe_error(section, error)))
+            finally:
+                queue.put_nowait(None)
+        
+        producers = {
+            "user": send_user,
+            "repositories": send_repositories,
+            "organizations": send_organizations,
+            "pull_requests": send_pull_requests,
+        }
+        tasks = [
+            asyncio.ensure_future(run(section, send))
+            for section, send in producers.items()
+            if section == "user" or section in sections
+        ]
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                    continue
+                yield item
+                event, data = item
+                if event == "error" and data["section"] == "user":
+                    return
+            
+            yield "summary", self._build_summary(user_task.result(), **{
+                f"total_{section}": total for section, total in totals.items()
+            })
+        finally:
+            for task in tasks:
+                task.cancel()
+            user_task.cancel()
+    
+    def _process_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Processes and formats basic user information"""
+        return {
+            "login": user_data.get("login"),
+            "name": user_data.get("name"),
+            "company": user_data.get("company"),
+            "location": user_data.get("location"),
+            "blog": user_data.get("blog"),
+            "followers": user_data.get("followers", 0),
+        }
+    
+    def _build_summary(
+        self,
+        user_data: Dict[str, Any],
+        total_repositories: Optional[int],
+        total_organizations: Optional[int],
+        total_pull_requests: Optional[int]
+    ) -> Dict[str, Any]:
+        """Builds the statistical summary from user data and section totals"""
         return {
-            "user": {
-                "login": user_data.get("login"),
-                "name": user_data.get("name"),
-                "company": user_data.get("company"),
-                "location": user_data.get("location"),
-                "blog": user_data.get("blog"),
-                "followers": user_data.get("followers", 0),
-            },
-            "summary": {
-                "public_repos": user_data.get("public_repos", 0),
-                "public_gists": user_data.get("public_gists", 0),
-                "total_repositories": len(repositories),
-                "total_organizations": len(organizations),
-                "total_pull_requests": len(pull_requests),
-            },
-            "repositories": processed_repos,
-            "organizations": processed_orgs,
-            "pull_requests": processed_prs,
+            "public_repos": user_data.get("public_repos", 0),
+            "public_gists": user_data.get("public_gists", 0),
+            "total_repositories": total_repositories,
+            "total_organizations": total_organizations,
+            "total_pull_requests": total_pull_requests,
         }
     
-    async def _get_user_pull_requests(self, token: str) -> list:
-        """Gets user pull requests safely"""
+    async def _get_user_pull_requests(
+        self,
+        token: str,
+        user_data_future: Optional[Awaitable[Dict[str, Any]]] = None,
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Gets user pull requests safely, reusing an in-progress user fetch if given.
+        
+        The total comes from the search ``total_count``, so it is exact even
+        though only the first page of items is fetched. With sharded search
+        enabled, every pull request is fetched past the 1000-result cap.
+        
+        Args:
+            token: GitHub personal access token
+            user_data_future: In-progress user fetch to read the login from
+            raise_errors: Propagate failures instead of returning an empty result
+        
+        Returns:
+            Dict with ``total_count`` and ``items``
+        """
+        empty = {"total_count": 0, "items": []}
         try:
-            user_data = await self.github_client.get_user(token)
+            if user_data_future is None:
+                user_data_future = self.github_client.get_user(token)
+            user_data = await user_data_future
             username = user_data.get("login")
-            if username:
-                return await self.github_client.get_pull_requests(token, username)
-            return []
+            if not username:
+                return empty
+            result = await self.github_client.search_pull_requests(token, username)
+            total_count = result.get("total_count", 0)
+            items = result.get("items", [])
+            if self.shard_pull_request_search and total_count > len(items):
+                items = await self.github_client.search_all_pull_requests(
+                    token, username, since=user_data.get("created_at")
+                )
+            return {"total_count": total_count, "items": items}
         except Exception:
-            # If we can't get user data or PRs, return empty list
-            return []
+            if raise_errors:
+                raise
+            # If we can't get user data or PRs, return an empty result
+            return empty
     
-    def _process_repositories(self, repos: list) -> list:
-        """Processes and formats repository list"""
+    async def _get_repositories(self, token: str, username: Optional[str] = None) -> list:
+        """
+        Streams every repository page and processes repositories as they arrive.
+        
+        With incremental repository sync, only the repositories updated since
+        the user's last listing are downloaded.
+        """
+        if self.repository_sync is not None:
+            repositories = await self.repository_sync.get_repositories(self.github_client, token, username)
+            return self._process_repositories(repositories)
+        user_kwargs = {} if username is None else {"username": username}
         return [
-            {
-                "name": repo.get("name"),
-                "full_name": repo.get("full_name"),
-                "private": repo.get("private", False),
-                "description": repo.get("description"),
-                "url": repo.get("html_url"),
-                "language": repo.get("language"),
-                "stargazers_count": repo.get("stargazers_count", 0),
-                "forks_count": repo.get("forks_count", 0),
-                "created_at": repo.get("created_at"),
-            }
-            for repo in repos
+            self._process_repository(repo)
+            async for repo in self.github_client.iter_repositories(token, **user_kwargs)
         ]
     
+    def _process_repositories(self, repos: Iterable[Dict[str, Any]]) -> list:
+        """Processes and formats repository list"""
+        return [self._process_repository(repo) for repo in repos]
+    
+    def _process_repository(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Processes and formats a single repository"""
+        return {
+            "name": repo.get("name"),
+            "full_name": repo.get("full_name"),
+            "private": repo.get("private", False),
+            "description": repo.get("description"),
+            "url": repo.get("html_url"),
+            "language": repo.get("language"),
+            "stargazers_count": repo.get("stargazers_count", 0),
+            "forks_count": repo.get("forks_count", 0),
+            "created_at": repo.get("created_at"),
+        }
+    
     def _process_organizations(self, orgs: list) -> list:
         """Processes and formats organization list"""
         return [
@@ -122,4 +414,3 @@ class GitHubService:
             }
             for pr in prs
         ]
-
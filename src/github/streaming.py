@@ -0,0 +1,107 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from src.github.batch import BatchResult
+from src.github.schemas import (
+    BatchSummaryItem,
+    GitHubUserResponse,
+    OrganizationInfo,
+    PullRequestInfo,
+    RepositoryInfo,
+    SectionError,
+    SummaryInfo,
+    UserInfo,
+)
+from src.github.selection import SummarySelection
+
+
+# Each streamed section is validated and serialized with its response schema
+SECTION_ADAPTERS: Dict[str, TypeAdapter] = {
+    "user": TypeAdapter(UserInfo),
+    "summary": TypeAdapter(SummaryInfo),
+    "repositories": TypeAdapter(List[RepositoryInfo]),
+    "organizations": TypeAdapter(List[OrganizationInfo]),
+    "pull_requests": TypeAdapter(List[PullRequestInfo]),
+    "error": TypeAdapter(SectionError),
+}
+
+
+def encode_summary(summary: GitHubUserResponse, selection: Optional[SummarySelection] = None) -> bytes:
+    """
+    Serializes a validated summary straight to JSON bytes.
+    
+    pydantic-core writes the bytes directly from the model, so the summary is
+    validated once when it is built and never goes through an intermediate
+    dict, ``jsonable_encoder`` or ``json.dumps``.
+    """
+    include = None if selection is None else selection.include_spec()
+    return summary.model_dump_json(include=include).encode()
+
+
+def project_summary(content: bytes, selection: SummarySelection) -> bytes:
+    """
+    Applies the field projection of a selection to an already serialized summary.
+    
+    The content was validated when it was built, so it is filtered as plain
+    JSON instead of being validated into a GitHubUserResponse on every hit.
+    The output is the same as ``encode_summary`` with the selection.
+    """
+    summary = json.loads(content)
+    projected: Dict[str, Any] = {}
+    for name, include in selection.include_spec().items():
+        if name not in summary:
+            continue
+        value = summary[name]
+        if include is True or value is None:
+            projected[name] = value
+        elif isinstance(include, dict):
+            projected[name] = [{key: item[key] for key in item if key in include["__all__"]} for item in value]
+        else:
+            projected[name] = {key: value[key] for key in value if key in include}
+    return json.dumps(projected, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def encode_section(event: str, data: Any, selection: Optional[SummarySelection] = None) -> bytes:
+    """Validates a section against its schema and serializes the selected fields to JSON"""
+    adapter = SECTION_ADAPTERS[event]
+    include = None
+    if selection is not None and event != "error":
+        include = selection.include_spec().get(event)
+    return adapter.dump_json(adapter.validate_python(data), include=None if include is True else include)
+
+
+async def encode_ndjson(
+    events: AsyncIterator[Tuple[str, Any]],
+    selection: Optional[SummarySelection] = None
+) -> AsyncIterator[bytes]:
+    """Encodes summary sections as newline-delimited JSON objects"""
+    async for event, data in events:
+        yield b'{"event":"' + event.encode() + b'","data":' + encode_section(event, data, selection) + b"}\n"
+
+
+async def encode_sse(
+    events: AsyncIterator[Tuple[str, Any]],
+    selection: Optional[SummarySelection] = None
+) -> AsyncIterator[bytes]:
+    """Encodes summary sections as Server-Sent Events"""
+    async for event, data in events:
+        yield b"event: " + event.encode() + b"\ndata: " + encode_section(event, data, selection) + b"\n\n"
+
+
+def encode_batch_result(result: BatchResult) -> bytes:
+    """
+    Serializes a batch result as one NDJSON line.
+    
+    The result was validated by the executor, so nothing here can fail once
+    the response has started.
+    """
+    item = BatchSummaryItem.model_construct(
+        index=result.index,
+        username=result.username,
+        status_code=result.error.status_code if result.error else 200,
+        summary=result.summary,
+        error=result.error,
+    )
+    return item.model_dump_json().encode() + b"\n"
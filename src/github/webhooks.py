@@ -0,0 +1,205 @@
+import hashlib
+import hmac
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.github.cache import SummaryCache
+from src.github.compression import EncodedBody, ResponseEncoder
+from src.github.schemas import GitHubUserResponse
+from src.github.selection import SECTIONS, SummarySelection
+from src.github.service import GitHubService
+from src.github.streaming import encode_summary
+
+
+# Summary patch: edits a decoded summary in place, or returns False to drop it
+SummaryPatch = Callable[[Dict[str, Any]], bool]
+
+# What an event does: (tag, patch) pairs, where a None patch drops the entries
+EventEffects = List[Tuple[str, Optional[SummaryPatch]]]
+
+
+def user_tag(login: str) -> str:
+    """Tag of the cached summaries of a user"""
+    return f"user:{login.lower()}"
+
+
+def org_tag(login: str) -> str:
+    """Tag of the cached summaries of the members of an organization"""
+    return f"org:{login.lower()}"
+
+
+def summary_tags(summary: GitHubUserResponse) -> List[str]:
+    """Tags a cached summary is indexed under: its user and its organizations"""
+    tags = [user_tag(summary.user.login)]
+    tags.extend(org_tag(org.login) for org in summary.organizations or [])
+    return tags
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Checks the ``X-Hub-Signature-256`` header of a delivery against the shared secret"""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[len("sha256="):], expected)
+
+
+class WebhookProcessor:
+    """
+    Applies GitHub webhook events to the cached user summaries.
+    
+    Events that map to a change of one summary section are patched into the
+    cached JSON (the entry keeps its age); changes whose effect cannot be
+    computed from the payload, like repository access gained or lost through
+    a membership, drop the affected entries so they are fetched again.
+    
+    - repository: the owner's summaries (or its organization members') get
+      the repository added, updated, moved to the top or removed
+    - pull_request: the author's summaries get the pull request added or its
+      state and title updated
+    - organization: member changes drop the member's summaries; renaming or
+      deleting the organization drops its members' summaries
+    - membership: team changes drop the member's summaries
+    """
+    
+    def __init__(
+        self,
+        summary_cache: Optional[SummaryCache],
+        github_service: GitHubService,
+        response_encoder: Optional[ResponseEncoder] = None
+    ):
+        self.summary_cache = summary_cache
+        self.github_service = github_service
+        # Patched summaries are stored precompressed, like freshly built ones
+        self.response_encoder = response_encoder or ResponseEncoder()
+    
+    def handle(self, event: str, payload: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Applies one event.
+        
+        Args:
+            event: Value of the ``X-GitHub-Event`` header
+            payload: Decoded delivery body
+        
+        Returns:
+            Dict with the number of summaries the event was applied to
+            (``patched``) and dropped (``invalidated``)
+        
+        Raises:
+            ValueError: If the payload lacks fields the event needs
+        """
+        result = {"patched": 0, "invalidated": 0}
+        handler = getattr(self, f"_on_{event}", None)
+        if handler is None or self.summary_cache is None:
+            return result
+        try:
+            effects = handler(payload)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Malformed {event} payload: missing or invalid {e}") from e
+        for tag, patch in effects:
+            for key in self.summary_cache.keys_for(tag):
+                outcome = self.summary_cache.patch(key, lambda content: self._apply(content, patch))
+                if outcome is True:
+                    result["patched"] += 1
+                elif outcome is False:
+                    result["invalidated"] += 1
+        return result
+    
+    def _apply(self, packed: bytes, patch: Optional[SummaryPatch]) -> Optional[bytes]:
+        """Runs a patch over a cached summary body, None to drop it"""
+        if patch is None:
+            return None
+        summary = json.loads(EncodedBody.unpack(packed).content)
+        if not patch(summary):
+            return None
+        selection = SummarySelection(sections=frozenset(section for section in SECTIONS if section in summary))
+        content = encode_summary(GitHubUserResponse.model_validate(summary), selection)
+        return self.response_encoder.encode(content, precompress=True).pack()
+    
+    def _on_repository(self, payload: Dict[str, Any]) -> EventEffects:
+        action = payload.get("action")
+        repo = payload["repository"]
+        owner = repo["owner"]
+        entry = self.github_service._process_repository(repo)
+        full_name = repo["full_name"]
+        if action == "renamed":
+            full_name = f"{owner['login']}/{payload['changes']['repository']['name']['from']}"
+        
+        if owner.get("type") == "Organization":
+            if action in ("created", "transferred", "privatized"):
+                # Which members can see the repository depends on their permissions
+                return [(org_tag(owner["login"]), None)]
+            tag = org_tag(owner["login"])
+            public_delta = 0
+        else:
+            if action == "transferred":
+                previous = payload["changes"]["owner"]["from"]
+                previous_login = (previous.get("user") or previous.get("organization"))["login"]
+                return [(user_tag(owner["login"]), None), (user_tag(previous_login), None)]
+            tag = user_tag(owner["login"])
+            public_delta = {
+                "created": 0 if repo.get("private") else 1,
+                "deleted": 0 if repo.get("private") else -1,
+                "publicized": 1,
+                "privatized": -1,
+            }.get(action, 0)
+        
+        def patch(summary: Dict[str, Any]) -> bool:
+            if public_delta:
+                summary["summary"]["public_repos"] += public_delta
+            repositories = summary.get("repositories")
+            if repositories is None:
+                return True
+            remaining = [item for item in repositories if item["full_name"] != full_name]
+            if action == "deleted":
+                summary["repositories"] = remaining
+            elif action == "created" or len(remaining) < len(repositories):
+                # Every change bumps updated_at, which puts it first in the listing
+                summary["repositories"] = [entry, *remaining]
+            summary["summary"]["total_repositories"] = len(summary["repositories"])
+            return True
+        
+        return [(tag, patch)]
+    
+    def _on_pull_request(self, payload: Dict[str, Any]) -> EventEffects:
+        action = payload.get("action")
+        if action not in ("opened", "closed", "reopened", "edited"):
+            return []
+        pull_request = payload["pull_request"]
+        # Search results point at the repository through its API URL
+        entry = self.github_service._process_pull_requests([{
+            **pull_request,
+            "repository_url": payload["repository"]["url"],
+        }])[0]
+        
+        def patch(summary: Dict[str, Any]) -> bool:
+            pull_requests = summary.get("pull_requests")
+            if pull_requests is None:
+                return True
+            if action == "opened":
+                summary["pull_requests"] = [entry, *pull_requests]
+                summary["summary"]["total_pull_requests"] += 1
+                return True
+            for item in pull_requests:
+                if item["repository_url"] == entry["repository_url"] and item["number"] == entry["number"]:
+                    item["state"] = entry["state"]
+                    item["title"] = entry["title"]
+            return True
+        
+        return [(user_tag(pull_request["user"]["login"]), patch)]
+    
+    def _on_organization(self, payload: Dict[str, Any]) -> EventEffects:
+        action = payload.get("action")
+        if action in ("member_added", "member_removed"):
+            # Membership also changes which repositories the member can list
+            return [(user_tag(payload["membership"]["user"]["login"]), None)]
+        if action == "deleted":
+            return [(org_tag(payload["organization"]["login"]), None)]
+        if action == "renamed":
+            previous_login = payload.get("changes", {}).get("login", {}).get("from")
+            logins = [payload["organization"]["login"], *([previous_login] if previous_login else [])]
+            return [(org_tag(login), None) for login in logins]
+        return []
+    
+    def _on_membership(self, payload: Dict[str, Any]) -> EventEffects:
+        # Team membership changes the repositories a member can access
+        return [(user_tag(payload["member"]["login"]), None)]
@@ -2,21 +2,153 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from src.config import get_settings
+from src.admission import AdmissionControlMiddleware, create_admission_controller
+from src.config import Settings, get_settings, reload_settings
+from src.dependencies import create_github_service
+from src.github.batch import BatchExecutor
+from src.github.breaker import STATE_VALUES
+from src.github.cache import ResponseCache, SummaryCache
+from src.github.cache_backends import CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from src.github.client import (
+    GitHubAPIClient,
+    create_circuit_breakers,
+    create_hedging_policy,
+    create_http_client,
+    create_rate_limiter,
+)
+from src.github.repository_sync import create_repository_sync
 from src.github.router import router as github_router
+from src.metrics import (
+    ADMISSION,
+    CIRCUIT_STATE,
+    CONNECTION_POOL,
+    RATE_LIMIT_QUEUED,
+    REGISTRY,
+    RESPONSE_CACHE,
+    SUMMARY_CACHE,
+    connection_pool_stats,
+)
+from src.profiling import ProfilingMiddleware
+from src.timing import ServerTimingMiddleware
 
 settings = get_settings()
 
 
+def create_summary_cache_backend(settings: Settings) -> CacheBackend:
+    """Creates the configured storage of the summary cache"""
+    if settings.summary_cache_backend == "sqlite":
+        return SQLiteCacheBackend(
+            settings.summary_cache_path,
+            max_entries=settings.summary_cache_max_entries,
+            max_bytes=settings.summary_cache_max_bytes,
+        )
+    return MemoryCacheBackend(
+        max_entries=settings.summary_cache_max_entries,
+        max_bytes=settings.summary_cache_max_bytes,
+    )
+
+
+def configure_github_service(app: FastAPI, settings: Settings) -> None:
+    """Builds the shared GitHub client and service on top of the app's pool, caches and limiter"""
+    app.state.settings = settings
+    app.state.github_client = GitHubAPIClient(
+        settings=settings,
+        http_client=app.state.http_client,
+        response_cache=app.state.response_cache,
+        rate_limiter=app.state.rate_limiter,
+        circuit_breakers=app.state.circuit_breakers,
+        hedging=app.state.hedging_policy,
+    )
+    app.state.github_service = create_github_service(
+        settings, app.state.github_client, app.state.repository_sync
+    )
+
+
+def register_state_metrics(app: FastAPI) -> None:
+    """Points the scrape-time gauges at the shared pool, caches and rate limiter"""
+    state = app.state
+    
+    def response_cache_stats():
+        if state.response_cache is None:
+            return {}
+        return {("entries",): len(state.response_cache), ("bytes",): state.response_cache.total_bytes}
+    
+    def summary_cache_stats():
+        if state.summary_cache is None:
+            return {}
+        return {(stat,): value for stat, value in state.summary_cache.stats().items()}
+    
+    RESPONSE_CACHE.callback = response_cache_stats
+    SUMMARY_CACHE.callback = summary_cache_stats
+    CONNECTION_POOL.callback = lambda: connection_pool_stats(state.http_client)
+    RATE_LIMIT_QUEUED.callback = lambda: {(): state.rate_limiter.queued_total()}
+    
+    def circuit_breaker_states():
+        if state.circuit_breakers is None:
+            return {}
+        return {(name,): STATE_VALUES[value] for name, value in state.circuit_breakers.states().items()}
+    
+    CIRCUIT_STATE.callback = circuit_breaker_states
+    
+    def admission_stats():
+        if state.admission_controller is None:
+            return {}
+        return {("in_flight",): state.admission_controller.in_flight, ("queued",): state.admission_controller.queued}
+    
+    ADMISSION.callback = admission_stats
+
+
+def reload_app_settings(app: FastAPI) -> Settings:
+    """
+    Re-reads the configuration and rebuilds the shared GitHub client and service.
+    
+    The connection pool, caches, rate limiter and batch executor are kept, so
+    changes to their sizes only apply after a restart.
+    """
+    settings = reload_settings()
+    configure_github_service(app, settings)
+    return settings
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup
+    settings = get_settings()
+    app.state.http_client = create_http_client(settings)
+    app.state.rate_limiter = create_rate_limiter(settings)
+    app.state.circuit_breakers = create_circuit_breakers(settings)
+    app.state.hedging_policy = create_hedging_policy(settings)
+    app.state.admission_controller = create_admission_controller(settings)
+    app.state.repository_sync = create_repository_sync(settings)
+    app.state.batch_executor = BatchExecutor(
+        max_concurrency=settings.batch_max_concurrency,
+        per_token_concurrency=settings.batch_per_token_concurrency,
+    )
+    app.state.response_cache = None
+    if settings.github_response_cache_enabled:
+        app.state.response_cache = ResponseCache(
+            max_entries=settings.github_response_cache_max_entries,
+            max_bytes=settings.github_response_cache_max_bytes,
+        )
+    app.state.summary_cache = None
+    if settings.summary_cache_enabled:
+        app.state.summary_cache = SummaryCache(
+            ttl=settings.summary_cache_ttl,
+            stale_ttl=settings.summary_cache_stale_ttl,
+            backend=create_summary_cache_backend(settings),
+        )
+    configure_github_service(app, settings)
+    register_state_metrics(app)
     print(f"[STARTUP] {settings.app_name} v{settings.app_version} started")
     print(f"[INFO] Documentation: http://localhost:8000/docs")
     yield
     # Shutdown
+    if app.state.summary_cache is not None:
+        await app.state.summary_cache.aclose()
+    await app.state.http_client.aclose()
     print(f"[SHUTDOWN] {settings.app_name} stopped")
 
 
@@ -38,6 +170,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Load shedding of summary requests; added first so shed responses still get CORS headers
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -47,6 +182,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-phase Server-Timing header, and admin-only profiling of single requests
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
 # Register routers
 app.include_router(github_router)
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Exposes the service metrics in Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
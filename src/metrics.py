@@ -0,0 +1,345 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Upper bounds in seconds, from a fast cache revalidation to a slow search
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value the way Prometheus expects"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the text exposition format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Formats a label set, empty when there are no labels"""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric(ABC):
+    """
+    Base class of the metrics exposed on ``/metrics``.
+    
+    Label values are passed positionally in ``labelnames`` order and samples
+    are kept in plain dicts keyed by the label tuple, so recording is a dict
+    lookup and an addition. The app runs on one event loop, so no locking
+    is needed.
+    """
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+    
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        """Yields (suffix, label values, value) for every sample"""
+    
+    def render(self) -> List[str]:
+        """Returns the metric in Prometheus text exposition format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            names = self.labelnames + ("le",) if suffix == "_bucket" else self.labelnames
+            lines.append(f"{self.name}{suffix}{_format_labels(names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set"""
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Adds ``amount`` to the counter of a label set"""
+        self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def value(self, *labels: str) -> float:
+        """Current value of a label set"""
+        return self._values.get(labels, 0)
+    
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        for labels, value in self._values.items():
+            yield "", labels, value
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down"""
+    kind = "gauge"
+    
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Subtracts ``amount`` from the gauge of a label set"""
+        self._values[labels] = self._values.get(labels, 0) - amount
+    
+    def set(self, value: float, *labels: str) -> None:
+        """Sets the gauge of a label set"""
+        self._values[labels] = value
+    
+    @contextmanager
+    def track_in_progress(self, *labels: str) -> Iterator[None]:
+        """Increments the gauge for the duration of the block"""
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+
+class CallbackGauge(Metric):
+    """Gauge whose samples are read from a callback when the metrics are scraped"""
+    kind = "gauge"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+    
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        if self.callback is None:
+            return
+        for labels, value in self.callback().items():
+            yield "", labels, value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets, with their sum and count"""
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        """Records one observation for a label set"""
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+    
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observes the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+    
+    def count(self, *labels: str) -> int:
+        """Number of observations of a label set"""
+        return sum(self._counts.get(labels, ()))
+    
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        for labels, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", labels + (_format_value(bound),), cumulative
+            yield "_sum", labels, self._sums[labels]
+            yield "_count", labels, cumulative
+
+
+def connection_pool_stats(http_client: object) -> Dict[LabelValues, float]:
+    """
+    Counts the connections of an ``httpx.AsyncClient`` pool by state.
+    
+    httpx does not expose pool statistics publicly, so this reads the
+    underlying httpcore pool and reports nothing for other transports.
+    """
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {}
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        ("total",): len(connections),
+        ("idle",): idle,
+        ("active",): len(connections) - idle,
+    }
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together on ``/metrics``"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+    
+    def register(self, metric: Metric) -> Metric:
+        """Adds a metric, replacing any previous metric with the same name"""
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def get(self, name: str) -> Optional[Metric]:
+        """Returns a registered metric by name"""
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Returns every metric in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# GitHub API calls made by GitHubAPIClient, labelled by endpoint template
+UPSTREAM_LATENCY = REGISTRY.register(Histogram(
+    "github_upstream_request_duration_seconds",
+    "Duration of GitHub API requests",
+    ("endpoint", "method"),
+))
+UPSTREAM_RESPONSES = REGISTRY.register(Counter(
+    "github_upstream_responses_total",
+    "GitHub API responses by status code",
+    ("endpoint", "status"),
+))
+UPSTREAM_ERRORS = REGISTRY.register(Counter(
+    "github_upstream_errors_total",
+    "GitHub API requests that failed without a response",
+    ("endpoint", "error"),
+))
+UPSTREAM_BYTES = REGISTRY.register(Counter(
+    "github_upstream_response_bytes_total",
+    "Bytes received from the GitHub API",
+    ("endpoint",),
+))
+UPSTREAM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "github_upstream_requests_in_flight",
+    "GitHub API requests currently waiting for a response",
+    ("endpoint",),
+))
+UPSTREAM_COALESCED = REGISTRY.register(Counter(
+    "github_upstream_coalesced_total",
+    "GET calls that joined an identical request already in flight",
+    ("endpoint",),
+))
+UPSTREAM_NOT_MODIFIED = REGISTRY.register(Counter(
+    "github_upstream_not_modified_total",
+    "Conditional GET calls answered with 304 and served from the response cache",
+    ("endpoint",),
+))
+
+UPSTREAM_HEDGES = REGISTRY.register(Counter(
+    "github_upstream_hedges_total",
+    "Hedged GET calls: sent, won against the original call, or throttled by the budget or rate limit",
+    ("endpoint", "outcome"),
+))
+
+RATE_LIMIT_REJECTIONS = REGISTRY.register(Counter(
+    "github_rate_limit_rejections_total",
+    "Upstream calls rejected with 429 because the token's budget would not recover in time",
+    ("resource",),
+))
+
+CIRCUIT_TRANSITIONS = REGISTRY.register(Counter(
+    "github_circuit_breaker_transitions_total",
+    "Circuit breaker state changes per endpoint class",
+    ("endpoint_class", "state"),
+))
+CIRCUIT_SHORT_CIRCUITS = REGISTRY.register(Counter(
+    "github_circuit_breaker_short_circuits_total",
+    "Calls not sent upstream because the breaker was open (rejected, or served from cache)",
+    ("endpoint_class", "outcome"),
+))
+
+# Summaries built by GitHubService
+SUMMARY_LATENCY = REGISTRY.register(Histogram(
+    "github_summary_duration_seconds",
+    "Duration of building a user summary",
+    ("backend",),
+))
+SECTION_LATENCY = REGISTRY.register(Histogram(
+    "github_summary_section_duration_seconds",
+    "Duration of fetching one summary section",
+    ("section",),
+))
+SECTION_ERRORS = REGISTRY.register(Counter(
+    "github_summary_section_errors_total",
+    "Summary sections that failed and were returned empty",
+    ("section",),
+))
+
+SUMMARY_RESPONSES = REGISTRY.register(Counter(
+    "github_summary_responses_total",
+    "User summary responses by content coding (identity, gzip, br), or not_modified for 304 answers",
+    ("encoding",),
+))
+
+ADMISSION_SHED = REGISTRY.register(Counter(
+    "github_admission_shed_total",
+    "Requests rejected by admission control (token_limit, queue_full, queue_timeout)",
+    ("reason",),
+))
+ADMISSION_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "github_admission_queue_wait_seconds",
+    "Time requests waited in the admission queue",
+))
+
+# Shared state read when /metrics is scraped; callbacks are set in the app lifespan
+RESPONSE_CACHE = REGISTRY.register(CallbackGauge(
+    "github_response_cache",
+    "GitHub response cache size (entries, bytes)",
+    ("stat",),
+))
+SUMMARY_CACHE = REGISTRY.register(CallbackGauge(
+    "github_summary_cache",
+    "User summary cache counters and size (hits, misses, stale_hits, entries, refreshing)",
+    ("stat",),
+))
+CONNECTION_POOL = REGISTRY.register(CallbackGauge(
+    "github_connection_pool",
+    "Connections in the pooled HTTP client (total, idle, active)",
+    ("state",),
+))
+CIRCUIT_STATE = REGISTRY.register(CallbackGauge(
+    "github_circuit_breaker_state",
+    "Circuit breaker state per endpoint class (0 closed, 1 half-open, 2 open)",
+    ("endpoint_class",),
+))
+ADMISSION = REGISTRY.register(CallbackGauge(
+    "github_admission_requests",
+    "Requests holding an admission slot (in_flight) or waiting for one (queued)",
+    ("state",),
+))
+RATE_LIMIT_QUEUED = REGISTRY.register(CallbackGauge(
+    "github_rate_limit_queued_requests",
+    "Upstream calls holding or waiting for a rate limit slot",
+))
@@ -0,0 +1,138 @@
+import hmac
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+from src.config import get_settings
+
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Formats a frame as ``function (path:line)`` for collapsed stacks"""
+    code = frame.f_code
+    filename = code.co_filename
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:
+        relative = filename
+    if relative.startswith(".."):
+        # Outside the project (stdlib, site-packages): keep the last two parts
+        relative = "/".join(filename.replace(os.sep, "/").split("/")[-2:])
+    # Semicolons separate frames in the folded format; the count follows the last space
+    return f"{code.co_name} ({relative}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread from a background thread.
+    
+    Stacks are read with ``sys._current_frames()`` every ``interval``
+    seconds and aggregated in the collapsed ("folded") format understood by
+    flamegraph.pl, speedscope and inferno. Sampling the event loop thread
+    captures everything it runs, including other requests served meanwhile.
+    """
+    
+    def __init__(self, thread_id: int, interval: float = 0.002):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Starts sampling in a daemon thread"""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stops sampling and waits for the sampler thread to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+    
+    def collapsed(self) -> str:
+        """Returns the samples as collapsed stacks, one ``stack count`` per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a single request on demand.
+    
+    A request sent with ``X-Profile: 1`` and an ``X-Admin-Token`` matching the
+    ``admin_token`` setting runs normally under a SamplingProfiler; its body
+    is discarded and the collapsed stacks are returned instead, with the
+    original status in ``X-Profiled-Status``. Without an ``admin_token``
+    configured, the header is ignored; with a wrong token the request is
+    rejected with 403.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        settings = get_settings()
+        if PROFILE_HEADER not in headers or not settings.admin_token:
+            await self.app(scope, receive, send)
+            return
+        
+        supplied = headers.get(ADMIN_TOKEN_HEADER, b"")
+        if not hmac.compare_digest(supplied, settings.admin_token.encode()):
+            await self._respond(send, 403, b'{"detail":"Invalid admin token"}', b"application/json")
+            return
+        
+        profiler = SamplingProfiler(threading.get_ident(), settings.profile_sample_interval)
+        profiled = {"status": 500, "headers": []}
+        
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                profiled["status"] = message["status"]
+                profiled["headers"] = message.get("headers", [])
+        
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+        
+        extra_headers = [
+            (b"content-disposition", b'attachment; filename="profile.folded"'),
+            (b"x-profiled-status", str(profiled["status"]).encode()),
+            (b"x-profile-samples", str(sum(profiler.samples.values())).encode()),
+        ]
+        extra_headers.extend((name, value) for name, value in profiled["headers"] if name == b"server-timing")
+        await self._respond(send, 200, profiler.collapsed().encode(), b"text/plain; charset=utf-8", extra_headers)
+    
+    async def _respond(self, send, status: int, body: bytes, content_type: bytes, headers=()) -> None:
+        """Sends a complete response"""
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
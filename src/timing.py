@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class ServerTiming:
+    """
+    Durations of the phases of one request, rendered as a Server-Timing header.
+    
+    Phases may overlap (summary sections run concurrently); each one is
+    reported with its own duration. Recording a phase twice adds the times.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._phases: Dict[str, float] = {}
+        self._descriptions: Dict[str, str] = {}
+    
+    def record(self, name: str, duration: float, description: Optional[str] = None) -> None:
+        """Adds ``duration`` seconds to a phase"""
+        self._phases[name] = self._phases.get(name, 0.0) + duration
+        if description is not None:
+            self._descriptions[name] = description
+    
+    def phases(self) -> List[Tuple[str, float]]:
+        """Returns the recorded (phase, seconds) pairs in recording order"""
+        return list(self._phases.items())
+    
+    def header_value(self) -> str:
+        """Formats the phases and the total elapsed time as a Server-Timing value"""
+        metrics = []
+        for name, duration in self._phases.items():
+            metric = f"{name};dur={duration * 1000:.1f}"
+            if name in self._descriptions:
+                metric += f';desc="{self._descriptions[name]}"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current_timing: ContextVar[Optional[ServerTiming]] = ContextVar("server_timing", default=None)
+
+
+def current_timing() -> Optional[ServerTiming]:
+    """Returns the timing of the request being handled, None outside a request"""
+    return _current_timing.get()
+
+
+def record_phase(name: str, duration: float, description: Optional[str] = None) -> None:
+    """Records a phase duration on the current request, if there is one"""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.record(name, duration, description)
+
+
+@contextmanager
+def phase(name: str, description: Optional[str] = None) -> Iterator[None]:
+    """Times the block as a phase of the current request"""
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.record(name, time.perf_counter() - start, description)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that adds a ``Server-Timing`` header to every HTTP response.
+    
+    A ServerTiming is stored in a context variable for the request, so code
+    anywhere below (router, service, tasks it spawns) can record phases
+    without passing it around. Streaming responses only report what was
+    recorded before their headers were sent.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timing = ServerTiming()
+        context_token = _current_timing.set(timing)
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header_value().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timing.reset(context_token)
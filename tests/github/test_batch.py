@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+from fastapi import HTTPException
+
+from src.github.batch import BatchExecutor, BatchJob
+from src.github.service import GitHubService
+
+
+def summary_of(login):
+    """Smallest summary that matches the response schema"""
+    return {"user": {"login": login, "followers": 0}, "summary": {"public_repos": 0, "public_gists": 0}}
+
+
+def make_service(get_user_summary):
+    """Builds a service mock whose summaries come from the given coroutine"""
+    service = MagicMock(spec=GitHubService)
+    service.get_user_summary = get_user_summary
+    return service
+
+
+class TestBatchExecutor:
+    """Tests for BatchExecutor"""
+    
+    @pytest.mark.asyncio
+    async def test_yields_results_in_completion_order(self):
+        """Should yield faster summaries first with their request index"""
+        delays = {"slow": 0.05, "fast": 0.0}
+        
+        async def get_user_summary(token, username):
+            await asyncio.sleep(delays[username])
+            return summary_of(username)
+        
+        executor = BatchExecutor()
+        jobs = [BatchJob(index=0, token="t", username="slow"), BatchJob(index=1, token="t", username="fast")]
+        
+        results = [result async for result in executor.run(make_service(get_user_summary), jobs)]
+        
+        assert [result.index for result in results] == [1, 0]
+        assert results[0].summary.user.login == "fast"
+    
+    @pytest.mark.asyncio
+    async def test_reports_errors_per_item(self):
+        """Should turn a failed summary into an error result without stopping the batch"""
+        async def get_user_summary(token, username):
+            if username == "missing":
+                raise HTTPException(status_code=404, detail="Resource not found")
+            return summary_of(username)
+        
+        executor = BatchExecutor()
+        jobs = [BatchJob(index=0, token="t", username="missing"), BatchJob(index=1, token="t", username="ok")]
+        
+        results = {result.index: result async for result in executor.run(make_service(get_user_summary), jobs)}
+        
+        assert results[0].error.model_dump() == {"section": "user", "status_code": 404, "detail": "Resource not found"}
+        assert results[1].summary is not None
+    
+    @pytest.mark.asyncio
+    async def test_reports_invalid_summaries_per_item(self):
+        """Should fail only the item whose summary does not match the schema, under the invalid section"""
+        async def get_user_summary(token, username):
+            summary = summary_of(username)
+            if username == "broken":
+                summary["repositories"] = [{"name": "no-other-fields"}]
+            return summary
+        
+        executor = BatchExecutor()
+        jobs = [BatchJob(index=0, token="t", username="broken"), BatchJob(index=1, token="t", username="ok")]
+        
+        results = {result.index: result async for result in executor.run(make_service(get_user_summary), jobs)}
+        
+        assert results[0].summary is None
+        assert (results[0].error.section, results[0].error.status_code) == ("repositories", 500)
+        assert results[1].summary.user.login == "ok"
+    
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_per_token(self):
+        """Should never run more summaries for one token than the per-token limit"""
+        running = {"now": 0, "max": 0}
+        
+        async def get_user_summary(token, username):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return {}
+        
+        executor = BatchExecutor(max_concurrency=10, per_token_concurrency=2)
+        jobs = [BatchJob(index=index, token="same-token") for index in range(6)]
+        
+        results = [result async for result in executor.run(make_service(get_user_summary), jobs)]
+        
+        assert len(results) == 6
+        assert running["max"] == 2
+        assert executor._per_token == {}
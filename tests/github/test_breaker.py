@@ -0,0 +1,113 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.config import Settings
+from src.github.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+from src.github.cache import ResponseCache
+from src.github.client import GitHubAPIClient
+
+
+def fail(breaker: CircuitBreaker, calls: int, duration: float = 0.1) -> None:
+    """Records failed calls on a breaker"""
+    for _ in range(calls):
+        breaker.acquire()
+        breaker.release(False, duration)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions"""
+    
+    def test_opens_on_failure_rate_and_fails_fast(self):
+        """Should open once the failure rate crosses the threshold and reject calls"""
+        breaker = CircuitBreaker("core", window=10, min_calls=4, failure_rate=0.5, open_duration=30)
+        breaker.acquire()
+        breaker.release(True, 0.1)
+        fail(breaker, 2)
+        assert breaker.state == CLOSED
+        
+        fail(breaker, 1)
+        
+        assert breaker.state == OPEN
+        with pytest.raises(HTTPException) as exc_info:
+            breaker.acquire()
+        assert exc_info.value.status_code == 503
+        assert int(exc_info.value.headers["Retry-After"]) == 30
+    
+    def test_opens_on_slow_calls(self):
+        """Should open when most calls are slower than the slow call duration"""
+        breaker = CircuitBreaker("search", min_calls=2, slow_call_duration=1.0, slow_call_rate=1.0)
+        for _ in range(2):
+            breaker.acquire()
+            breaker.release(True, 2.0)
+        
+        assert breaker.state == OPEN
+    
+    def test_half_open_probe_closes_or_reopens(self):
+        """Should let one probe through after the open period and act on its outcome"""
+        breaker = CircuitBreaker("core", min_calls=1, open_duration=0)
+        fail(breaker, 1)
+        assert breaker.state == OPEN
+        
+        breaker.acquire()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(HTTPException):
+            breaker.acquire()
+        breaker.release(False, 0.1)
+        assert breaker.state == OPEN
+        
+        breaker.acquire()
+        breaker.release(True, 0.1)
+        assert breaker.state == CLOSED
+    
+    def test_calls_that_never_reached_upstream_are_ignored(self):
+        """Should free the probe slot without deciding on a cancelled probe"""
+        breaker = CircuitBreaker("core", min_calls=1, open_duration=0)
+        fail(breaker, 1)
+        
+        breaker.acquire()
+        breaker.release(None)
+        
+        assert breaker.state == HALF_OPEN
+        breaker.acquire()
+
+
+class TestClientCircuitBreaker:
+    """Tests for the circuit breaker in GitHubAPIClient"""
+    
+    @pytest.mark.asyncio
+    async def test_fails_fast_or_serves_cache_when_open(self):
+        """Should stop calling GitHub once the breaker opens, serving cached answers when it can"""
+        calls = []
+        healthy = {"value": True}
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            if healthy["value"]:
+                return httpx.Response(200, json={"login": "testuser"}, headers={"ETag": '"v1"'})
+            return httpx.Response(502, json={"message": "Bad gateway"})
+        
+        breakers = CircuitBreakers(min_calls=3, failure_rate=0.6, open_duration=60)
+        client = GitHubAPIClient(
+            Settings(),
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            response_cache=ResponseCache(),
+            circuit_breakers=breakers,
+        )
+        assert await client.get_user("test-token") == {"login": "testuser"}
+        
+        healthy["value"] = False
+        for username in ("a", "b"):
+            with pytest.raises(HTTPException):
+                await client.get_user("test-token", username=username)
+        assert breakers.get("core").state == OPEN
+        sent = len(calls)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await client.get_user("test-token", username="c")
+        cached = await client.get_user("test-token")
+        
+        assert exc_info.value.status_code == 503
+        assert cached == {"login": "testuser"}
+        assert len(calls) == sent
+        await client.aclose()
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from fastapi import HTTPException
+
+from src.deadline import current_deadline, request_deadline
+from src.github.cache import CachedResponse, Computed, ResponseCache, SummaryCache
+
+
+class TestResponseCache:
+    """Tests for ResponseCache eviction"""
+    
+    def test_evicts_least_recently_used_by_count(self):
+        """Should drop the oldest entry when the entry limit is exceeded"""
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b"):
+            cache.set(key, CachedResponse(body=key, etag=key, last_modified=None, size=1))
+        cache.get("a")
+        
+        cache.set("c", CachedResponse(body="c", etag="c", last_modified=None, size=1))
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+    
+    def test_evicts_by_total_bytes(self):
+        """Should keep the total cached size under max_bytes"""
+        cache = ResponseCache(max_entries=10, max_bytes=10)
+        cache.set("a", CachedResponse(body="a", etag="a", last_modified=None, size=6))
+        cache.set("b", CachedResponse(body="b", etag="b", last_modified=None, size=6))
+        
+        assert cache.get("a") is None
+        assert cache.total_bytes == 6
+
+
+class TestSummaryCache:
+    """Tests for SummaryCache stale-while-revalidate"""
+    
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_without_recompute(self):
+        """Should compute once and serve the fresh value afterwards"""
+        cache = SummaryCache(ttl=60, stale_ttl=60)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return "summary"
+        
+        assert await cache.get_or_compute("key", compute) == "summary"
+        assert await cache.get_or_compute("key", compute) == "summary"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_once(self):
+        """Should return the stale value at once and collapse refreshes into one task"""
+        cache = SummaryCache(ttl=0, stale_ttl=60)
+        cache.set("key", "old")
+        release = asyncio.Event()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return "new"
+        
+        first = await cache.get_or_compute("key", compute)
+        second = await cache.get_or_compute("key", compute)
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        
+        assert first == second == "old"
+        assert len(calls) == 1
+        assert cache.stats()["stale_hits"] == 2
+        assert cache.backend.get("key")[1] == "new"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_computation(self):
+        """Should run a single computation for concurrent misses"""
+        cache = SummaryCache(ttl=60, stale_ttl=0)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return "summary"
+        
+        results = await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(3)))
+        
+        assert results == ["summary"] * 3
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_rejected_values_are_not_stored(self):
+        """Should return values computed as not cacheable without storing them"""
+        cache = SummaryCache(ttl=60, stale_ttl=0)
+        
+        async def compute():
+            return Computed("partial", cacheable=False)
+        
+        result = await cache.get_or_compute("key", compute)
+        
+        assert result == "partial"
+        assert cache.stats()["entries"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_shared_compute_ignores_the_callers_deadline(self):
+        """Should compute without the deadline of the caller that missed, bounding each wait by its own"""
+        cache = SummaryCache(ttl=60, stale_ttl=0)
+        seen = []
+        
+        async def compute():
+            seen.append(current_deadline())
+            await asyncio.sleep(0.05)
+            return "summary"
+        
+        async def with_deadline(timeout):
+            with request_deadline(timeout):
+                return await cache.get_or_compute("key", compute)
+        
+        hurried, patient = await asyncio.gather(with_deadline(0.01), with_deadline(5.0), return_exceptions=True)
+        
+        assert isinstance(hurried, HTTPException) and hurried.status_code == 504
+        assert patient == "summary"
+        assert seen == [None]
+    
+    def test_patch_keeps_age_and_tags(self):
+        """Should rewrite tagged entries in place and untag dropped ones"""
+        cache = SummaryCache(ttl=60, stale_ttl=0)
+        cache.set("a", "one")
+        cache.set("b", "two")
+        cache.tag("a", ["user:octocat"])
+        cache.tag("b", ["user:octocat", "org:github"])
+        stored_at = cache.backend.get("a")[0]
+        
+        assert cache.keys_for("user:octocat") == ["a", "b"]
+        assert cache.patch("a", lambda value: value.upper()) is True
+        assert cache.backend.get("a") == (stored_at, "ONE")
+        assert cache.patch("b", lambda value: None) is False
+        assert cache.keys_for("org:github") == []
+        assert cache.patch("missing", lambda value: value) is None
@@ -0,0 +1,128 @@
+import time
+
+import pytest
+
+from src.github.cache import SummaryCache
+from src.github.cache_backends import MemoryCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    """Fixture that provides a path for a SQLite cache file"""
+    return str(tmp_path / "cache" / "summaries.sqlite3")
+
+
+class TestMemoryCacheBackend:
+    """Tests for MemoryCacheBackend"""
+    
+    def test_evicts_by_bytes(self):
+        """Should drop the least recently used entries above max_bytes"""
+        backend = MemoryCacheBackend(max_entries=10, max_bytes=10)
+        backend.set("a", b"123456", ttl=60)
+        backend.set("b", b"123456", ttl=60)
+        
+        assert backend.get("a") is None
+        assert backend.get("b")[1] == b"123456"
+        assert backend.total_bytes == 6
+    
+    def test_expired_entries_are_dropped(self):
+        """Should not return entries past their ttl"""
+        backend = MemoryCacheBackend()
+        backend.set("a", b"value", ttl=0)
+        
+        assert backend.get("a") is None
+        assert len(backend) == 0
+
+
+class TestSQLiteCacheBackend:
+    """Tests for SQLiteCacheBackend"""
+    
+    def test_entries_are_shared_and_survive_restarts(self, sqlite_path):
+        """Should serve entries written by another connection, like another worker or process"""
+        writer = SQLiteCacheBackend(sqlite_path)
+        reader = SQLiteCacheBackend(sqlite_path)
+        before = time.time()
+        
+        writer.set("hash:sections", b'{"user":{}}', ttl=60)
+        writer.close()
+        
+        stored_at, value = reader.get("hash:sections")
+        assert value == b'{"user":{}}'
+        assert stored_at >= before
+        reader.close()
+        
+        assert SQLiteCacheBackend(sqlite_path).get("hash:sections")[1] == b'{"user":{}}'
+    
+    def test_expired_entries_are_ignored_and_purged(self, sqlite_path):
+        """Should not return expired entries and purge them on the next write"""
+        backend = SQLiteCacheBackend(sqlite_path)
+        backend.set("old", b"value", ttl=0)
+        
+        assert backend.get("old") is None
+        backend.set("new", b"value", ttl=60)
+        assert len(backend) == 1
+    
+    def test_enforces_entry_and_byte_caps(self, sqlite_path):
+        """Should evict the least recently read entries above the caps"""
+        backend = SQLiteCacheBackend(sqlite_path, max_entries=2, max_bytes=10, touch_interval=0)
+        backend.set("a", b"1234", ttl=60)
+        backend.set("b", b"1234", ttl=60)
+        backend.get("a")
+        
+        backend.set("c", b"1234", ttl=60)
+        assert backend.get("b") is None
+        assert backend.get("a") is not None
+        
+        backend.set("d", b"12345678", ttl=60)
+        assert len(backend) == 1
+        assert backend.get("d") is not None
+    
+    def test_does_not_wait_for_another_writer(self, sqlite_path):
+        """Should serve reads and skip writes at once while another worker holds the write lock"""
+        backend = SQLiteCacheBackend(sqlite_path, touch_interval=0)
+        backend.set("a", b"value", ttl=60)
+        other = SQLiteCacheBackend(sqlite_path)
+        other._connection.execute("BEGIN IMMEDIATE")
+        
+        start = time.perf_counter()
+        assert backend.get("a")[1] == b"value"
+        backend.set("b", b"value", ttl=60)
+        
+        assert time.perf_counter() - start < 1.0
+        assert backend.skipped_writes == 2
+        other._connection.execute("ROLLBACK")
+        assert backend.get("b") is None
+    
+    def test_tags_are_shared_and_dropped_with_entries(self, sqlite_path):
+        """Should find tagged keys from another connection, after a restart, until the entry goes"""
+        writer = SQLiteCacheBackend(sqlite_path, max_entries=1)
+        writer.tag("a", ["user:octocat", "org:github"])
+        writer.set("a", b"value", ttl=60)
+        writer.close()
+        
+        reader = SQLiteCacheBackend(sqlite_path, max_entries=1)
+        assert reader.keys_for("user:octocat") == ["a"]
+        
+        reader.set("b", b"value", ttl=60)
+        assert reader.keys_for("org:github") == []
+        reader.tag("b", ["user:octocat"])
+        reader.delete("b")
+        assert reader.keys_for("user:octocat") == []
+    
+    @pytest.mark.asyncio
+    async def test_summary_cache_on_sqlite(self, sqlite_path):
+        """Should serve a summary computed by another SummaryCache sharing the file"""
+        first = SummaryCache(ttl=60, stale_ttl=60, backend=SQLiteCacheBackend(sqlite_path))
+        second = SummaryCache(ttl=60, stale_ttl=60, backend=SQLiteCacheBackend(sqlite_path))
+        
+        async def compute():
+            return b'{"user":{"login":"octocat"}}'
+        
+        async def fail():
+            raise AssertionError("should be served from the shared cache")
+        
+        assert await first.get_or_compute("key", compute) == b'{"user":{"login":"octocat"}}'
+        assert await second.get_or_compute("key", fail) == b'{"user":{"login":"octocat"}}'
+        assert second.stats()["hits"] == 1
+        await first.aclose()
+        await second.aclose()
@@ -0,0 +1,253 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.config import Settings
+from src.deadline import request_deadline
+from src.github.cache import ResponseCache
+from src.github.client import GitHubAPIClient, create_http_client
+
+
+def make_transport(routes: dict, calls: list = None) -> httpx.MockTransport:
+    """Builds a mock transport that answers GitHub paths from a dict"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        return routes[request.url.path](request)
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def settings():
+    """Fixture that provides default settings"""
+    return Settings()
+
+
+class TestSharedHttpClient:
+    """Tests for the pooled HTTP client"""
+    
+    def test_create_http_client_uses_pool_settings(self):
+        """Should configure pool limits from settings"""
+        settings = Settings(github_max_connections=7, github_max_keepalive_connections=3)
+        
+        http_client = create_http_client(settings)
+        pool = http_client._transport._pool
+        
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+    
+    @pytest.mark.asyncio
+    async def test_requests_reuse_injected_client(self, settings):
+        """Should send every call through the injected client and leave it open"""
+        calls = []
+        transport = make_transport({
+            "/user": lambda r: httpx.Response(200, json={"login": "testuser"}),
+            "/user/orgs": lambda r: httpx.Response(200, json=[]),
+        }, calls)
+        http_client = httpx.AsyncClient(transport=transport)
+        client = GitHubAPIClient(settings=settings, http_client=http_client)
+        
+        await client.get_user("test-token")
+        await client.get_organizations("test-token")
+        await client.aclose()
+        
+        assert len(calls) == 2
+        assert calls[0].headers["Authorization"] == "Bearer test-token"
+        assert not http_client.is_closed
+        await http_client.aclose()
+
+
+class TestRequestDeadline:
+    """Tests for upstream timeouts sized from the request deadline"""
+    
+    @pytest.mark.asyncio
+    async def test_timeout_is_capped_by_deadline(self, settings):
+        """Should send non-shared calls with the smaller of the call timeout and the time left"""
+        calls = []
+        transport = make_transport({"/graphql": lambda r: httpx.Response(200, json={"data": {}})}, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        with request_deadline(2.0):
+            await client.graphql("test-token", "query { viewer { login } }")
+        
+        assert calls[0].extensions["timeout"]["read"] <= 2.0
+    
+    @pytest.mark.asyncio
+    async def test_coalesced_callers_keep_their_own_deadline(self, settings):
+        """Should not impose the deadline of the caller that started a shared GET on the others"""
+        calls = []
+        
+        async def slow_user(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"login": "testuser"})
+        
+        client = GitHubAPIClient(
+            settings=settings,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(slow_user))
+        )
+        
+        async def with_deadline(timeout):
+            with request_deadline(timeout):
+                return await client.get_user("test-token")
+        
+        hurried, patient, unbounded = await asyncio.gather(
+            with_deadline(0.01), with_deadline(5.0), client.get_user("test-token"), return_exceptions=True
+        )
+        
+        assert isinstance(hurried, HTTPException) and hurried.status_code == 504
+        assert patient == unbounded == {"login": "testuser"}
+        assert len(calls) == 1
+        assert calls[0].extensions["timeout"]["read"] == 10.0
+    
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_upstream(self, settings):
+        """Should fail with 504 without calling GitHub once the deadline passed"""
+        calls = []
+        transport = make_transport({"/user": lambda r: httpx.Response(200, json={"login": "testuser"})}, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        with request_deadline(0.0), pytest.raises(HTTPException) as exc_info:
+            await client.get_user("test-token")
+        
+        assert exc_info.value.status_code == 504
+        assert calls == []
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight GET requests"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_request(self, settings):
+        """Should send a single upstream request for concurrent identical calls"""
+        calls = []
+        transport = make_transport({
+            "/user": lambda r: httpx.Response(200, json={"login": "testuser"}),
+        }, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        first, second = await asyncio.gather(
+            client.get_user("test-token"),
+            client.get_user("test-token"),
+        )
+        
+        assert first == second == {"login": "testuser"}
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_different_tokens_are_not_coalesced(self, settings):
+        """Should keep requests for different tokens separate"""
+        calls = []
+        transport = make_transport({
+            "/user": lambda r: httpx.Response(200, json={"login": "testuser"}),
+        }, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        await asyncio.gather(client.get_user("token-a"), client.get_user("token-b"))
+        
+        assert len(calls) == 2
+
+
+class TestConditionalRequests:
+    """Tests for the ETag response cache"""
+    
+    @pytest.mark.asyncio
+    async def test_serves_cached_body_on_not_modified(self, settings):
+        """Should send If-None-Match and reuse the cached body on 304"""
+        calls = []
+        
+        def user_route(request):
+            if request.headers.get("If-None-Match") == '"abc"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"login": "testuser"}, headers={"ETag": '"abc"'})
+        
+        transport = make_transport({"/user": user_route}, calls)
+        client = GitHubAPIClient(
+            settings=settings,
+            http_client=httpx.AsyncClient(transport=transport),
+            response_cache=ResponseCache()
+        )
+        
+        first = await client.get_user("test-token")
+        second = await client.get_user("test-token")
+        
+        assert first == second == {"login": "testuser"}
+        assert len(calls) == 2
+        assert "If-None-Match" not in calls[0].headers
+        assert calls[1].headers["If-None-Match"] == '"abc"'
+
+
+
+class TestRepositoryPagination:
+    """Tests for paginated repository listing"""
+    
+    @pytest.mark.asyncio
+    async def test_fetches_every_page_from_link_header(self, settings):
+        """Should read the last page from the Link header and fetch the rest"""
+        calls = []
+        
+        def repos_route(request):
+            page = int(request.url.params["page"])
+            headers = {}
+            if page == 1:
+                headers["Link"] = (
+                    '<https://api.github.com/user/repos?page=2>; rel="next", '
+                    '<https://api.github.com/user/repos?page=3>; rel="last"'
+                )
+            return httpx.Response(200, json=[{"name": f"repo{page}"}], headers=headers)
+        
+        transport = make_transport({"/user/repos": repos_route}, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        repos = await client.get_repositories("test-token")
+        
+        assert [repo["name"] for repo in repos] == ["repo1", "repo2", "repo3"]
+        assert sorted(int(call.url.params["page"]) for call in calls) == [1, 2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_single_page_without_link_header(self, settings):
+        """Should stop after the first page when there is no Link header"""
+        calls = []
+        transport = make_transport({
+            "/user/repos": lambda r: httpx.Response(200, json=[{"name": "repo1"}]),
+        }, calls)
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        repos = await client.get_repositories("test-token")
+        
+        assert len(repos) == 1
+        assert len(calls) == 1
+
+
+class TestShardedPullRequestSearch:
+    """Tests for search_all_pull_requests"""
+    
+    @pytest.mark.asyncio
+    async def test_bisects_ranges_above_result_cap(self):
+        """Should split created: ranges that match more than 1000 results"""
+        settings = Settings(github_search_min_interval=0.0)
+        queries = []
+        
+        def search_route(request):
+            query = request.url.params["q"]
+            queries.append(query)
+            created = query.split("created:")[1]
+            start, end = created.split("..")
+            total = 1500 if start != end and (start, end) == ("2024-01-01", "2024-01-04") else 1
+            return httpx.Response(200, json={
+                "total_count": total,
+                "items": [{"title": created, "updated_at": end}],
+            })
+        
+        transport = make_transport({"/search/issues": search_route})
+        client = GitHubAPIClient(settings=settings, http_client=httpx.AsyncClient(transport=transport))
+        
+        items = await client.search_all_pull_requests(
+            "test-token", "testuser", since="2024-01-01T00:00:00Z", until=date(2024, 1, 4)
+        )
+        
+        assert [item["title"] for item in items] == ["2024-01-03..2024-01-04", "2024-01-01..2024-01-02"]
+        assert len(queries) == 3
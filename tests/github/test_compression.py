@@ -0,0 +1,147 @@
+import gzip
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dependencies import get_github_service, get_summary_cache
+from src.github.cache import SummaryCache
+from src.github.compression import (
+    EncodedBody,
+    ResponseEncoder,
+    body_digest,
+    choose_encoding,
+    etag_matches,
+)
+from src.main import app
+
+USER_SUMMARY = {
+    "user": {"login": "octocat", "name": "The Octocat", "followers": 10},
+    "summary": {"public_repos": 50, "public_gists": 0, "total_repositories": 50},
+    "repositories": [
+        {
+            "name": f"repo-{index}",
+            "full_name": f"octocat/repo-{index}",
+            "private": False,
+            "url": f"https://github.com/octocat/repo-{index}",
+            "stargazers_count": index,
+            "forks_count": 0,
+            "created_at": "2011-01-26T19:01:12Z",
+        }
+        for index in range(50)
+    ],
+}
+
+
+class TestEncoding:
+    """Tests for content negotiation and ETags"""
+    
+    @pytest.mark.parametrize("accept_encoding,expected", [
+        (None, None),
+        ("gzip, deflate", "gzip"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("deflate, *;q=0.5", "gzip"),
+    ])
+    def test_choose_encoding(self, accept_encoding, expected, monkeypatch):
+        """Should pick the accepted coding with the highest weight"""
+        monkeypatch.setattr("src.github.compression.SUPPORTED_ENCODINGS", ("gzip",))
+        
+        assert choose_encoding(accept_encoding) == expected
+    
+    def test_prefers_brotli_on_ties(self, monkeypatch):
+        """Should prefer brotli when it is available and accepted as much as gzip"""
+        monkeypatch.setattr("src.github.compression.SUPPORTED_ENCODINGS", ("br", "gzip"))
+        
+        assert choose_encoding("gzip, br") == "br"
+        assert choose_encoding("gzip, br;q=0.5") == "gzip"
+    
+    def test_etag_matches_every_representation(self):
+        """Should match the tag of any coding, weak tags and wildcards"""
+        body = EncodedBody(content=b"{}", digest=body_digest(b"{}"))
+        
+        assert etag_matches(body.etag(), body)
+        assert etag_matches(f'"other", W/{body.etag("gzip")}', body)
+        assert etag_matches("*", body)
+        assert not etag_matches('"other"', body)
+        assert not etag_matches(None, body)
+    
+    def test_pack_round_trip(self):
+        """Should restore the body, digest and variants from the packed bytes"""
+        content = b'{"user": "octocat"}' * 100
+        body = ResponseEncoder(min_size=0).encode(content, precompress=True)
+        
+        unpacked = EncodedBody.unpack(body.pack())
+        
+        assert unpacked == body
+        assert gzip.decompress(unpacked.encodings["gzip"]) == content
+        assert EncodedBody.unpack(content) == EncodedBody(content=content, digest=body.digest)
+    
+    def test_small_bodies_are_not_compressed(self):
+        """Should send bodies under the threshold as they are"""
+        encoder = ResponseEncoder(min_size=1024)
+        
+        response = encoder.respond(encoder.encode(b"{}", precompress=True), "gzip")
+        
+        assert response.body == b"{}"
+        assert "content-encoding" not in response.headers
+
+
+@pytest.fixture
+def client():
+    """Test client whose summaries come from a mocked service through a summary cache"""
+    github_service = AsyncMock()
+    github_service.get_user_summary.return_value = USER_SUMMARY
+    summary_cache = SummaryCache(ttl=3600)
+    app.dependency_overrides[get_github_service] = lambda: github_service
+    app.dependency_overrides[get_summary_cache] = lambda: summary_cache
+    with TestClient(app) as test_client:
+        test_client.github_service = github_service
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+class TestUserSummaryResponses:
+    """Tests for conditional and compressed /github/user-summary responses"""
+    
+    def test_compressed_response_and_revalidation(self, client):
+        """Should gzip the summary and answer a matching If-None-Match with 304"""
+        headers = {"Authorization": "Bearer token", "Accept-Encoding": "gzip"}
+        
+        first = client.get("/github/user-summary", headers=headers)
+        again = client.get("/github/user-summary", headers={**headers, "If-None-Match": first.headers["etag"]})
+        
+        assert first.status_code == 200
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.json()["user"]["login"] == "octocat"
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == first.headers["etag"]
+        assert client.github_service.get_user_summary.await_count == 1
+    
+    def test_identity_response_shares_the_digest(self, client):
+        """Should tag the uncompressed representation with the same digest"""
+        compressed = client.get("/github/user-summary", headers={"Authorization": "Bearer token"})
+        plain = client.get(
+            "/github/user-summary",
+            headers={"Authorization": "Bearer token", "Accept-Encoding": "identity"}
+        )
+        
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == compressed.json()
+        assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    
+    def test_partial_summaries_are_not_cached(self, client):
+        """Should recompute summaries that were missing sections"""
+        client.github_service.get_user_summary.return_value = {
+            **USER_SUMMARY,
+            "partial": True,
+            "errors": [{"section": "pull_requests", "status_code": 504, "detail": "Request deadline exceeded"}],
+        }
+        
+        for _ in range(2):
+            assert client.get("/github/user-summary", headers={"Authorization": "Bearer token"}).json()["partial"]
+        
+        assert client.github_service.get_user_summary.await_count == 2
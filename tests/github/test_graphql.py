@@ -0,0 +1,120 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.github.client import GitHubAPIClient
+from src.github.graphql import GitHubGraphQLService, ORGANIZATIONS_PAGE_QUERY
+
+
+def connection(nodes, total=None, end_cursor=None):
+    """Builds a GraphQL connection payload"""
+    return {
+        "totalCount": len(nodes) if total is None else total,
+        "pageInfo": {"hasNextPage": end_cursor is not None, "endCursor": end_cursor},
+        "nodes": nodes,
+    }
+
+
+@pytest.fixture
+def mock_github_client():
+    """Fixture that provides a mocked GitHub client"""
+    client = MagicMock(spec=GitHubAPIClient)
+    client.base_url = "https://api.github.com"
+    return client
+
+
+@pytest.fixture
+def graphql_service(mock_github_client):
+    """Fixture that provides a GitHubGraphQLService instance"""
+    return GitHubGraphQLService(github_client=mock_github_client)
+
+
+class TestGetAuthenticatedUser:
+    """Tests for GitHubGraphQLService.get_authenticated_user"""
+    
+    @pytest.mark.asyncio
+    async def test_builds_summary_from_single_query(self, graphql_service, mock_github_client):
+        """Should map the viewer query to the REST summary structure"""
+        viewer = {
+            "login": "testuser",
+            "name": "Test User",
+            "company": None,
+            "location": "Test Location",
+            "websiteUrl": "https://test.com",
+            "followers": {"totalCount": 100},
+            "publicRepositories": {"totalCount": 5},
+            "gists": {"totalCount": 3},
+            "repositories": connection([{
+                "name": "repo1",
+                "nameWithOwner": "testuser/repo1",
+                "isPrivate": True,
+                "description": None,
+                "url": "https://github.com/testuser/repo1",
+                "primaryLanguage": {"name": "Python"},
+                "stargazerCount": 10,
+                "forkCount": 2,
+                "createdAt": "2023-01-01T00:00:00Z",
+            }]),
+            "organizations": connection([]),
+            "pullRequests": connection([{
+                "title": "PR 1",
+                "number": 1,
+                "state": "MERGED",
+                "createdAt": "2023-01-01T00:00:00Z",
+                "repository": {"nameWithOwner": "testuser/repo1"},
+            }], total=250),
+        }
+        mock_github_client.graphql = AsyncMock(return_value={"viewer": viewer})
+        
+        result = await graphql_service.get_authenticated_user("test-token")
+        
+        assert result["user"]["blog"] == "https://test.com"
+        assert result["user"]["followers"] == 100
+        assert result["summary"]["public_repos"] == 5
+        assert result["summary"]["total_pull_requests"] == 250
+        assert result["repositories"][0]["full_name"] == "testuser/repo1"
+        assert result["repositories"][0]["language"] == "Python"
+        assert result["pull_requests"][0]["state"] == "closed"
+        assert result["pull_requests"][0]["repository_url"] == "https://api.github.com/repos/testuser/repo1"
+        mock_github_client.graphql.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_fetches_follow_up_pages_only_when_needed(self, graphql_service, mock_github_client):
+        """Should page through organizations and skip complete connections"""
+        viewer = {
+            "login": "testuser",
+            "followers": {"totalCount": 0},
+            "publicRepositories": {"totalCount": 0},
+            "gists": {"totalCount": 0},
+            "repositories": connection([]),
+            "organizations": connection([{"login": "org1", "databaseId": 1}], total=2, end_cursor="c1"),
+            "pullRequests": connection([]),
+        }
+        second_page = {"viewer": {"organizations": connection([{"login": "org2", "databaseId": 2}])}}
+        mock_github_client.graphql = AsyncMock(side_effect=[{"viewer": viewer}, second_page])
+        
+        result = await graphql_service.get_authenticated_user("test-token")
+        
+        assert [org["login"] for org in result["organizations"]] == ["org1", "org2"]
+        assert mock_github_client.graphql.call_count == 2
+        mock_github_client.graphql.assert_called_with("test-token", ORGANIZATIONS_PAGE_QUERY, {"after": "c1"})
+
+    
+    @pytest.mark.asyncio
+    async def test_skips_sections_not_requested(self, graphql_service, mock_github_client):
+        """Should disable unrequested connections and return them as None"""
+        viewer = {
+            "login": "testuser",
+            "followers": {"totalCount": 0},
+            "publicRepositories": {"totalCount": 0},
+            "gists": {"totalCount": 0},
+            "organizations": connection([{"login": "org1", "databaseId": 1}]),
+        }
+        mock_github_client.graphql = AsyncMock(return_value={"viewer": viewer})
+        
+        result = await graphql_service.get_user_summary("test-token", sections={"organizations"})
+        
+        variables = mock_github_client.graphql.call_args.args[2]
+        assert variables == {"withRepositories": False, "withOrganizations": True, "withPullRequests": False}
+        assert result["repositories"] is None
+        assert result["summary"]["total_pull_requests"] is None
+        assert result["summary"]["total_organizations"] == 1
@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.config import Settings
+from src.github.client import GitHubAPIClient, create_hedging_policy
+from src.github.hedging import HedgingPolicy
+
+
+def warmed_policy(**kwargs) -> HedgingPolicy:
+    """Hedging policy for search with enough fast samples to hedge"""
+    policy = HedgingPolicy(min_samples=5, min_delay=0.01, **kwargs)
+    for _ in range(5):
+        policy.observe("search", 0.01)
+    return policy
+
+
+class TestHedgingPolicy:
+    """Tests for HedgingPolicy"""
+    
+    def test_waits_for_samples_and_skips_other_resources(self):
+        """Should not hedge before min_samples or for resources it does not cover"""
+        policy = HedgingPolicy(min_samples=3)
+        policy.observe("search", 0.2)
+        policy.observe("core", 0.2)
+        
+        assert policy.delay("search") is None
+        assert policy.delay("core") is None
+    
+    def test_delay_follows_percentile(self):
+        """Should wait for the configured percentile of recent latencies"""
+        policy = HedgingPolicy(percentile=0.9, min_samples=10, min_delay=0.0)
+        for latency in range(1, 11):
+            policy.observe("search", latency / 10)
+        
+        assert policy.delay("search") == 1.0
+    
+    def test_budget_limits_hedges(self):
+        """Should allow one hedge per 1 / budget calls"""
+        policy = warmed_policy(budget=0.25)
+        
+        hedges = 0
+        for _ in range(8):
+            policy.delay("search")
+            hedges += policy.try_hedge()
+        
+        assert hedges == 2
+    
+    def test_disabled_by_default(self):
+        """Should only hedge when enabled in the settings"""
+        assert create_hedging_policy(Settings()) is None
+        assert create_hedging_policy(Settings(github_hedging_enabled=True)) is not None
+
+
+class TestClientHedging:
+    """Tests for hedged GitHub calls"""
+    
+    @staticmethod
+    def make_client(
+        policy: HedgingPolicy,
+        calls: list,
+        slow_call: int = 1,
+        headers: dict = None
+    ) -> GitHubAPIClient:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == slow_call:
+                await asyncio.sleep(0.2)
+            return httpx.Response(200, headers=headers, json={"total_count": len(calls), "items": []})
+        
+        return GitHubAPIClient(
+            Settings(),
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            hedging=policy,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_call(self):
+        """Should answer with the hedged call when the original one is slow"""
+        calls = []
+        client = self.make_client(warmed_policy(budget=1.0), calls)
+        
+        start = asyncio.get_running_loop().time()
+        result = await client.search_pull_requests("test-token", "testuser")
+        
+        assert asyncio.get_running_loop().time() - start < 0.2
+        assert len(calls) == 2
+        assert result["total_count"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_budget(self):
+        """Should keep waiting for the original call once the budget is spent"""
+        calls = []
+        client = self.make_client(warmed_policy(budget=0.0), calls)
+        
+        result = await client.search_pull_requests("test-token", "testuser")
+        
+        assert len(calls) == 1
+        assert result["total_count"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_hedges_within_search_rate_limit(self):
+        """Should still hedge when responses advertise the 30/minute search limit"""
+        calls = []
+        headers = {
+            "X-RateLimit-Limit": "30",
+            "X-RateLimit-Remaining": "25",
+            "X-RateLimit-Reset": str(int(time.time()) + 60),
+            "X-RateLimit-Resource": "search",
+        }
+        client = self.make_client(warmed_policy(budget=1.0), calls, slow_call=2, headers=headers)
+        
+        await client.search_pull_requests("test-token", "testuser")
+        result = await client.search_pull_requests("test-token", "testuser")
+        
+        assert len(calls) == 3
+        assert result["total_count"] == 3
@@ -0,0 +1,109 @@
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.github.ratelimit import RateLimitScheduler, RateLimitTracker
+
+
+def rate_limit_response(headers: dict, status_code: int = 200) -> httpx.Response:
+    """Builds a GitHub response carrying rate limit headers"""
+    return httpx.Response(status_code, headers={key: str(value) for key, value in headers.items()})
+
+
+class TestRateLimitTracker:
+    """Tests for RateLimitTracker"""
+    
+    def test_update_reads_rate_limit_headers(self):
+        """Should record limit, remaining and reset per resource"""
+        tracker = RateLimitTracker()
+        response = rate_limit_response({
+            "X-RateLimit-Limit": 5000,
+            "X-RateLimit-Remaining": 4999,
+            "X-RateLimit-Reset": 1700000000,
+            "X-RateLimit-Resource": "core",
+        })
+        
+        tracker.update("token", "core", response.headers, response.status_code)
+        budget = tracker.get("token", "core")
+        
+        assert budget.limit == 5000
+        assert budget.remaining == 4999
+        assert budget.reset_at == 1700000000
+    
+    def test_retry_after_on_secondary_limit(self):
+        """Should block the resource for Retry-After seconds on a 403"""
+        tracker = RateLimitTracker()
+        response = rate_limit_response({"Retry-After": 60}, status_code=403)
+        
+        budget = tracker.update("token", "search", response.headers, response.status_code)
+        
+        assert 59 <= budget.wait_time(time.time()) <= 60
+
+
+class TestRateLimitScheduler:
+    """Tests for RateLimitScheduler"""
+    
+    @pytest.mark.asyncio
+    async def test_short_circuits_exhausted_budget(self):
+        """Should fail with 429 and Retry-After when the budget resets too late"""
+        scheduler = RateLimitScheduler(max_wait=1.0)
+        response = rate_limit_response({
+            "X-RateLimit-Remaining": 0,
+            "X-RateLimit-Reset": int(time.time()) + 600,
+        })
+        scheduler.record("token", "core", response)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with scheduler.slot("token", "core"):
+                pass
+        
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) > 500
+        assert scheduler.queued("token") == 0
+    
+    @pytest.mark.asyncio
+    async def test_reserves_budget_for_each_call(self):
+        """Should decrement the remaining budget as calls are admitted"""
+        scheduler = RateLimitScheduler(pace_fraction=0)
+        response = rate_limit_response({
+            "X-RateLimit-Remaining": 10,
+            "X-RateLimit-Reset": int(time.time()) + 600,
+        })
+        scheduler.record("token", "core", response)
+        
+        async with scheduler.slot("token", "core"):
+            assert scheduler.queued("token") == 1
+        
+        assert scheduler.tracker.get("token", "core").remaining == 9
+    
+    @pytest.mark.asyncio
+    async def test_search_sized_budget_is_not_paced(self, monkeypatch):
+        """Should only pace a 30/minute budget once it runs low relative to its limit"""
+        slept = []
+        
+        async def fake_sleep(delay):
+            slept.append(delay)
+        
+        monkeypatch.setattr("src.github.ratelimit.asyncio.sleep", fake_sleep)
+        scheduler = RateLimitScheduler()
+        response = rate_limit_response({
+            "X-RateLimit-Limit": 30,
+            "X-RateLimit-Remaining": 28,
+            "X-RateLimit-Reset": int(time.time()) + 58,
+            "X-RateLimit-Resource": "search",
+        })
+        scheduler.record("token", "search", response)
+        
+        for _ in range(3):
+            async with scheduler.slot("token", "search"):
+                pass
+        assert slept == []
+        assert scheduler.has_headroom("token", "search")
+        
+        scheduler.tracker.get("token", "search").remaining = 2
+        async with scheduler.slot("token", "search"):
+            pass
+        assert len(slept) == 1 and 0 < slept[0] <= 5.0
+        assert not scheduler.has_headroom("token", "search")
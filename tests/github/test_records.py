@@ -0,0 +1,88 @@
+import json
+import pytest
+from src.github.records import (
+    OrganizationRecord,
+    PullRequestRecord,
+    RepositoryRecord,
+    decode_organizations,
+    decode_pull_request_search,
+    decode_repositories,
+)
+from src.github.service import GitHubService
+
+
+REPOSITORY = {
+    "id": 1,
+    "name": "repo1",
+    "full_name": "user/repo1",
+    "private": True,
+    "html_url": "https://github.com/user/repo1",
+    "language": None,
+    "stargazers_count": 3,
+    "created_at": "2023-01-01T00:00:00Z",
+    "owner": {"login": "user", "id": 7, "html_url": "https://github.com/user"},
+    "permissions": {"admin": True, "push": True, "pull": True},
+    "topics": ["python"],
+}
+
+
+class TestDecoders:
+    """Tests for the record decoders"""
+    
+    def test_decode_repositories_keeps_used_fields(self):
+        """Should turn each repository into a record and drop unused nested objects"""
+        page = decode_repositories(json.dumps([REPOSITORY]).encode())
+        
+        repo = page[0]
+        assert isinstance(repo, RepositoryRecord)
+        assert repo.get("full_name") == "user/repo1"
+        assert repo["stargazers_count"] == 3
+        assert repo.get("language") is None
+        assert repo.get("forks_count", 0) == 0
+        assert repo.get("owner") is None
+        assert "permissions" not in repo
+        with pytest.raises(KeyError):
+            repo["topics"]
+    
+    def test_decode_pull_request_search_keeps_envelope(self):
+        """Should keep the search envelope as a dict and convert only its items"""
+        body = {
+            "total_count": 1,
+            "incomplete_results": False,
+            "items": [{
+                "title": "PR 1",
+                "number": 1,
+                "state": "open",
+                "repository_url": "https://api.github.com/repos/user/repo1",
+                "user": {"login": "user"},
+                "pull_request": {"url": "https://api.github.com/repos/user/repo1/pulls/1"},
+            }],
+        }
+        
+        result = decode_pull_request_search(json.dumps(body).encode())
+        
+        assert result["total_count"] == 1
+        assert isinstance(result["items"][0], PullRequestRecord)
+        assert result["items"][0].to_dict() == {
+            "title": "PR 1",
+            "number": 1,
+            "state": "open",
+            "repository_url": "https://api.github.com/repos/user/repo1",
+        }
+    
+    def test_decode_organizations(self):
+        """Should turn each organization into a record"""
+        orgs = decode_organizations(b'[{"login": "org1", "id": 2, "repos_url": "x"}]')
+        
+        assert orgs == [OrganizationRecord(login="org1", id=2)]
+
+
+class TestRecordsInService:
+    """Records must be processed exactly like dicts"""
+    
+    def test_process_repository_record(self):
+        """Should produce the same output for a record and the original dict"""
+        service = GitHubService(github_client=None)
+        record = decode_repositories(json.dumps([REPOSITORY]).encode())[0]
+        
+        assert service._process_repository(record) == service._process_repository(REPOSITORY)
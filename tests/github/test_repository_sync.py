@@ -0,0 +1,72 @@
+import httpx
+import pytest
+
+from src.config import Settings
+from src.github.client import GitHubAPIClient
+from src.github.repository_sync import RepositorySync
+
+
+def make_repo(repo_id: int, updated_at: str) -> dict:
+    return {"id": repo_id, "name": f"repo{repo_id}", "full_name": f"user/repo{repo_id}", "updated_at": updated_at}
+
+
+class FakeRepositories:
+    """Serves /user/repos in update order, two repositories per page"""
+    
+    def __init__(self, repos: list):
+        self.repos = repos
+        self.pages = []
+    
+    def sorted_repos(self) -> list:
+        return sorted(self.repos, key=lambda repo: repo["updated_at"], reverse=True)
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.pages.append(page)
+        repos = self.sorted_repos()
+        last_page = max((len(repos) + 1) // 2, 1)
+        headers = {"Link": f'<https://api.github.com/user/repos?page={last_page}>; rel="last"'}
+        return httpx.Response(200, json=repos[(page - 1) * 2:page * 2], headers=headers)
+
+
+def make_client(fake: FakeRepositories) -> GitHubAPIClient:
+    return GitHubAPIClient(Settings(), http_client=httpx.AsyncClient(transport=httpx.MockTransport(fake.handler)))
+
+
+class TestRepositorySync:
+    """Tests for incremental repository listing"""
+    
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stops_at_high_water_mark(self):
+        """Should only fetch the pages with updated repositories and merge them"""
+        fake = FakeRepositories([make_repo(number, f"2024-01-0{number}T00:00:00Z") for number in range(1, 8)])
+        client = make_client(fake)
+        sync = RepositorySync()
+        
+        first = await sync.get_repositories(client, "test-token")
+        assert [repo["id"] for repo in first] == [7, 6, 5, 4, 3, 2, 1]
+        assert fake.pages == [1, 2, 3, 4]
+        
+        fake.pages.clear()
+        fake.repos[0] = make_repo(1, "2024-02-01T00:00:00Z")
+        fake.repos.append(make_repo(8, "2024-02-02T00:00:00Z"))
+        
+        second = await sync.get_repositories(client, "test-token")
+        
+        assert [repo["id"] for repo in second] == [8, 1, 7, 6, 5, 4, 3, 2]
+        assert fake.pages == [1, 2]
+        assert (sync.full_syncs, sync.incremental_syncs) == (1, 1)
+    
+    @pytest.mark.asyncio
+    async def test_full_reconciliation_drops_deleted_repositories(self):
+        """Should list everything again once the reconciliation interval passed"""
+        fake = FakeRepositories([make_repo(1, "2024-01-01T00:00:00Z"), make_repo(2, "2024-01-02T00:00:00Z")])
+        client = make_client(fake)
+        sync = RepositorySync(full_sync_interval=0)
+        await sync.get_repositories(client, "test-token")
+        
+        del fake.repos[1]
+        repositories = await sync.get_repositories(client, "test-token")
+        
+        assert [repo["id"] for repo in repositories] == [1]
+        assert sync.full_syncs == 2
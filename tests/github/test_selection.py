@@ -0,0 +1,77 @@
+import pytest
+from src.github.schemas import GitHubUserResponse
+from src.github.selection import SECTIONS, SummarySelection
+from src.github.streaming import encode_summary, project_summary
+
+
+class TestSummarySelection:
+    """Tests for SummarySelection"""
+    
+    def test_defaults_to_every_section(self):
+        """Should fetch every section when nothing is requested"""
+        selection = SummarySelection.parse()
+        
+        assert selection.sections == frozenset(SECTIONS)
+        assert selection.include_spec() == {
+            "user": True,
+            "summary": True,
+            "repositories": True,
+            "organizations": True,
+            "pull_requests": True,
+            "partial": True,
+            "errors": True,
+        }
+    
+    def test_include_and_exclude(self):
+        """Should apply include first and then exclude"""
+        selection = SummarySelection.parse(include="repositories,pull_requests", exclude="pull_requests")
+        
+        assert selection.sections == {"repositories"}
+        assert selection.cache_key == "repositories"
+        assert "organizations" not in selection.include_spec()
+    
+    def test_projects_fields(self):
+        """Should keep only the requested fields of each section"""
+        selection = SummarySelection.parse(fields="user.login,repositories.name,repositories.url")
+        
+        spec = selection.include_spec()
+        
+        assert spec["user"] == {"login"}
+        assert spec["repositories"] == {"__all__": {"name", "url"}}
+        assert spec["organizations"] is True
+    
+    @pytest.mark.parametrize("kwargs", [
+        {"include": "gists"},
+        {"exclude": "user"},
+        {"fields": "repositories.owner"},
+        {"fields": "login"},
+    ])
+    def test_rejects_unknown_names(self, kwargs):
+        """Should raise ValueError for unknown sections or fields"""
+        with pytest.raises(ValueError):
+            SummarySelection.parse(**kwargs)
+
+
+class TestProjectSummary:
+    """Tests for projecting fields out of a serialized summary"""
+    
+    def test_matches_encoding_the_model(self):
+        """Should produce the same bytes as serializing the validated summary with the selection"""
+        summary = GitHubUserResponse.model_validate({
+            "user": {"login": "octocat", "name": "Zoë", "followers": 1},
+            "summary": {"public_repos": 1, "public_gists": 0, "total_repositories": 1},
+            "repositories": [{
+                "name": "Hello-World", "full_name": "octocat/Hello-World", "private": False,
+                "url": "https://github.com/octocat/Hello-World", "stargazers_count": 0, "forks_count": 0,
+                "created_at": "2011-01-26T19:01:12Z",
+            }],
+            "errors": [{"section": "organizations", "status_code": 504, "detail": "Deadline exceeded"}],
+        })
+        selection = SummarySelection.parse(
+            include="repositories,organizations",
+            fields="user.name,summary.public_repos,repositories.name,repositories.created_at",
+        )
+        
+        content = encode_summary(summary, selection.sections_only())
+        
+        assert project_summary(content, selection) == encode_summary(summary, selection)
@@ -1,9 +1,20 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from src.deadline import request_deadline
 from src.github.service import GitHubService
 from src.github.client import GitHubAPIClient
 
 
+def async_iter(items):
+    """Wraps a list in an async iterator like the client's paginated methods"""
+    async def iterator():
+        for item in items:
+            yield item
+    return iterator()
+
+
 @pytest.fixture
 def mock_github_client():
     """Fixture that provides a mocked GitHub client"""
@@ -139,35 +150,98 @@ class TestGetUserPullRequests:
         """Should successfully get user pull requests"""
         token = "test-token"
         mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
-        mock_github_client.get_pull_requests = AsyncMock(return_value=[{"title": "PR 1"}])
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 1, "items": [{"title": "PR 1"}]}
+        )
         
         result = await github_service._get_user_pull_requests(token)
         
-        assert len(result) == 1
-        assert result[0]["title"] == "PR 1"
+        assert len(result["items"]) == 1
+        assert result["items"][0]["title"] == "PR 1"
+        assert result["total_count"] == 1
         mock_github_client.get_user.assert_called_once_with(token)
-        mock_github_client.get_pull_requests.assert_called_once_with(token, "testuser")
+        mock_github_client.search_pull_requests.assert_called_once_with(token, "testuser")
+    
+    @pytest.mark.asyncio
+    async def test_get_user_pull_requests_uses_total_count(self, github_service, mock_github_client):
+        """Should report the search total_count rather than the number of items"""
+        token = "test-token"
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 2500, "items": [{"title": "PR 1"}]}
+        )
+        mock_github_client.search_all_pull_requests = AsyncMock()
+        
+        result = await github_service._get_user_pull_requests(token)
+        
+        assert result["total_count"] == 2500
+        assert len(result["items"]) == 1
+        mock_github_client.search_all_pull_requests.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_get_user_pull_requests_sharded(self, mock_github_client):
+        """Should fetch every pull request when sharded search is enabled"""
+        token = "test-token"
+        service = GitHubService(github_client=mock_github_client, shard_pull_request_search=True)
+        mock_github_client.get_user = AsyncMock(
+            return_value={"login": "testuser", "created_at": "2015-01-01T00:00:00Z"}
+        )
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 3, "items": [{"title": "PR 1"}]}
+        )
+        mock_github_client.search_all_pull_requests = AsyncMock(
+            return_value=[{"title": "PR 1"}, {"title": "PR 2"}, {"title": "PR 3"}]
+        )
+        
+        result = await service._get_user_pull_requests(token)
+        
+        assert result["total_count"] == 3
+        assert len(result["items"]) == 3
+        mock_github_client.search_all_pull_requests.assert_called_once_with(
+            token, "testuser", since="2015-01-01T00:00:00Z"
+        )
     
     @pytest.mark.asyncio
     async def test_get_user_pull_requests_no_login(self, github_service, mock_github_client):
-        """Should return empty list if no login exists"""
+        """Should return an empty result if no login exists"""
         token = "test-token"
         mock_github_client.get_user = AsyncMock(return_value={})
         
         result = await github_service._get_user_pull_requests(token)
         
-        assert result == []
+        assert result == {"total_count": 0, "items": []}
         mock_github_client.get_user.assert_called_once_with(token)
     
     @pytest.mark.asyncio
     async def test_get_user_pull_requests_exception(self, github_service, mock_github_client):
-        """Should return empty list if an exception occurs"""
+        """Should return an empty result if an exception occurs"""
         token = "test-token"
         mock_github_client.get_user = AsyncMock(side_effect=Exception("API Error"))
         
         result = await github_service._get_user_pull_requests(token)
         
-        assert result == []
+        assert result == {"total_count": 0, "items": []}
+
+
+class TestGetUserPullRequestsChained:
+    """Tests for _get_user_pull_requests with a shared user fetch"""
+    
+    @pytest.mark.asyncio
+    async def test_reuses_user_future(self, github_service, mock_github_client):
+        """Should read the login from the given future instead of calling get_user"""
+        token = "test-token"
+        mock_github_client.get_user = AsyncMock()
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 1, "items": [{"title": "PR 1"}]}
+        )
+        user_future = asyncio.get_running_loop().create_future()
+        user_future.set_result({"login": "testuser"})
+        
+        result = await github_service._get_user_pull_requests(token, user_future)
+        
+        assert len(result["items"]) == 1
+        mock_github_client.get_user.assert_not_called()
+        mock_github_client.search_pull_requests.assert_called_once_with(token, "testuser")
 
 
 class TestGetAuthenticatedUser:
@@ -192,9 +266,11 @@ class TestGetAuthenticatedUser:
         prs = [{"title": "PR 1", "number": 1}]
         
         mock_github_client.get_user = AsyncMock(return_value=user_data)
-        mock_github_client.get_repositories = AsyncMock(return_value=repos)
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter(repos))
         mock_github_client.get_organizations = AsyncMock(return_value=orgs)
-        mock_github_client.get_pull_requests = AsyncMock(return_value=prs)
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": len(prs), "items": prs}
+        )
         
         result = await github_service.get_authenticated_user(token)
         
@@ -208,6 +284,7 @@ class TestGetAuthenticatedUser:
         assert len(result["repositories"]) == 1
         assert len(result["organizations"]) == 1
         assert len(result["pull_requests"]) == 1
+        mock_github_client.get_user.assert_called_once_with(token)
     
     @pytest.mark.asyncio
     async def test_get_authenticated_user_with_partial_errors(
@@ -224,9 +301,11 @@ class TestGetAuthenticatedUser:
         }
         
         mock_github_client.get_user = AsyncMock(return_value=user_data)
-        mock_github_client.get_repositories = AsyncMock(side_effect=Exception("Repos error"))
+        mock_github_client.iter_repositories = MagicMock(side_effect=Exception("Repos error"))
         mock_github_client.get_organizations = AsyncMock(side_effect=Exception("Orgs error"))
-        mock_github_client.get_pull_requests = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 0, "items": []}
+        )
         
 
         result = await github_service.get_authenticated_user(token)
@@ -246,12 +325,192 @@ class TestGetAuthenticatedUser:
         token = "test-token"
         
         mock_github_client.get_user = AsyncMock(side_effect=Exception("User error"))
-        mock_github_client.get_repositories = AsyncMock(return_value=[])
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter([]))
         mock_github_client.get_organizations = AsyncMock(return_value=[])
-        mock_github_client.get_pull_requests = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 0, "items": []}
+        )
         
         with pytest.raises(Exception) as exc_info:
             await github_service.get_authenticated_user(token)
         
         assert str(exc_info.value) == "User error"
+    
+    @pytest.mark.asyncio
+    async def test_get_user_summary_only_requested_sections(self, github_service, mock_github_client):
+        """Should skip the upstream calls of sections that were not requested"""
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser", "followers": 1})
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter([{"name": "repo1"}]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock()
+        
+        result = await github_service.get_user_summary("test-token", sections={"repositories"})
+        
+        mock_github_client.get_organizations.assert_not_called()
+        mock_github_client.search_pull_requests.assert_not_called()
+        assert len(result["repositories"]) == 1
+        assert result["organizations"] is None
+        assert result["pull_requests"] is None
+        assert result["summary"]["total_repositories"] == 1
+        assert result["summary"]["total_organizations"] is None
+    
+    @pytest.mark.asyncio
+    async def test_get_user_summary_lists_failed_sections(self, github_service, mock_github_client):
+        """Should name failed sections in errors and mark the summary as partial"""
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter([]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(
+            side_effect=HTTPException(status_code=403, detail="Forbidden - Insufficient token permissions")
+        )
+        
+        result = await github_service.get_user_summary("test-token")
+        
+        assert result["partial"] is True
+        assert result["errors"] == [{
+            "section": "pull_requests",
+            "status_code": 403,
+            "detail": "Forbidden - Insufficient token permissions",
+        }]
+        assert result["summary"]["total_pull_requests"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_user_summary_cancels_sections_past_deadline(self, github_service, mock_github_client):
+        """Should return the sections that completed before the deadline"""
+        cancelled = asyncio.Event()
+        
+        async def slow_organizations(token):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter([{"name": "repo1"}]))
+        mock_github_client.get_organizations = slow_organizations
+        mock_github_client.search_pull_requests = AsyncMock(return_value={"total_count": 0, "items": []})
+        
+        with request_deadline(0.05):
+            result = await github_service.get_user_summary("test-token")
+        
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert len(result["repositories"]) == 1
+        assert result["organizations"] == []
+        assert result["partial"] is True
+        assert [error["section"] for error in result["errors"]] == ["organizations"]
+        assert result["errors"][0]["status_code"] == 504
+    
+    @pytest.mark.asyncio
+    async def test_get_user_summary_user_past_deadline(self, github_service, mock_github_client):
+        """Should fail with 504 when the user itself misses the deadline"""
+        async def slow_user(token):
+            await asyncio.sleep(10)
+        
+        mock_github_client.get_user = slow_user
+        mock_github_client.iter_repositories = MagicMock(return_value=async_iter([]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        
+        with request_deadline(0.05), pytest.raises(HTTPException) as exc_info:
+            await github_service.get_user_summary("test-token", sections={"organizations"})
+        
+        assert exc_info.value.status_code == 504
+
 
+
+class TestStreamAuthenticatedUser:
+    """Tests for stream_authenticated_user"""
+    
+    @pytest.mark.asyncio
+    async def test_streams_every_section_then_summary(self, github_service, mock_github_client):
+        """Should yield each section as it resolves and finish with the summary"""
+        token = "test-token"
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser", "public_repos": 2})
+        mock_github_client.iter_repository_pages = MagicMock(return_value=async_iter([
+            [{"name": "repo1"}],
+            [{"name": "repo2"}],
+        ]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[{"login": "testorg", "id": 1}])
+        mock_github_client.search_pull_requests = AsyncMock(
+            return_value={"total_count": 7, "items": [{"title": "PR 1"}]}
+        )
+        
+        events = [item async for item in github_service.stream_authenticated_user(token)]
+        
+        names = [event for event, _ in events]
+        assert names.count("repositories") == 2
+        assert set(names) == {"user", "repositories", "organizations", "pull_requests", "summary"}
+        assert names[-1] == "summary"
+        assert events[-1][1]["total_repositories"] == 2
+        assert events[-1][1]["total_pull_requests"] == 7
+        mock_github_client.get_user.assert_called_once_with(token)
+    
+    @pytest.mark.asyncio
+    async def test_reports_failed_sections(self, github_service, mock_github_client):
+        """Should emit an error event for a failed section and keep streaming"""
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.iter_repository_pages = MagicMock(return_value=async_iter([]))
+        mock_github_client.get_organizations = AsyncMock(
+            side_effect=HTTPException(status_code=504, detail="Timeout connecting to external service")
+        )
+        mock_github_client.search_pull_requests = AsyncMock(return_value={"total_count": 0, "items": []})
+        
+        events = dict([item async for item in github_service.stream_authenticated_user("test-token")])
+        
+        assert events["error"] == {
+            "section": "organizations",
+            "status_code": 504,
+            "detail": "Timeout connecting to external service",
+        }
+        assert events["summary"]["total_organizations"] is None
+    
+    @pytest.mark.asyncio
+    async def test_reports_failed_pull_request_search(self, github_service, mock_github_client):
+        """Should emit an error event instead of an empty pull request list"""
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.iter_repository_pages = MagicMock(return_value=async_iter([]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(
+            side_effect=HTTPException(status_code=503, detail="Service unavailable")
+        )
+        
+        events = [item async for item in github_service.stream_authenticated_user("test-token")]
+        
+        names = [event for event, _ in events]
+        assert "pull_requests" not in names
+        assert ("error", {"section": "pull_requests", "status_code": 503, "detail": "Service unavailable"}) in events
+        assert events[-1][1]["total_pull_requests"] is None
+    
+    @pytest.mark.asyncio
+    async def test_failed_section_total_is_none(self, github_service, mock_github_client):
+        """Should not report the pages sent before a failure as the section total"""
+        async def failing_pages():
+            yield [{"name": "repo1"}]
+            raise HTTPException(status_code=502, detail="Bad gateway")
+        
+        mock_github_client.get_user = AsyncMock(return_value={"login": "testuser"})
+        mock_github_client.iter_repository_pages = MagicMock(return_value=failing_pages())
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(return_value={"total_count": 0, "items": []})
+        
+        events = [item async for item in github_service.stream_authenticated_user("test-token")]
+        
+        assert ("error", {"section": "repositories", "status_code": 502, "detail": "Bad gateway"}) in events
+        assert events[-1][0] == "summary"
+        assert events[-1][1]["total_repositories"] is None
+        assert events[-1][1]["total_organizations"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stops_after_user_error(self, github_service, mock_github_client):
+        """Should end the stream without a summary if the user cannot be fetched"""
+        mock_github_client.get_user = AsyncMock(side_effect=HTTPException(status_code=401, detail="Unauthorized"))
+        mock_github_client.iter_repository_pages = MagicMock(return_value=async_iter([]))
+        mock_github_client.get_organizations = AsyncMock(return_value=[])
+        mock_github_client.search_pull_requests = AsyncMock(return_value={"total_count": 0, "items": []})
+        
+        events = [item async for item in github_service.stream_authenticated_user("test-token")]
+        
+        assert [item for item in events if item[0] == "error"] == [
+            ("error", {"section": "user", "status_code": 401, "detail": "Unauthorized"})
+        ]
+        assert "summary" not in [event for event, _ in events]
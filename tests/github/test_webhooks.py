@@ -0,0 +1,185 @@
+import gzip
+import hashlib
+import hmac
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import Settings, get_settings
+from src.dependencies import get_summary_cache
+from src.github.cache import SummaryCache
+from src.github.compression import EncodedBody, ResponseEncoder
+from src.github.schemas import GitHubUserResponse
+from src.github.streaming import encode_summary
+from src.github.webhooks import summary_tags, verify_signature
+from src.main import app
+
+FIXTURES = Path(__file__).parent / "fixtures" / "webhooks"
+SECRET = "It's a Secret to Everybody"
+
+CACHED_SUMMARY = {
+    "user": {"login": "octocat", "name": "The Octocat", "followers": 10},
+    "summary": {
+        "public_repos": 1,
+        "public_gists": 0,
+        "total_repositories": 2,
+        "total_organizations": 1,
+        "total_pull_requests": 1,
+    },
+    "repositories": [
+        {"name": "Spoon-Knife", "full_name": "octocat/Spoon-Knife", "private": False,
+         "url": "https://github.com/octocat/Spoon-Knife", "stargazers_count": 0, "forks_count": 0,
+         "created_at": "2011-01-27T19:30:43Z"},
+        {"name": "Hello-World", "full_name": "octocat/Hello-World", "private": True,
+         "url": "https://github.com/octocat/Hello-World", "stargazers_count": 0, "forks_count": 0,
+         "created_at": "2011-01-26T19:01:12Z"},
+    ],
+    "organizations": [{"login": "github", "id": 9919, "avatar_url": "https://avatars.githubusercontent.com/u/9919"}],
+    "pull_requests": [{
+        "title": "Amazing new feature",
+        "number": 1347,
+        "state": "open",
+        "repository_url": "https://api.github.com/repos/octocat/Hello-World",
+        "created_at": "2024-05-01T10:00:00Z",
+    }],
+}
+
+
+def sign(body: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+
+@pytest.fixture
+def summary_cache():
+    """Summary cache holding one tagged summary of octocat"""
+    cache = SummaryCache(ttl=3600)
+    summary = GitHubUserResponse.model_validate(CACHED_SUMMARY)
+    cache.set("token:all", ResponseEncoder(min_size=0).encode(encode_summary(summary), precompress=True).pack())
+    cache.tag("token:all", summary_tags(summary))
+    return cache
+
+
+@pytest.fixture
+def client(summary_cache):
+    """Test client with webhooks enabled and the summary cache above"""
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        github_webhook_secret=SECRET, response_compression_min_size=0
+    )
+    app.dependency_overrides[get_summary_cache] = lambda: summary_cache
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def replay(client: TestClient, event: str, fixture: str):
+    """Posts a recorded delivery with a valid signature"""
+    body = (FIXTURES / fixture).read_bytes()
+    return client.post("/github/webhooks", content=body, headers={
+        "X-GitHub-Event": event,
+        "X-Hub-Signature-256": sign(body),
+        "Content-Type": "application/json",
+    })
+
+
+def cached(summary_cache: SummaryCache) -> dict:
+    entry = summary_cache.backend.get("token:all")
+    if entry is None:
+        return None
+    body = EncodedBody.unpack(entry[1])
+    # The precompressed variant must follow the patches
+    assert gzip.decompress(body.encodings["gzip"]) == body.content
+    return json.loads(body.content)
+
+
+class TestVerifySignature:
+    """Tests for verify_signature"""
+    
+    def test_matches_github_example(self):
+        """Should accept the example signature from the GitHub documentation"""
+        signature = "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+        
+        assert verify_signature(SECRET, b"Hello, World!", signature)
+        assert not verify_signature(SECRET, b"Hello, World?", signature)
+        assert not verify_signature(SECRET, b"Hello, World!", None)
+
+
+class TestWebhookEndpoint:
+    """Tests for POST /github/webhooks with recorded deliveries"""
+    
+    def test_rejects_bad_signature(self, client):
+        """Should refuse deliveries that are not signed with the secret"""
+        response = client.post("/github/webhooks", content=b"{}", headers={
+            "X-GitHub-Event": "ping",
+            "X-Hub-Signature-256": "sha256=" + "0" * 64,
+        })
+        
+        assert response.status_code == 401
+    
+    @pytest.mark.parametrize("event", ["pull_request", "repository", "membership"])
+    def test_rejects_malformed_payload(self, client, summary_cache, event):
+        """Should answer 400 to a signed delivery that lacks the fields of its event"""
+        body = json.dumps({"action": "opened"}).encode()
+        response = client.post("/github/webhooks", content=body, headers={
+            "X-GitHub-Event": event,
+            "X-Hub-Signature-256": sign(body),
+        })
+        
+        assert response.status_code == 400
+        assert cached(summary_cache) is not None
+    
+    def test_ping(self, client, summary_cache):
+        """Should acknowledge events that do not affect summaries"""
+        response = replay(client, "ping", "ping.json")
+        
+        assert response.status_code == 200
+        assert response.json() == {"event": "ping", "action": None, "patched": 0, "invalidated": 0}
+        assert cached(summary_cache) is not None
+    
+    def test_repository_events_patch_the_owner_summary(self, client, summary_cache):
+        """Should update the repository list and counters in place"""
+        assert replay(client, "repository", "repository_publicized.json").json()["patched"] == 1
+        summary = cached(summary_cache)
+        assert summary["repositories"][0]["full_name"] == "octocat/Hello-World"
+        assert summary["repositories"][0]["private"] is False
+        assert summary["summary"]["public_repos"] == 2
+        
+        replay(client, "repository", "repository_renamed.json")
+        summary = cached(summary_cache)
+        assert [repo["name"] for repo in summary["repositories"]] == ["Hello-Universe", "Spoon-Knife"]
+        assert summary["repositories"][0]["description"] == "Renamed"
+        
+        replay(client, "repository", "repository_deleted.json")
+        summary = cached(summary_cache)
+        assert [repo["name"] for repo in summary["repositories"]] == ["Hello-Universe", "Spoon-Knife"]
+    
+    def test_deleted_repository_is_removed(self, client, summary_cache):
+        """Should drop a deleted repository and its counts"""
+        replay(client, "repository", "repository_deleted.json")
+        
+        summary = cached(summary_cache)
+        assert [repo["name"] for repo in summary["repositories"]] == ["Spoon-Knife"]
+        assert summary["summary"]["total_repositories"] == 1
+        assert summary["summary"]["public_repos"] == 0
+    
+    def test_pull_request_events_patch_the_author_summary(self, client, summary_cache):
+        """Should add opened pull requests and update closed ones"""
+        replay(client, "pull_request", "pull_request_opened.json")
+        replay(client, "pull_request", "pull_request_closed.json")
+        
+        summary = cached(summary_cache)
+        assert [(pr["number"], pr["state"]) for pr in summary["pull_requests"]] == [(1348, "open"), (1347, "closed")]
+        assert summary["summary"]["total_pull_requests"] == 2
+    
+    @pytest.mark.parametrize("event,fixture", [
+        ("organization", "organization_member_added.json"),
+        ("membership", "membership_added.json"),
+    ])
+    def test_membership_changes_invalidate(self, client, summary_cache, event, fixture):
+        """Should drop summaries whose repository access may have changed"""
+        response = replay(client, event, fixture)
+        
+        assert response.json()["invalidated"] == 1
+        assert cached(summary_cache) is None
+        assert summary_cache.keys_for("user:octocat") == []
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.admission import AdmissionControlMiddleware, AdmissionController, AdmissionRejected
+
+
+async def hold(controller: AdmissionController, release: asyncio.Event, token_key=None) -> None:
+    """Keeps a slot of the controller until ``release`` is set"""
+    async with controller.admit(token_key):
+        await release.wait()
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController"""
+    
+    @pytest.mark.asyncio
+    async def test_rejects_token_over_its_limit(self):
+        """Should shed a token's extra requests with 429"""
+        controller = AdmissionController(max_in_flight=10, per_token_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(controller, release, "token-a"))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit("token-a"):
+                pass
+        async with controller.admit("token-b"):
+            pass
+        
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+        release.set()
+        await holder
+    
+    @pytest.mark.asyncio
+    async def test_queues_then_sheds(self):
+        """Should queue up to max_queue requests and shed the rest with 503"""
+        controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(controller, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(hold(controller, release))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit():
+                pass
+        
+        assert exc_info.value.reason == "queue_full"
+        assert (controller.in_flight, controller.queued) == (1, 1)
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert (controller.in_flight, controller.queued) == (0, 0)
+    
+    @pytest.mark.asyncio
+    async def test_sheds_after_queue_timeout(self):
+        """Should give up on a queued request once its queue time is over"""
+        controller = AdmissionController(max_in_flight=1, queue_timeout=0.01)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(controller, release))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            async with controller.admit():
+                pass
+        
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.reason == "queue_timeout"
+        release.set()
+        await holder
+
+
+class TestAdmissionControlMiddleware:
+    """Tests for the admission control middleware"""
+    
+    def test_sheds_with_retry_after(self):
+        """Should answer shed requests with their status, detail and Retry-After"""
+        app = FastAPI()
+        app.add_middleware(AdmissionControlMiddleware)
+        app.state.admission_controller = AdmissionController(paths=["/limited"], per_token_limit=0)
+        
+        @app.get("/limited")
+        async def limited():
+            return {"ok": True}
+        
+        @app.get("/open")
+        async def open_route():
+            return {"ok": True}
+        
+        client = TestClient(app)
+        shed = client.get("/limited", headers={"Authorization": "Bearer test-token"})
+        
+        assert shed.status_code == 429
+        assert shed.headers["Retry-After"] == "1"
+        assert shed.json() == {"detail": "Too many concurrent requests for this token"}
+        assert client.get("/limited").status_code == 200
+        assert client.get("/open", headers={"Authorization": "Bearer test-token"}).status_code == 200
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from src.deadline import current_deadline, remaining_time, request_deadline, upstream_timeout
+
+
+class TestRequestDeadline:
+    """Tests for the request deadline context"""
+    
+    def test_no_deadline_by_default(self):
+        """Should leave upstream timeouts unchanged outside a deadline"""
+        assert current_deadline() is None
+        assert remaining_time() is None
+        assert upstream_timeout(10.0) == 10.0
+    
+    def test_caps_upstream_timeouts(self):
+        """Should size upstream timeouts from the time left"""
+        with request_deadline(2.0) as deadline:
+            assert current_deadline() is deadline
+            assert 1.9 < upstream_timeout(10.0) <= 2.0
+            assert upstream_timeout(0.5) == 0.5
+        
+        assert current_deadline() is None
+    
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_the_deadline(self):
+        """Should be visible from tasks created inside the block"""
+        async def read_deadline():
+            return current_deadline()
+        
+        with request_deadline(5.0) as deadline:
+            seen = await asyncio.ensure_future(read_deadline())
+        
+        assert seen is deadline
+    
+    def test_expired_deadline(self):
+        """Should report no time left once the deadline has passed"""
+        with request_deadline(0.0) as deadline:
+            assert deadline.expired()
+            assert upstream_timeout(10.0) == 0.0
@@ -0,0 +1,84 @@
+import httpx
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+
+from src.config import get_settings, reload_settings
+from src.dependencies import get_github_client, get_github_service
+from src.main import app, reload_app_settings
+
+
+def resolve_service(request, http_client=None):
+    """Resolves get_github_service the way FastAPI would, with the app.state dependencies"""
+    state = request.app.state
+    github_client = get_github_client(
+        request,
+        settings=get_settings(),
+        http_client=http_client or state.http_client,
+        response_cache=state.response_cache,
+        rate_limiter=state.rate_limiter,
+        circuit_breakers=state.circuit_breakers,
+        hedging=state.hedging_policy,
+    )
+    return get_github_service(
+        request,
+        github_client=github_client,
+        settings=get_settings(),
+        repository_sync=state.repository_sync,
+    )
+
+
+class TestSettings:
+    """Tests for the cached settings"""
+    
+    def test_get_settings_is_cached(self):
+        """Should read the configuration once and reuse it"""
+        assert get_settings() is get_settings()
+    
+    def test_reload_settings(self, monkeypatch):
+        """Should read the environment again on reload"""
+        previous = get_settings()
+        monkeypatch.setenv("GITHUB_PAGINATION_CONCURRENCY", "7")
+        try:
+            reloaded = reload_settings()
+            assert reloaded is not previous
+            assert reloaded.github_pagination_concurrency == 7
+            assert get_settings() is reloaded
+        finally:
+            monkeypatch.delenv("GITHUB_PAGINATION_CONCURRENCY")
+            reload_settings()
+
+
+class TestSharedService:
+    """Tests for the client and service created in the lifespan"""
+    
+    def test_reuses_lifespan_service(self):
+        """Should return the same client and service for every request"""
+        with TestClient(app):
+            request = SimpleNamespace(app=app)
+            service = resolve_service(request)
+            
+            assert service is app.state.github_service
+            assert resolve_service(request) is service
+    
+    def test_overridden_dependency_builds_new_client(self):
+        """Should not reuse the shared client when one of its dependencies is replaced"""
+        with TestClient(app):
+            request = SimpleNamespace(app=app)
+            other_http_client = httpx.AsyncClient()
+            
+            service = resolve_service(request, http_client=other_http_client)
+            
+            assert service is not app.state.github_service
+            assert service.github_client.http_client is other_http_client
+    
+    def test_reload_app_settings(self):
+        """Should rebuild the shared service from the reloaded settings"""
+        with TestClient(app):
+            previous = app.state.github_service
+            
+            settings = reload_app_settings(app)
+            
+            assert app.state.settings is settings
+            assert app.state.github_service is not previous
+            assert app.state.github_service.github_client.http_client is app.state.http_client
+            assert resolve_service(SimpleNamespace(app=app)) is app.state.github_service
@@ -0,0 +1,84 @@
+import httpx
+import pytest
+
+from src.config import Settings
+from src.github.client import GitHubAPIClient, endpoint_label
+from src.metrics import (
+    UPSTREAM_BYTES,
+    UPSTREAM_LATENCY,
+    UPSTREAM_RESPONSES,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+
+class TestMetrics:
+    """Tests for the metric types and text rendering"""
+    
+    def test_counter_and_gauge(self):
+        """Should keep one value per label set"""
+        counter = Counter("requests_total", "Requests", ("status",))
+        gauge = Gauge("in_flight", "In flight")
+        
+        counter.inc("200")
+        counter.inc("200", amount=2)
+        counter.inc("500")
+        with gauge.track_in_progress():
+            assert gauge.value() == 1
+        
+        assert counter.value("200") == 3
+        assert counter.value("500") == 1
+        assert gauge.value() == 0
+    
+    def test_histogram_renders_cumulative_buckets(self):
+        """Should render cumulative buckets, sum and count"""
+        registry = MetricsRegistry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1)))
+        
+        histogram.observe(0.05, "/user")
+        histogram.observe(0.5, "/user")
+        histogram.observe(3, "/user")
+        
+        text = registry.render()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{endpoint="/user",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{endpoint="/user",le="1"} 2' in text
+        assert 'latency_seconds_bucket{endpoint="/user",le="+Inf"} 3' in text
+        assert 'latency_seconds_sum{endpoint="/user"} 3.55' in text
+        assert 'latency_seconds_count{endpoint="/user"} 3' in text
+    
+    def test_escapes_label_values(self):
+        """Should escape quotes and backslashes in label values"""
+        counter = Counter("errors_total", "Errors", ("detail",))
+        counter.inc('say "hi"\\')
+        
+        assert 'errors_total{detail="say \\"hi\\"\\\\"} 1' in counter.render()
+
+
+class TestClientMetrics:
+    """Tests for the metrics recorded by GitHubAPIClient"""
+    
+    def test_endpoint_label_hides_usernames(self):
+        """Should label user paths with a template"""
+        assert endpoint_label("/users/octocat/repos") == "/users/{username}/repos"
+        assert endpoint_label("/user/repos") == "/user/repos"
+    
+    @pytest.mark.asyncio
+    async def test_records_upstream_calls(self):
+        """Should record latency, status and bytes of every upstream call"""
+        transport = httpx.MockTransport(lambda request: httpx.Response(404, content=b'{"message":"Not Found"}'))
+        client = GitHubAPIClient(Settings(), http_client=httpx.AsyncClient(transport=transport))
+        endpoint = "/users/{username}"
+        latency_before = UPSTREAM_LATENCY.count(endpoint, "GET")
+        responses_before = UPSTREAM_RESPONSES.value(endpoint, "404")
+        bytes_before = UPSTREAM_BYTES.value(endpoint)
+        
+        with pytest.raises(Exception):
+            await client.get_user("test-token", username="ghost")
+        await client.aclose()
+        
+        assert UPSTREAM_LATENCY.count(endpoint, "GET") == latency_before + 1
+        assert UPSTREAM_RESPONSES.value(endpoint, "404") == responses_before + 1
+        assert UPSTREAM_BYTES.value(endpoint) == bytes_before + len(b'{"message":"Not Found"}')
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.profiling import ProfilingMiddleware, SamplingProfiler
+from src.timing import ServerTiming, ServerTimingMiddleware, current_timing, phase
+
+
+def make_app() -> FastAPI:
+    """Small app with both middlewares and a route recording a phase"""
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(ProfilingMiddleware)
+    
+    @app.get("/work")
+    async def work():
+        with phase("compute", "busy loop"):
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+        return {"ok": True}
+    
+    return app
+
+
+class TestServerTiming:
+    """Tests for the Server-Timing header"""
+    
+    def test_header_value(self):
+        """Should list phases in order, then the total"""
+        timing = ServerTiming()
+        timing.record("user", 0.012)
+        timing.record("repositories", 0.1, "3 pages")
+        timing.record("user", 0.003)
+        
+        value = timing.header_value()
+        
+        assert value.startswith('user;dur=15.0, repositories;dur=100.0;desc="3 pages", total;dur=')
+    
+    def test_phase_outside_request_is_noop(self):
+        """Should not fail when no request is being timed"""
+        assert current_timing() is None
+        with phase("anything"):
+            pass
+    
+    def test_middleware_adds_header(self):
+        """Should add the recorded phases to the response"""
+        with TestClient(make_app()) as client:
+            response = client.get("/work")
+        
+        assert response.status_code == 200
+        assert response.headers["server-timing"].startswith('compute;dur=')
+        assert "total;dur=" in response.headers["server-timing"]
+
+
+class TestProfiling:
+    """Tests for the sampling profiler and its admin gate"""
+    
+    def test_sampling_profiler_collects_stacks(self):
+        """Should sample the target thread into collapsed stacks"""
+        profiler = SamplingProfiler(threading.get_ident(), interval=0.001)
+        profiler.start()
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        profiler.stop()
+        
+        output = profiler.collapsed()
+        assert "test_sampling_profiler_collects_stacks" in output
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in output.splitlines())
+    
+    def test_profile_requires_admin_token(self, monkeypatch):
+        """Should ignore the header without a configured token and reject a wrong one"""
+        with TestClient(make_app()) as client:
+            assert client.get("/work", headers={"X-Profile": "1"}).json() == {"ok": True}
+            
+            monkeypatch.setattr(get_settings(), "admin_token", "s3cret")
+            response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": "wrong"})
+        
+        assert response.status_code == 403
+    
+    def test_profile_returns_collapsed_stacks(self, monkeypatch):
+        """Should replace the response with the profile of the request"""
+        monkeypatch.setattr(get_settings(), "admin_token", "s3cret")
+        with TestClient(make_app()) as client:
+            response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": "s3cret"})
+        
+        assert response.status_code == 200
+        assert response.headers["x-profiled-status"] == "200"
+        assert "attachment" in response.headers["content-disposition"]
+        assert "work (" in response.text